@@ -0,0 +1,61 @@
+"""Add user_feed_recent materialized view
+
+Revision ID: 005_add_user_feed_view
+Revises: 004_add_social_tables
+Create Date: 2024-01-20 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005_add_user_feed_view'
+down_revision = '004_add_social_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add user_feed_recent materialized view"""
+
+    # Лента за последние 7 дней: подписки, подтвержденные друзья и собственные посты.
+    # follows/friendships ссылаются на users.id, а посты - на user_profiles.id,
+    # поэтому автор сопоставляется через user_profiles.
+    op.execute("""
+        CREATE MATERIALIZED VIEW user_feed_recent AS
+        WITH audience AS (
+            SELECT follower_id AS viewer_id, following_id AS author_user_id FROM follows
+            UNION
+            SELECT user_id, friend_id FROM friendships WHERE status = 'accepted'
+            UNION
+            SELECT friend_id, user_id FROM friendships WHERE status = 'accepted'
+            UNION
+            SELECT user_id, user_id FROM user_profiles
+        )
+        SELECT a.viewer_id AS follower_id,
+               p.id AS post_id,
+               p.created_at,
+               p.author_id,
+               p.like_count,
+               p.comment_count
+        FROM audience a
+        JOIN user_profiles up ON up.user_id = a.author_user_id
+        JOIN social_posts p ON p.author_id = up.id
+        WHERE p.is_public AND p.created_at > now() - interval '7 days'
+        WITH DATA
+    """)
+
+    # Уникальный индекс обязателен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute(
+        "CREATE UNIQUE INDEX ix_user_feed_recent_follower_created_post "
+        "ON user_feed_recent (follower_id, created_at DESC, post_id)"
+    )
+    op.execute("CREATE INDEX ix_user_feed_recent_follower_id ON user_feed_recent (follower_id)")
+
+
+def downgrade():
+    """Remove user_feed_recent materialized view"""
+
+    op.execute("DROP INDEX IF EXISTS ix_user_feed_recent_follower_id")
+    op.execute("DROP INDEX IF EXISTS ix_user_feed_recent_follower_created_post")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS user_feed_recent")
@@ -0,0 +1,46 @@
+"""Switch social content to LZ4 TOAST compression and add full-text search
+
+Revision ID: 006_add_content_search
+Revises: 005_add_user_feed_view
+Create Date: 2024-01-22 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '006_add_content_search'
+down_revision = '005_add_user_feed_view'
+branch_labels = None
+depends_on = None
+
+CONTENT_TABLES = ['social_posts', 'comments', 'messages']
+
+
+def upgrade():
+    """Switch social content to LZ4 TOAST compression and add full-text search"""
+
+    for table in CONTENT_TABLES:
+        # LZ4 (PostgreSQL 14+) применяется к новым значениям, существующие перепаковываются при UPDATE
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN content SET COMPRESSION lz4")
+
+        op.add_column(table, sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed("to_tsvector('simple', content)", persisted=True),
+            nullable=True
+        ))
+        op.create_index(
+            f'ix_{table}_search_vector', table, ['search_vector'],
+            unique=False, postgresql_using='gin'
+        )
+
+
+def downgrade():
+    """Remove full-text search and restore default TOAST compression"""
+
+    for table in reversed(CONTENT_TABLES):
+        op.drop_index(f'ix_{table}_search_vector', table_name=table)
+        op.drop_column(table, 'search_vector')
+        op.execute(f"ALTER TABLE {table} ALTER COLUMN content SET COMPRESSION pglz")
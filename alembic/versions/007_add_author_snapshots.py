@@ -0,0 +1,79 @@
+"""Denormalize author display_name/avatar_url onto posts, comments and messages
+
+Revision ID: 007_add_author_snapshots
+Revises: 006_add_content_search
+Create Date: 2024-01-24 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007_add_author_snapshots'
+down_revision = '006_add_content_search'
+branch_labels = None
+depends_on = None
+
+# Таблица -> колонка с ID профиля автора
+SNAPSHOT_TABLES = {
+    'social_posts': 'author_id',
+    'comments': 'author_id',
+    'messages': 'sender_id',
+}
+
+
+def upgrade():
+    """Denormalize author display_name/avatar_url onto posts, comments and messages"""
+
+    for table, author_column in SNAPSHOT_TABLES.items():
+        op.add_column(table, sa.Column('author_display_name', sa.String(length=100), nullable=True))
+        op.add_column(table, sa.Column('author_avatar_url', sa.String(length=500), nullable=True))
+
+        # Заполняем снимки для существующих строк
+        op.execute(f"""
+            UPDATE {table} t
+            SET author_display_name = up.display_name,
+                author_avatar_url = up.avatar_url
+            FROM user_profiles up
+            WHERE up.id = t.{author_column}
+        """)
+
+    # Триггер поддерживает снимки в актуальном состоянии при изменении профиля
+    op.execute("""
+        CREATE OR REPLACE FUNCTION propagate_author_snapshot() RETURNS trigger AS $$
+        BEGIN
+            UPDATE social_posts
+            SET author_display_name = NEW.display_name, author_avatar_url = NEW.avatar_url
+            WHERE author_id = NEW.id;
+
+            UPDATE comments
+            SET author_display_name = NEW.display_name, author_avatar_url = NEW.avatar_url
+            WHERE author_id = NEW.id;
+
+            UPDATE messages
+            SET author_display_name = NEW.display_name, author_avatar_url = NEW.avatar_url
+            WHERE sender_id = NEW.id;
+
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER trg_user_profiles_author_snapshot
+        AFTER UPDATE OF display_name, avatar_url ON user_profiles
+        FOR EACH ROW
+        WHEN (OLD.display_name IS DISTINCT FROM NEW.display_name
+              OR OLD.avatar_url IS DISTINCT FROM NEW.avatar_url)
+        EXECUTE FUNCTION propagate_author_snapshot()
+    """)
+
+
+def downgrade():
+    """Remove denormalized author snapshots"""
+
+    op.execute("DROP TRIGGER IF EXISTS trg_user_profiles_author_snapshot ON user_profiles")
+    op.execute("DROP FUNCTION IF EXISTS propagate_author_snapshot()")
+
+    for table in reversed(list(SNAPSHOT_TABLES)):
+        op.drop_column(table, 'author_avatar_url')
+        op.drop_column(table, 'author_display_name')
@@ -0,0 +1,63 @@
+"""Move message read receipts into message_reads
+
+Revision ID: 008_add_message_reads
+Revises: 007_add_author_snapshots
+Create Date: 2024-01-26 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '008_add_message_reads'
+down_revision = '007_add_author_snapshots'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Move message read receipts into message_reads"""
+
+    # Create message_reads table
+    op.create_table('message_reads',
+        sa.Column('message_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('read_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['message_id'], ['messages.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user_profiles.id'], ),
+        sa.PrimaryKeyConstraint('message_id', 'user_id')
+    )
+    op.create_index(op.f('ix_message_reads_user_id'), 'message_reads', ['user_id'], unique=False)
+
+    # Переносим существующие отметки о прочтении
+    op.execute("""
+        INSERT INTO message_reads (message_id, user_id, read_at)
+        SELECT id, receiver_id, COALESCE(read_at, updated_at, created_at)
+        FROM messages
+        WHERE is_read
+    """)
+
+    op.drop_column('messages', 'read_at')
+    op.drop_column('messages', 'is_read')
+
+    # Выборка сообщений получателя по времени
+    op.create_index('ix_messages_receiver_id_created_at', 'messages', ['receiver_id', 'created_at'], unique=False)
+
+
+def downgrade():
+    """Restore is_read/read_at columns on messages"""
+
+    op.drop_index('ix_messages_receiver_id_created_at', table_name='messages')
+
+    op.add_column('messages', sa.Column('is_read', sa.Boolean(), nullable=True))
+    op.add_column('messages', sa.Column('read_at', sa.DateTime(), nullable=True))
+    op.execute("""
+        UPDATE messages m
+        SET is_read = true, read_at = r.read_at
+        FROM message_reads r
+        WHERE r.message_id = m.id AND r.user_id = m.receiver_id
+    """)
+
+    op.drop_index(op.f('ix_message_reads_user_id'), table_name='message_reads')
+    op.drop_table('message_reads')
@@ -0,0 +1,124 @@
+"""Convert small-cardinality string columns to native PostgreSQL ENUM types
+
+Revision ID: 009_convert_status_columns_to_enums
+Revises: 008_add_message_reads
+Create Date: 2024-01-28 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision = '009_convert_status_columns_to_enums'
+down_revision = '008_add_message_reads'
+branch_labels = None
+depends_on = None
+
+# Тип ENUM -> допустимые значения
+ENUM_TYPES = {
+    'subscription_tier': ['free', 'pro', 'premium'],
+    'subscription_status': ['active', 'cancelled', 'expired'],
+    'payment_status': ['pending', 'completed', 'failed', 'refunded', 'cancelled'],
+    'cashback_status': ['pending', 'approved', 'paid'],
+    'referral_status': ['pending', 'completed', 'paid'],
+    'friendship_status': ['pending', 'accepted', 'blocked'],
+    'group_role': ['member', 'moderator', 'admin'],
+    'post_type': ['text', 'image', 'video', 'link', 'item'],
+    'like_type': ['like', 'love', 'laugh', 'angry', 'sad'],
+    'notification_type': [
+        'friend_request', 'friend_accepted', 'like', 'comment', 'message',
+        'achievement', 'group_invite', 'mention'
+    ],
+    'leaderboard_period': ['daily', 'weekly', 'monthly', 'all'],
+}
+
+# (таблица, колонка, тип ENUM, исходная длина String)
+ENUM_COLUMNS = [
+    ('subscriptions', 'tier', 'subscription_tier', 20),
+    ('subscription_plans', 'tier', 'subscription_tier', 20),
+    ('subscriptions', 'status', 'subscription_status', 20),
+    ('payments', 'status', 'payment_status', 20),
+    ('cashbacks', 'status', 'cashback_status', 20),
+    ('referrals', 'status', 'referral_status', 20),
+    ('friendships', 'status', 'friendship_status', 20),
+    ('group_members', 'role', 'group_role', 20),
+    ('social_posts', 'post_type', 'post_type', 20),
+    ('likes', 'like_type', 'like_type', 20),
+    ('notifications', 'notification_type', 'notification_type', 50),
+    ('leaderboards', 'period', 'leaderboard_period', 20),
+]
+
+USER_FEED_VIEW_SQL = """
+    CREATE MATERIALIZED VIEW user_feed_recent AS
+    WITH audience AS (
+        SELECT follower_id AS viewer_id, following_id AS author_user_id FROM follows
+        UNION
+        SELECT user_id, friend_id FROM friendships WHERE status = 'accepted'
+        UNION
+        SELECT friend_id, user_id FROM friendships WHERE status = 'accepted'
+        UNION
+        SELECT user_id, user_id FROM user_profiles
+    )
+    SELECT a.viewer_id AS follower_id,
+           p.id AS post_id,
+           p.created_at,
+           p.author_id,
+           p.like_count,
+           p.comment_count
+    FROM audience a
+    JOIN user_profiles up ON up.user_id = a.author_user_id
+    JOIN social_posts p ON p.author_id = up.id
+    WHERE p.is_public AND p.created_at > now() - interval '7 days'
+    WITH DATA
+"""
+
+
+def _drop_user_feed_view():
+    """user_feed_recent зависит от friendships.status - пересоздаем его вокруг смены типа"""
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS user_feed_recent")
+
+
+def _create_user_feed_view():
+    op.execute(USER_FEED_VIEW_SQL)
+    op.execute(
+        "CREATE UNIQUE INDEX ix_user_feed_recent_follower_created_post "
+        "ON user_feed_recent (follower_id, created_at DESC, post_id)"
+    )
+    op.execute("CREATE INDEX ix_user_feed_recent_follower_id ON user_feed_recent (follower_id)")
+
+
+def upgrade():
+    """Convert small-cardinality string columns to native PostgreSQL ENUM types"""
+
+    for name, values in ENUM_TYPES.items():
+        postgresql.ENUM(*values, name=name).create(op.get_bind(), checkfirst=True)
+
+    _drop_user_feed_view()
+
+    # Значения вне перечня приведут к ошибке приведения типа - такие строки нужно исправить до миграции
+    for table, column, enum_name, _ in ENUM_COLUMNS:
+        op.execute(
+            f"ALTER TABLE {table} ALTER COLUMN {column} TYPE {enum_name} "
+            f"USING {column}::text::{enum_name}"
+        )
+
+    _create_user_feed_view()
+
+
+def downgrade():
+    """Convert ENUM columns back to strings"""
+
+    _drop_user_feed_view()
+
+    for table, column, _, length in ENUM_COLUMNS:
+        op.alter_column(
+            table, column,
+            type_=sa.String(length=length),
+            postgresql_using=f"{column}::text"
+        )
+
+    _create_user_feed_view()
+
+    for name in ENUM_TYPES:
+        postgresql.ENUM(name=name).drop(op.get_bind(), checkfirst=True)
@@ -0,0 +1,50 @@
+"""Add price_daily_stats materialized view
+
+Revision ID: 010_add_price_daily_stats_view
+Revises: 009_convert_status_columns_to_enums
+Create Date: 2024-01-30 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '010_add_price_daily_stats_view'
+down_revision = '009_convert_status_columns_to_enums'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add price_daily_stats materialized view"""
+
+    # Дневные агрегаты цен для аналитики: тренд, сравнение маркетплейсов и категорий
+    # читаются отсюда вместо полного прохода по price_history
+    op.execute("""
+        CREATE MATERIALIZED VIEW price_daily_stats AS
+        SELECT date_trunc('day', ph.timestamp) AS day,
+               ti.marketplace,
+               ti.category,
+               count(*) AS price_count,
+               sum(ph.price) AS price_sum,
+               sum(ph.price * ph.price) AS price_sq_sum,
+               min(ph.price) AS min_price,
+               max(ph.price) AS max_price
+        FROM price_history ph
+        JOIN tracked_items ti ON ti.id = ph.tracked_item_id
+        GROUP BY 1, 2, 3
+        WITH DATA
+    """)
+
+    # Уникальный индекс обязателен для REFRESH MATERIALIZED VIEW CONCURRENTLY
+    op.execute(
+        "CREATE UNIQUE INDEX ix_price_daily_stats_day_marketplace_category "
+        "ON price_daily_stats (day, marketplace, category)"
+    )
+
+
+def downgrade():
+    """Remove price_daily_stats materialized view"""
+
+    op.execute("DROP INDEX IF EXISTS ix_price_daily_stats_day_marketplace_category")
+    op.execute("DROP MATERIALIZED VIEW IF EXISTS price_daily_stats")
@@ -0,0 +1,47 @@
+"""Add composite indexes for analytics filters
+
+Revision ID: 011_add_analytics_indexes
+Revises: 010_add_price_daily_stats_view
+Create Date: 2024-02-01 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '011_add_analytics_indexes'
+down_revision = '010_add_price_daily_stats_view'
+branch_labels = None
+depends_on = None
+
+
+# Индексы под фильтры аналитики: период + измерение, INCLUDE дает index-only scan
+ANALYTICS_INDEXES = (
+    ("ix_price_history_timestamp_tracked_item_id",
+     "price_history (timestamp, tracked_item_id) INCLUDE (price)"),
+    ("ix_tracked_items_created_at_marketplace_category",
+     "tracked_items (created_at, marketplace, category)"),
+    ("ix_users_last_activity",
+     "users (last_activity) WHERE last_activity IS NOT NULL"),
+    ("ix_payments_status_created_at",
+     "payments (status, created_at) INCLUDE (amount)"),
+    ("ix_social_posts_created_at_author_id",
+     "social_posts (created_at, author_id)"),
+)
+
+
+def upgrade():
+    """Add composite indexes for analytics filters"""
+
+    # CONCURRENTLY не блокирует запись в большие таблицы, но не работает внутри транзакции
+    with op.get_context().autocommit_block():
+        for name, definition in ANALYTICS_INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} ON {definition}")
+
+
+def downgrade():
+    """Remove composite indexes for analytics filters"""
+
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(ANALYTICS_INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,40 @@
+"""Add generated day column with BRIN index to price_history
+
+Revision ID: 012_add_price_history_day
+Revises: 011_add_analytics_indexes
+Create Date: 2024-02-02 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '012_add_price_history_day'
+down_revision = '011_add_analytics_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """Add generated day column with BRIN index to price_history"""
+
+    # Хранимый день точки цены: дневная группировка без вычисления date_trunc на каждую строку.
+    # Добавление STORED-колонки переписывает таблицу
+    op.add_column('price_history', sa.Column(
+        'day',
+        sa.DateTime(),
+        sa.Computed("date_trunc('day', timestamp)", persisted=True),
+        nullable=True
+    ))
+    # price_history пополняется по времени, поэтому BRIN по дню почти ничего не весит
+    op.create_index(
+        'ix_price_history_day_brin', 'price_history', ['day'],
+        unique=False, postgresql_using='brin'
+    )
+
+
+def downgrade():
+    """Remove generated day column from price_history"""
+
+    op.drop_index('ix_price_history_day_brin', table_name='price_history')
+    op.drop_column('price_history', 'day')
@@ -0,0 +1,22 @@
+"""
+Ответы API, сериализуемые напрямую в pydantic-core
+"""
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+
+def validated_json_response(adapter: TypeAdapter, value: Any) -> Response:
+    """Провалидировать value адаптером и отдать JSON, собранный pydantic-core.
+
+    FastAPI не валидирует и не сериализует готовый Response повторно;
+    response_model маршрута остается только для OpenAPI.
+    """
+    validated = adapter.validate_python(value, from_attributes=True)
+    return Response(content=adapter.dump_json(validated), media_type="application/json")
+
+
+def model_json_response(model: BaseModel) -> Response:
+    """Отдать готовую схему как JSON из model_dump_json без промежуточного dict"""
+    return Response(content=model.model_dump_json(by_alias=True), media_type="application/json")
@@ -1,17 +1,34 @@
 """API эндпоинты для расширенной аналитики и отчетов"""
 
-from typing import Optional
-from datetime import datetime
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+import asyncio
+import tempfile
+from typing import BinaryIO, Iterator, Optional
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.services.advanced_analytics_service import (
-    AdvancedAnalyticsService, AnalyticsFilter, ReportType, ExportFormat
+    AdvancedAnalyticsService, AnalyticsFilter, ReportType, ExportFormat, gather_analytics
 )
 
 router = APIRouter()
 
+# Экспорт до этого размера держится в памяти, больший сбрасывается во временный файл
+EXPORT_SPOOL_MAX_SIZE = 8 * 1024 * 1024
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _iter_export_file(output: BinaryIO) -> Iterator[bytes]:
+    """Отдать файл экспорта частями и закрыть его"""
+    try:
+        output.seek(0)
+        while chunk := output.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+    finally:
+        output.close()
+
 @router.get("/overview")
 async def get_overview_analytics(
     start_date: Optional[str] = Query(None, description="Начальная дата (YYYY-MM-DD)"),
@@ -55,7 +72,7 @@ async def get_overview_analytics(
     )
 
     service = AdvancedAnalyticsService(db)
-    metrics = service.get_overview_metrics(filter_params)
+    metrics = await service.get_cached("get_overview_metrics", filter_params)
 
     return {
         "filter": {
@@ -127,7 +144,7 @@ async def get_price_analytics(
     )
 
     service = AdvancedAnalyticsService(db)
-    analytics = service.get_price_analytics(filter_params)
+    analytics = await service.get_cached("get_price_analytics", filter_params)
 
     return {
         "filter": {
@@ -182,7 +199,7 @@ async def get_user_analytics(
     )
 
     service = AdvancedAnalyticsService(db)
-    analytics = service.get_user_analytics(filter_params)
+    analytics = await service.get_cached("get_user_analytics", filter_params)
 
     return {
         "filter": {
@@ -235,7 +252,7 @@ async def get_social_analytics(
     )
 
     service = AdvancedAnalyticsService(db)
-    analytics = service.get_social_analytics(filter_params)
+    analytics = await service.get_cached("get_social_analytics", filter_params)
 
     return {
         "filter": {
@@ -289,7 +306,7 @@ async def get_predictive_analytics(
     )
 
     service = AdvancedAnalyticsService(db)
-    analytics = service.get_predictive_analytics(filter_params)
+    analytics = await service.get_cached("get_predictive_analytics", filter_params)
 
     return {
         "filter": {
@@ -348,8 +365,9 @@ async def export_report(
 
     service = AdvancedAnalyticsService(db)
 
+    output = tempfile.SpooledTemporaryFile(max_size=EXPORT_SPOOL_MAX_SIZE)
     try:
-        data = service.export_data(report_type, filter_params, format)
+        await asyncio.to_thread(service.write_export, report_type, filter_params, format, output)
 
         # Определяем MIME тип
         mime_types = {
@@ -369,13 +387,14 @@ async def export_report(
 
         filename = f"report_{report_type.value}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extensions[format]}"
 
-        return Response(
-            content=data,
+        return StreamingResponse(
+            _iter_export_file(output),
             media_type=mime_types[format],
             headers={"Content-Disposition": f"attachment; filename={filename}"}
         )
 
     except Exception as e:
+        output.close()
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Export failed: {str(e)}"
@@ -414,8 +433,7 @@ async def get_real_time_metrics(db: Session = Depends(get_db)):
 
 @router.get("/dashboard-data")
 async def get_dashboard_data(
-    period: str = Query("7d", description="Период: 1d, 7d, 30d, 90d"),
-    db: Session = Depends(get_db)
+    period: str = Query("7d", description="Период: 1d, 7d, 30d, 90d")
 ):
     """Получить данные для дашборда"""
 
@@ -441,14 +459,15 @@ async def get_dashboard_data(
         end_date=datetime.utcnow()
     )
 
-    service = AdvancedAnalyticsService(db)
-
-    # Получаем все виды аналитики
-    overview = service.get_overview_metrics(filter_params)
-    price_analytics = service.get_price_analytics(filter_params)
-    user_analytics = service.get_user_analytics(filter_params)
-    social_analytics = service.get_social_analytics(filter_params)
-    predictive = service.get_predictive_analytics(filter_params)
+    # Получаем все виды аналитики параллельно, каждый раздел в своей сессии
+    overview, price_analytics, user_analytics, social_analytics, predictive = await gather_analytics(
+        filter_params,
+        "get_overview_metrics",
+        "get_price_analytics",
+        "get_user_analytics",
+        "get_social_analytics",
+        "get_predictive_analytics"
+    )
 
     return {
         "period": period,
@@ -501,7 +520,7 @@ async def get_marketplace_comparison(
     )
 
     service = AdvancedAnalyticsService(db)
-    price_analytics = service.get_price_analytics(filter_params)
+    price_analytics = await service.get_cached("get_price_analytics", filter_params)
 
     # Извлекаем данные сравнения маркетплейсов
     marketplace_comparison = price_analytics.get("marketplace_comparison", {})
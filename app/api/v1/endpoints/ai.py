@@ -7,8 +7,9 @@ from app.core.database import get_db
 from app.services.ai_service import PricePredictionService
 from app.schemas.ai import (
     PredictionRequest, PredictionResponse, 
-    AnomalyResponse, TrendAnalysisResponse,
-    RecommendationResponse, ModelPerformanceResponse
+    AnomalyResponse, TrendAnalysisResponse, PriceSeriesRequest,
+    RecommendationResponse, ModelPerformanceResponse,
+    price_prediction_list_adapter, anomaly_list_adapter
 )
 import logging
 
@@ -33,6 +34,7 @@ async def predict_price(
         if "error" in result:
             raise HTTPException(status_code=400, detail=result["error"])
 
+        result["predictions"] = price_prediction_list_adapter.validate_python(result["predictions"])
         return PredictionResponse(**result)
 
     except Exception as e:
@@ -79,7 +81,7 @@ async def detect_anomalies(
     try:
         anomalies = await ai_service.detect_anomalies(data)
 
-        return [AnomalyResponse(**anomaly) for anomaly in anomalies]
+        return anomaly_list_adapter.validate_python(anomalies)
 
     except Exception as e:
         logger.error("Anomaly detection error: {e}")
@@ -103,6 +105,22 @@ async def analyze_trends(
         logger.error("Trend analysis error: {e}")
         raise HTTPException(status_code=500, detail=f"Trend analysis failed: {str(e)}")
 
+@router.post("/trends/columnar", response_model=TrendAnalysisResponse)
+async def analyze_trends_columnar(
+    series: PriceSeriesRequest,
+    background_tasks: BackgroundTasks
+):
+    """Analyze price trends over parallel timestamp/price arrays"""
+    try:
+        timestamps, prices = ai_service.series_columns(series.timestamps, series.prices)
+        trends = ai_service.analyze_price_series(timestamps, prices)
+
+        return TrendAnalysisResponse(**trends)
+
+    except Exception as e:
+        logger.error(f"Columnar trend analysis error: {e}")
+        raise HTTPException(status_code=500, detail=f"Trend analysis failed: {str(e)}")
+
 @router.post("/recommendations", response_model=List[RecommendationResponse])
 async def get_recommendations(
     user_items: List[Dict[str, Any]],
@@ -128,7 +146,7 @@ async def get_model_performance():
 
     except Exception as e:
         logger.error("Model performance error: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get model performance  # noqa  # noqa: E501 E501 {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get model performance: {str(e)}")
 
 @router.get("/health")
 async def ai_health_check():
@@ -100,22 +100,7 @@ async def discover_niches(
         # Convert to response format
         niche_data = []
         for niche in niches:
-            niche_data.append({
-                "niche": niche.niche,
-                "keywords": niche.keywords,
-                "opportunity_score": niche.opportunity_score,
-                "trend": niche.trend.value,
-                "competition_level": niche.competition_level,
-                "market_size": niche.market_size,
-                "growth_potential": niche.growth_potential,
-                "seasonality": niche.seasonality,
-                "profit_margin": niche.profit_margin,
-                "entry_difficulty": niche.entry_difficulty,
-                "confidence": niche.confidence,
-                "recommendations": niche.recommendations,
-                "risks": niche.risks,
-                "market_data": niche.market_data
-            })
+            niche_data.append(niche.to_insights_dict())
 
         # Schedule background task to cache results
         background_tasks.add_task(
@@ -612,7 +597,7 @@ async def update_automation_config(
         )
 
 # Background tasks
-async def cache_niche_discovery_results(niche_data: List[Dict[str, Any]], request: NicheDiscoveryRequest)  # noqa  # noqa: E501 E501
+async def cache_niche_discovery_results(niche_data: List[Dict[str, Any]], request: NicheDiscoveryRequest):
     """Cache niche discovery results"""
     try:
         # This would typically cache results in Redis or database
@@ -620,7 +605,7 @@ async def cache_niche_discovery_results(niche_data: List[Dict[str, Any]], reques
     except Exception as e:
         logger.error("Error caching niche discovery results: {e}")
 
-async def cache_trend_detection_results(trend_data: List[Dict[str, Any]], request: TrendDetectionRequest)  # noqa  # noqa: E501 E501
+async def cache_trend_detection_results(trend_data: List[Dict[str, Any]], request: TrendDetectionRequest):
     """Cache trend detection results"""
     try:
         # This would typically cache results in Redis or database
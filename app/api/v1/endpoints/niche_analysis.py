@@ -9,7 +9,8 @@ from app.schemas.niche_analysis import (
     NicheAnalysisRequest, NicheAnalysisResponse,
     SupplierSearchRequest, SupplierSearchResponse,
     PricingRequest, PricingResponse,
-    BeginnerRecommendationsRequest, BeginnerRecommendationsResponse
+    BeginnerRecommendationsRequest, BeginnerRecommendationsResponse,
+    supplier_list_adapter, niche_recommendation_list_adapter
 )
 import logging
 
@@ -85,7 +86,7 @@ async def find_suppliers(
             category=request.category,
             budget=request.budget,
             suppliers_found=len(supplier_data),
-            suppliers=supplier_data
+            suppliers=supplier_list_adapter.validate_python(supplier_data)
         )
 
     except Exception as e:
@@ -121,7 +122,7 @@ async def calculate_pricing(
 
     except Exception as e:
         logger.error("Pricing calculation error: {e}")
-        raise HTTPException(status_code=500, detail=f"Pricing calculation failed  # noqa  # noqa: E501 E501 {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Pricing calculation failed: {str(e)}")
 
 @router.post("/beginner-recommendations", response_model=BeginnerRecommendationsResponse)
 async def get_beginner_recommendations(
@@ -138,6 +139,9 @@ async def get_beginner_recommendations(
         if "error" in recommendations:
             raise HTTPException(status_code=400, detail=recommendations["error"])
 
+        recommendations["recommendations"] = niche_recommendation_list_adapter.validate_python(
+            recommendations["recommendations"]
+        )
         return BeginnerRecommendationsResponse(**recommendations)
 
     except Exception as e:
@@ -185,7 +189,7 @@ async def get_supplier_types():
         }
     except Exception as e:
         logger.error("Error getting supplier types: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get supplier types  # noqa  # noqa: E501 E501 {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get supplier types: {str(e)}")
 
 @router.get("/difficulty-levels")
 async def get_difficulty_levels():
@@ -203,7 +207,7 @@ async def get_difficulty_levels():
         }
     except Exception as e:
         logger.error("Error getting difficulty levels: {e}")
-        raise HTTPException(status_code=500, detail=f"Failed to get difficulty levels  # noqa  # noqa: E501 E501 {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to get difficulty levels: {str(e)}")
 
 @router.get("/beginner-tips")
 async def get_beginner_tips(
@@ -263,7 +267,7 @@ async def calculate_profit(
         }
     except Exception as e:
         logger.error("Error calculating profit: {e}")
-        raise HTTPException(status_code=500, detail=f"Profit calculation failed  # noqa  # noqa: E501 E501 {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Profit calculation failed: {str(e)}")
 
 def _calculate_recommendation_score(metrics) -> float:
     """Calculate overall recommendation score for a niche"""
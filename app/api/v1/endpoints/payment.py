@@ -3,25 +3,30 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.api.deps import json_body, json_body_openapi
+from app.api.responses import model_json_response, validated_json_response
 from app.core.database import get_db
 from app.services.payment_service import PaymentService
 from app.schemas.subscription import (
     PaymentResponse, PaymentCreate, PaymentUpdate,
     CashbackResponse, CashbackCreate, ReferralResponse,
-    ReferralCreate, PaymentIntentCreate, PaymentIntentResponse
+    ReferralCreate, PaymentIntentCreate, PaymentIntentResponse,
+    payment_list_adapter, cashback_list_adapter, referral_list_adapter
 )
 
 router = APIRouter()
 
-@router.post("/", response_model=PaymentResponse)
+@router.post(
+    "/", response_model=PaymentResponse, openapi_extra=json_body_openapi(PaymentCreate)
+)
 async def create_payment(
-    payment_data: PaymentCreate,
+    payment_data: PaymentCreate = Depends(json_body(PaymentCreate)),
     db: Session = Depends(get_db)
 ):
     """Создать платеж"""
     service = PaymentService(db)
     payment = service.create_payment(payment_data)
-    return payment
+    return model_json_response(PaymentResponse.from_orm_row(payment))
 
 @router.get("/{payment_id}", response_model=PaymentResponse)
 async def get_payment(payment_id: str, db: Session = Depends(get_db)):
@@ -33,7 +38,7 @@ async def get_payment(payment_id: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Payment not found"
         )
-    return payment
+    return model_json_response(PaymentResponse.from_orm_row(payment))
 
 @router.get("/user/{user_id}", response_model=List[PaymentResponse])
 async def get_user_payments(
@@ -44,7 +49,7 @@ async def get_user_payments(
     """Получить платежи пользователя"""
     service = PaymentService(db)
     payments = service.get_user_payments(user_id, limit)
-    return payments
+    return validated_json_response(payment_list_adapter, payments)
 
 @router.put("/{payment_id}/status")
 async def update_payment_status(
@@ -78,37 +83,42 @@ async def process_payment_webhook(
         )
     return {"message": "Webhook processed successfully"}
 
-@router.post("/intent", response_model=PaymentIntentResponse)
+@router.post(
+    "/intent", response_model=PaymentIntentResponse, openapi_extra=json_body_openapi(PaymentIntentCreate)
+)
 async def create_payment_intent(
-    intent_data: PaymentIntentCreate,
+    intent_data: PaymentIntentCreate = Depends(json_body(PaymentIntentCreate)),
     db: Session = Depends(get_db)
 ):
     """Создать намерение платежа"""
     # Здесь будет интеграция с Stripe/PayPal
     # Пока что возвращаем заглушку
-    return PaymentIntentResponse(
+    # Поля уже проверены в PaymentIntentCreate - повторная валидация не нужна
+    return model_json_response(PaymentIntentResponse.model_construct(
         client_secret="pi_mock_client_secret",
         payment_intent_id="pi_mock_payment_intent_id",
         amount=intent_data.amount,
         currency=intent_data.currency
-    )
+    ))
 
-@router.post("/cashback", response_model=CashbackResponse)
+@router.post(
+    "/cashback", response_model=CashbackResponse, openapi_extra=json_body_openapi(CashbackCreate)
+)
 async def create_cashback(
-    cashback_data: CashbackCreate,
+    cashback_data: CashbackCreate = Depends(json_body(CashbackCreate)),
     db: Session = Depends(get_db)
 ):
     """Создать кэшбек"""
     service = PaymentService(db)
     cashback = service.create_cashback(cashback_data)
-    return cashback
+    return model_json_response(CashbackResponse.from_orm_row(cashback))
 
 @router.get("/cashback/user/{user_id}", response_model=List[CashbackResponse])
 async def get_user_cashbacks(user_id: str, db: Session = Depends(get_db)):
     """Получить кэшбеки пользователя"""
     service = PaymentService(db)
     cashbacks = service.get_user_cashbacks(user_id)
-    return cashbacks
+    return validated_json_response(cashback_list_adapter, cashbacks)
 
 @router.put("/cashback/{cashback_id}/approve")
 async def approve_cashback(cashback_id: str, db: Session = Depends(get_db)):
@@ -134,22 +144,24 @@ async def pay_cashback(cashback_id: str, db: Session = Depends(get_db)):
         )
     return {"message": "Cashback paid successfully"}
 
-@router.post("/referral", response_model=ReferralResponse)
+@router.post(
+    "/referral", response_model=ReferralResponse, openapi_extra=json_body_openapi(ReferralCreate)
+)
 async def create_referral(
-    referral_data: ReferralCreate,
+    referral_data: ReferralCreate = Depends(json_body(ReferralCreate)),
     db: Session = Depends(get_db)
 ):
     """Создать реферал"""
     service = PaymentService(db)
     referral = service.create_referral(referral_data)
-    return referral
+    return model_json_response(ReferralResponse.from_orm_row(referral))
 
 @router.get("/referral/user/{user_id}", response_model=List[ReferralResponse])
 async def get_referrals(user_id: str, db: Session = Depends(get_db)):
     """Получить рефералы пользователя"""
     service = PaymentService(db)
     referrals = service.get_referrals(user_id)
-    return referrals
+    return validated_json_response(referral_list_adapter, referrals)
 
 @router.put("/referral/{referral_id}/complete")
 async def complete_referral(referral_id: str, db: Session = Depends(get_db)):
@@ -1,19 +1,23 @@
 """API эндпоинты для социальных функций и геймификации"""
 
+from typing import Dict, List
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.services.social_service import SocialService
+from app.services.post_counter_service import post_counter_service
 from app.schemas.social import (
     UserProfileResponse, UserProfileCreate, UserProfileUpdate,
     GroupResponse, GroupCreate, GroupUpdate, GroupJoinRequest,
     SocialPostResponse, SocialPostCreate, SocialPostUpdate,
     CommentResponse, CommentCreate, MessageResponse, MessageCreate,
     LikeCreate, LikeResponse, LeaderboardResponse, LeaderboardCreate,
-    LeaderboardEntryResponse, NotificationResponse, SocialFeedResponse,
+    LeaderboardEntryResponse, NotificationResponse, SocialFeedResponse, SocialFeedResponseV2,
     UserStatsResponse, GamificationPointsResponse, FriendshipRequest,
-    FollowRequest, AchievementResponse, UserAchievementResponse
+    FollowRequest, AchievementResponse, UserAchievementResponse,
+    social_post_list_adapter, social_post_lite_list_adapter
 )
 
 router = APIRouter()
@@ -158,7 +162,51 @@ async def get_social_feed(
     posts = service.get_social_feed(user_id, page, limit)
 
     return SocialFeedResponse(
-        posts=posts,
+        posts=social_post_list_adapter.validate_python(posts),
+        total=len(posts),
+        page=page,
+        has_more=len(posts) == limit
+    )
+
+@router.get("/feed/v2", response_model=SocialFeedResponseV2)
+async def get_social_feed_v2(
+    user_id: str = Query(..., description="ID пользователя"),
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    limit: int = Query(20, ge=1, le=100, description="Количество постов"),
+    db: Session = Depends(get_db)
+):
+    """Получить социальную ленту; профиль каждого автора передается один раз в profiles"""
+    service = SocialService(db)
+    posts = service.get_social_feed(user_id, page, limit)
+
+    authors = {}
+    for post in posts:
+        authors.setdefault(str(post.author_id), post.author)
+
+    return SocialFeedResponseV2(
+        posts=social_post_lite_list_adapter.validate_python(posts),
+        profiles={
+            author_id: UserProfileResponse.from_orm_row(author)
+            for author_id, author in authors.items()
+        },
+        total=len(posts),
+        page=page,
+        has_more=len(posts) == limit
+    )
+
+@router.get("/posts/search", response_model=SocialFeedResponse)
+async def search_posts(
+    q: str = Query(..., min_length=1, description="Поисковый запрос"),
+    page: int = Query(1, ge=1, description="Номер страницы"),
+    limit: int = Query(20, ge=1, le=100, description="Количество постов"),
+    db: Session = Depends(get_db)
+):
+    """Полнотекстовый поиск по публичным постам"""
+    service = SocialService(db)
+    posts = service.search_posts(q, page, limit)
+
+    return SocialFeedResponse(
+        posts=social_post_list_adapter.validate_python(posts),
         total=len(posts),
         page=page,
         has_more=len(posts) == limit
@@ -174,8 +222,15 @@ async def get_post(post_id: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Post not found"
         )
+
+    await post_counter_service.record_view(post_id, db)
     return post
 
+@router.get("/posts/{post_id}/reactions", response_model=Dict[str, int])
+async def get_post_reactions(post_id: str, db: Session = Depends(get_db)):
+    """Количество лайков поста по типам"""
+    return await post_counter_service.get_reactions(post_id, db)
+
 @router.put("/posts/{post_id}", response_model=SocialPostResponse)
 async def update_post(
     post_id: str,
@@ -278,15 +333,19 @@ async def toggle_like(
 ):
     """Переключить лайк"""
     service = SocialService(db)
-    success = service.toggle_like(like_data, user_id)
-    if not success:
+    result = service.toggle_like(like_data, user_id)
+    if result is None:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Failed to toggle like"
         )
 
+    liked, like_type = result
+    if like_data.target == "post":
+        await post_counter_service.record_like(like_data.post_id, like_type.value, 1 if liked else -1, db)
+
     # Возвращаем информацию о лайке
-    if like_data.post_id:
+    if like_data.target == "post":
         like = service.db.query(Like).filter(
             Like.user_id == user_id,
             Like.post_id == like_data.post_id
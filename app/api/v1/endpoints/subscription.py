@@ -4,6 +4,8 @@ from typing import List
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
+from app.api.deps import json_body, json_body_openapi
+from app.api.responses import model_json_response, validated_json_response
 from app.core.database import get_db
 from app.services.subscription_service import SubscriptionService
 from app.services.payment_service import PaymentService
@@ -11,7 +13,8 @@ from app.schemas.subscription import (
     SubscriptionResponse, SubscriptionCreate, SubscriptionUpdate,
     SubscriptionPlanResponse, BillingSummary, PaymentResponse,
     CashbackResponse, ReferralResponse, PaymentIntentCreate,
-    PaymentIntentResponse
+    PaymentIntentResponse, subscription_plan_list_adapter,
+    billing_summary_adapter
 )
 from app.models.subscription import SubscriptionTier
 
@@ -22,10 +25,10 @@ async def get_subscription_plans(db: Session = Depends(get_db)):
     """Получить все тарифные планы"""
     service = SubscriptionService(db)
     plans = service.get_subscription_plans()
-    return plans
+    return validated_json_response(subscription_plan_list_adapter, plans)
 
 @router.get("/plans/{tier}", response_model=SubscriptionPlanResponse)
-async def get_subscription_plan(tier: SubscriptionTier, db: Session = Depends(get_db))  # noqa  # noqa: E501 E501
+async def get_subscription_plan(tier: SubscriptionTier, db: Session = Depends(get_db)):
     """Получить тарифный план по уровню"""
     service = SubscriptionService(db)
     plan = service.get_subscription_plan(tier)
@@ -34,7 +37,7 @@ async def get_subscription_plan(tier: SubscriptionTier, db: Session = Depends(ge
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Subscription plan not found"
         )
-    return plan
+    return model_json_response(SubscriptionPlanResponse.from_orm_row(plan))
 
 @router.get("/user/{user_id}", response_model=SubscriptionResponse)
 async def get_user_subscription(user_id: str, db: Session = Depends(get_db)):
@@ -46,17 +49,19 @@ async def get_user_subscription(user_id: str, db: Session = Depends(get_db)):
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User subscription not found"
         )
-    return subscription
+    return model_json_response(SubscriptionResponse.from_orm_row(subscription))
 
-@router.post("/", response_model=SubscriptionResponse)
+@router.post(
+    "/", response_model=SubscriptionResponse, openapi_extra=json_body_openapi(SubscriptionCreate)
+)
 async def create_subscription(
-    subscription_data: SubscriptionCreate,
+    subscription_data: SubscriptionCreate = Depends(json_body(SubscriptionCreate)),
     db: Session = Depends(get_db)
 ):
     """Создать подписку"""
     service = SubscriptionService(db)
     subscription = service.create_subscription(subscription_data)
-    return subscription
+    return model_json_response(SubscriptionResponse.from_orm_row(subscription))
 
 @router.put("/{subscription_id}", response_model=SubscriptionResponse)
 async def update_subscription(
@@ -72,10 +77,10 @@ async def update_subscription(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Subscription not found"
         )
-    return subscription
+    return model_json_response(SubscriptionResponse.from_orm_row(subscription))
 
 @router.delete("/{subscription_id}")
-async def cancel_subscription(subscription_id: str, db: Session = Depends(get_db))  # noqa  # noqa: E501 E501
+async def cancel_subscription(subscription_id: str, db: Session = Depends(get_db)):
     """Отменить подписку"""
     service = SubscriptionService(db)
     success = service.cancel_subscription(subscription_id)
@@ -123,7 +128,7 @@ async def get_billing_summary(user_id: str, db: Session = Depends(get_db)):
     """Получить сводку по биллингу пользователя"""
     service = SubscriptionService(db)
     summary = service.get_billing_summary(user_id)
-    return summary
+    return validated_json_response(billing_summary_adapter, summary)
 
 @router.get("/user/{user_id}/limits")
 async def get_subscription_limits(user_id: str, db: Session = Depends(get_db)):
@@ -133,7 +138,7 @@ async def get_subscription_limits(user_id: str, db: Session = Depends(get_db)):
     return limits
 
 @router.get("/user/{user_id}/feature/{feature}")
-async def check_feature_access(user_id: str, feature: str, db: Session = Depends(get_db))  # noqa  # noqa: E501 E501
+async def check_feature_access(user_id: str, feature: str, db: Session = Depends(get_db)):
     """Проверить доступ к функции"""
     service = SubscriptionService(db)
     has_access = service.can_use_feature(user_id, feature)
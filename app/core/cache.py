@@ -1,15 +1,39 @@
 """
 Redis cache service
 """
-import json
 import pickle
+import uuid
+from enum import Enum
 from typing import Any, Optional, Union
+import orjson
 import redis.asyncio as redis
 from app.core.config import settings
 import logging
 
 logger = logging.getLogger(__name__)
 
+# datetime и dataclass уходят в pickle, чтобы из кэша возвращался тот же тип
+JSON_DUMPS_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+# orjson кодирует UUID и Enum сам, без опции passthrough, но из JSON они вернутся строкой
+PICKLED_TYPES = (uuid.UUID, Enum)
+
+# Ключи словаря, которые JSON хранит так же, как json.dumps: как строку
+JSON_KEY_TYPES = frozenset({str, int, float, bool, type(None)})
+
+
+def _json_roundtrips(value: Any) -> bool:
+    """Проверить, что orjson не превратит в строку UUID, Enum или ключ словаря другого типа"""
+    if isinstance(value, PICKLED_TYPES):
+        return False
+    if isinstance(value, dict):
+        return all(
+            type(key) in JSON_KEY_TYPES and _json_roundtrips(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return all(_json_roundtrips(item) for item in value)
+    return True
+
 
 class CacheService:
     """Redis cache service for application caching"""
@@ -55,8 +79,8 @@ class CacheService:
             
             # Try to deserialize as JSON first, then pickle
             try:
-                return json.loads(value.decode('utf-8'))
-            except (json.JSONDecodeError, UnicodeDecodeError):
+                return orjson.loads(value)
+            except orjson.JSONDecodeError:
                 return pickle.loads(value)
                 
         except Exception as e:
@@ -76,10 +100,10 @@ class CacheService:
         
         try:
             # Serialize value
-            if use_json:
+            if use_json and _json_roundtrips(value):
                 try:
-                    serialized_value = json.dumps(value, ensure_ascii=False)
-                except (TypeError, ValueError):
+                    serialized_value = orjson.dumps(value, option=JSON_DUMPS_OPTIONS)
+                except orjson.JSONEncodeError:
                     # Fallback to pickle for non-JSON serializable objects
                     serialized_value = pickle.dumps(value)
             else:
@@ -49,6 +49,14 @@ class Settings(BaseSettings):
     update_interval_minutes: int = 30
     alert_check_interval_minutes: int = 15
 
+    # Социальные функции
+    user_feed_refresh_interval_seconds: int = 60
+    post_counters_flush_interval_seconds: int = 60
+
+    # Аналитика
+    price_stats_refresh_interval_seconds: int = 300
+    analytics_cache_ttl_seconds: int = 60
+
     # Подписки
     free_items_limit: int = 3
     free_alerts_limit: int = 5
@@ -78,7 +86,7 @@ settings = Settings()
 def load_parsing_profiles():
     """Загружает профили парсинга из JSON"""
     try:
-        with open("profiles/parsing_profiles.json", "r", encoding="utf-8") as f  # noqa  # noqa: E501 E501
+        with open("profiles/parsing_profiles.json", "r", encoding="utf-8") as f:
             return json.load(f)
     except FileNotFoundError:
         return {}
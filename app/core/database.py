@@ -1,10 +1,10 @@
 """
 Настройка базы данных с использованием SQLAlchemy 2.0
 """
-from sqlalchemy import create_engine
+from sqlalchemy import MetaData, create_engine, Enum as SAEnum
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool, QueuePool
+from sqlalchemy.pool import AsyncAdaptedQueuePool, StaticPool, QueuePool
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.core.config import settings
 import logging
@@ -14,6 +14,15 @@ logger = logging.getLogger(__name__)
 # Базовый класс для моделей
 Base = declarative_base()
 
+# Метаданные представлений: не попадают в Base.metadata.create_all и autogenerate,
+# сами представления создаются миграциями
+views_metadata = MetaData()
+
+
+def db_enum(enum_cls, name: str) -> SAEnum:
+    """Нативный ENUM PostgreSQL, хранящий значения (а не имена) Python Enum"""
+    return SAEnum(enum_cls, name=name, values_callable=lambda members: [m.value for m in members])
+
 # Синхронный движок
 if settings.database_url.startswith("sqlite"):
     engine = create_engine(
@@ -36,16 +45,22 @@ else:
     )
 
 # Асинхронный движок
-async_database_url = settings.database_url.replace("postgresql://", "postgresql+asyncpg://")
-async_engine = create_async_engine(
-    async_database_url,
-    poolclass=QueuePool,
-    pool_size=settings.database_pool_size,
-    max_overflow=settings.database_max_overflow,
-    pool_timeout=settings.database_pool_timeout,
-    pool_recycle=settings.database_pool_recycle,
-    echo=settings.debug
-)
+if settings.database_url.startswith("sqlite"):
+    async_engine = create_async_engine(
+        settings.database_url.replace("sqlite://", "sqlite+aiosqlite://"),
+        poolclass=StaticPool,
+        echo=settings.debug
+    )
+else:
+    async_engine = create_async_engine(
+        settings.database_url.replace("postgresql://", "postgresql+asyncpg://"),
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=settings.database_pool_size,
+        max_overflow=settings.database_max_overflow,
+        pool_timeout=settings.database_pool_timeout,
+        pool_recycle=settings.database_pool_recycle,
+        echo=settings.debug
+    )
 
 # Создание фабрики сессий
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -4,14 +4,18 @@ FastAPI application entry point
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import time
 import logging
 
 from app.core.config import settings
 from app.core.database import init_db, init_async_db, close_db
 from app.core.cache import cache_service
+from app.services.social_service import user_feed_refresh_loop
+from app.services.post_counter_service import post_counter_service, post_counters_flush_loop
+from app.services.advanced_analytics_service import price_stats_refresh_loop
 from app.api.v1.endpoints import items, parsing, ai, marketplaces, niche_analysis, automation, subscription, payment, russian_marketplaces, social, advanced_analytics, report_scheduler, international, webhooks, websocket, graphql, api_analytics, performance
 
 # Configure logging
@@ -34,12 +38,31 @@ async def lifespan(app: FastAPI):
     await cache_service.connect()
     logger.info("✅ Cache service initialized")
     
+    # Build and cache the OpenAPI schema before serving so JSON schemas of
+    # all response models are not generated on the first docs request
+    app.openapi()
+    logger.info("✅ OpenAPI schema built")
+    
+    # Start background tasks
+    feed_refresh_task = asyncio.create_task(user_feed_refresh_loop())
+    logger.info("✅ User feed refresh task started")
+    counters_flush_task = asyncio.create_task(post_counters_flush_loop())
+    logger.info("✅ Post counters flush task started")
+    price_stats_task = asyncio.create_task(price_stats_refresh_loop())
+    logger.info("✅ Price stats refresh task started")
+    
     # TODO: Start background tasks (scheduler, monitoring)
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down Universal Parser API...")
+    background_tasks = (feed_refresh_task, counters_flush_task, price_stats_task)
+    for task in background_tasks:
+        task.cancel()
+    # Wait for the tasks to stop so they do not touch Redis or the DB after close
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await post_counter_service.flush()
     await cache_service.disconnect()
     await close_db()
 
@@ -52,6 +75,8 @@ app = FastAPI(
     openapi_url=f"{settings.api_v1_prefix}/openapi.json",
     docs_url=f"{settings.api_v1_prefix}/docs",
     redoc_url=f"{settings.api_v1_prefix}/redoc",
+    # Ответы кодируются orjson вместо стандартного json.dumps
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
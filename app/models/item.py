@@ -1,9 +1,9 @@
 """
 Модели товаров и отслеживания
 """
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, JSON, ForeignKey, Table
 from sqlalchemy.orm import relationship
-from app.core.database import Base
+from app.core.database import Base, views_metadata
 from datetime import datetime
 from typing import Optional
 
@@ -82,6 +82,8 @@ class PriceHistory(Base):
     
     # Временная метка
     timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    # На PostgreSQL миграция 012 добавляет хранимую колонку day = date_trunc('day', timestamp)
+    # с BRIN-индексом; в модели ее нет, чтобы create_all работал и на SQLite
     
     # Связи
     user = relationship("User", back_populates="price_history")
@@ -91,6 +93,23 @@ class PriceHistory(Base):
         return f"<PriceHistory(id={self.id}, price={self.price}, timestamp={self.timestamp})>"
 
 
+# Дневные агрегаты цен по маркетплейсу и категории из материализованного
+# представления price_daily_stats (только чтение). Суммы и суммы квадратов
+# позволяют объединять дни в любые периоды и считать стандартное отклонение
+price_daily_stats = Table(
+    'price_daily_stats',
+    views_metadata,
+    Column('day', DateTime),
+    Column('marketplace', String(50)),
+    Column('category', String(255)),
+    Column('price_count', Integer),
+    Column('price_sum', Float),
+    Column('price_sq_sum', Float),
+    Column('min_price', Float),
+    Column('max_price', Float)
+)
+
+
 class Marketplace(Base):
     """Справочник маркетплейсов"""
     __tablename__ = "marketplaces"
@@ -1,12 +1,62 @@
 """Модели для социальных функций и геймификации"""
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, Table
+from enum import Enum
+from sqlalchemy import (
+    Column, Integer, String, DateTime, Boolean, Text, Float, ForeignKey, Table,
+    event, select
+)
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID, JSON
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, db_enum, views_metadata
+
+class FriendshipStatus(str, Enum):
+    """Статусы дружбы"""
+    PENDING = "pending"
+    ACCEPTED = "accepted"
+    BLOCKED = "blocked"
+
+class GroupRole(str, Enum):
+    """Роли участников группы"""
+    MEMBER = "member"
+    MODERATOR = "moderator"
+    ADMIN = "admin"
+
+class PostType(str, Enum):
+    """Типы постов"""
+    TEXT = "text"
+    IMAGE = "image"
+    VIDEO = "video"
+    LINK = "link"
+    ITEM = "item"
+
+class LikeType(str, Enum):
+    """Типы лайков"""
+    LIKE = "like"
+    LOVE = "love"
+    LAUGH = "laugh"
+    ANGRY = "angry"
+    SAD = "sad"
+
+class NotificationType(str, Enum):
+    """Типы уведомлений"""
+    FRIEND_REQUEST = "friend_request"
+    FRIEND_ACCEPTED = "friend_accepted"
+    LIKE = "like"
+    COMMENT = "comment"
+    MESSAGE = "message"
+    ACHIEVEMENT = "achievement"
+    GROUP_INVITE = "group_invite"
+    MENTION = "mention"
+
+class LeaderboardPeriod(str, Enum):
+    """Периоды лидербордов"""
+    DAILY = "daily"
+    WEEKLY = "weekly"
+    MONTHLY = "monthly"
+    ALL = "all"
 
 # Таблица связей друзей
 friendship = Table(
@@ -14,7 +64,7 @@ friendship = Table(
     Base.metadata,
     Column('user_id', UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True),
     Column('friend_id', UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True),
-    Column('status', String(20), default='pending'),  # pending, accepted, blocked
+    Column('status', db_enum(FriendshipStatus, 'friendship_status'), default=FriendshipStatus.PENDING),
     Column('created_at', DateTime, default=datetime.utcnow)
 )
 
@@ -33,7 +83,7 @@ group_members = Table(
     Base.metadata,
     Column('group_id', UUID(as_uuid=True), ForeignKey('groups.id'), primary_key=True),
     Column('user_id', UUID(as_uuid=True), ForeignKey('users.id'), primary_key=True),
-    Column('role', String(20), default='member'),  # member, moderator, admin
+    Column('role', db_enum(GroupRole, 'group_role'), default=GroupRole.MEMBER),
     Column('joined_at', DateTime, default=datetime.utcnow)
 )
 
@@ -176,12 +226,18 @@ class SocialPost(Base):
     # Содержимое
     content = Column(Text, nullable=False)
     media_urls = Column(JSON, nullable=True)  # Ссылки на медиафайлы
-    post_type = Column(String(20), default='text')  # text, image, video, link, etc.
+    post_type = Column(db_enum(PostType, 'post_type'), default=PostType.TEXT)
+    # search_vector (tsvector с GIN-индексом) в social_posts, comments и messages добавляет
+    # миграция 006 только на PostgreSQL; в моделях колонки нет, чтобы create_all работал на SQLite
 
     # Связанные данные
     item_id = Column(UUID(as_uuid=True), ForeignKey("tracked_items.id"), nullable=True)
     marketplace = Column(String(50), nullable=True)
 
+    # Снимок профиля автора для рендеринга без JOIN (синхронизируется триггером)
+    author_display_name = Column(String(100), nullable=True)
+    author_avatar_url = Column(String(500), nullable=True)
+
     # Настройки
     is_public = Column(Boolean, default=True)
     allow_comments = Column(Boolean, default=True)
@@ -217,6 +273,10 @@ class Comment(Base):
     content = Column(Text, nullable=False)
     media_urls = Column(JSON, nullable=True)
 
+    # Снимок профиля автора для рендеринга без JOIN (синхронизируется триггером)
+    author_display_name = Column(String(100), nullable=True)
+    author_avatar_url = Column(String(500), nullable=True)
+
     # Статистика
     like_count = Column(Integer, default=0)
     reply_count = Column(Integer, default=0)
@@ -242,7 +302,7 @@ class Like(Base):
     comment_id = Column(UUID(as_uuid=True), ForeignKey("comments.id"), nullable=True)
 
     # Тип лайка
-    like_type = Column(String(20), default='like')  # like, love, laugh, angry, etc.
+    like_type = Column(db_enum(LikeType, 'like_type'), default=LikeType.LIKE)
 
     # Временные метки
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -265,9 +325,11 @@ class Message(Base):
     media_urls = Column(JSON, nullable=True)
     message_type = Column(String(20), default='text')  # text, image, file, etc.
 
-    # Статус
-    is_read = Column(Boolean, default=False)
-    read_at = Column(DateTime, nullable=True)
+    # Снимок профиля автора для рендеринга без JOIN (синхронизируется триггером)
+    author_display_name = Column(String(100), nullable=True)
+    author_avatar_url = Column(String(500), nullable=True)
+
+    # Статус (отметки о прочтении хранятся в message_reads, чтобы не переписывать строку сообщения)
     is_deleted = Column(Boolean, default=False)
 
     # Временные метки
@@ -277,6 +339,31 @@ class Message(Base):
     # Связи
     sender = relationship("UserProfile", foreign_keys=[sender_id], back_populates="messages_sent")
     receiver = relationship("UserProfile", foreign_keys=[receiver_id], back_populates="messages_received")
+    reads = relationship("MessageRead", back_populates="message", cascade="all, delete-orphan")
+
+    @property
+    def read_at(self):
+        """Время прочтения получателем"""
+        for read in self.reads:
+            if read.user_id == self.receiver_id:
+                return read.read_at
+        return None
+
+    @property
+    def is_read(self) -> bool:
+        """Прочитано ли сообщение получателем"""
+        return self.read_at is not None
+
+class MessageRead(Base):
+    """Отметки о прочтении сообщений"""
+    __tablename__ = "message_reads"
+
+    message_id = Column(UUID(as_uuid=True), ForeignKey("messages.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("user_profiles.id"), primary_key=True)
+    read_at = Column(DateTime, default=datetime.utcnow)
+
+    # Связи
+    message = relationship("Message", back_populates="reads")
 
 class Leaderboard(Base):
     """Лидерборды"""
@@ -288,7 +375,7 @@ class Leaderboard(Base):
 
     # Тип лидерборда
     category = Column(String(50), nullable=False)  # parsing, trading, social, etc.
-    period = Column(String(20), default='all')  # daily, weekly, monthly, all
+    period = Column(db_enum(LeaderboardPeriod, 'leaderboard_period'), default=LeaderboardPeriod.ALL)
 
     # Настройки
     is_active = Column(Boolean, default=True)
@@ -334,7 +421,7 @@ class Notification(Base):
     # Содержимое
     title = Column(String(200), nullable=False)
     message = Column(Text, nullable=False)
-    notification_type = Column(String(50), nullable=False)  # friend_request, like, comment, etc.
+    notification_type = Column(db_enum(NotificationType, 'notification_type'), nullable=False)
 
     # Связанные данные
     related_id = Column(UUID(as_uuid=True), nullable=True)  # ID связанного объекта
@@ -349,3 +436,38 @@ class Notification(Base):
 
     # Связи
     user = relationship("UserProfile")
+
+def _snapshot_author_profile(mapper, connection, target):
+    """Скопировать display_name/avatar_url автора при вставке, если снимок не задан"""
+    if target.author_display_name is not None or target.author_avatar_url is not None:
+        return
+
+    author_id = target.sender_id if isinstance(target, Message) else target.author_id
+    row = connection.execute(
+        select(UserProfile.display_name, UserProfile.avatar_url).where(UserProfile.id == author_id)
+    ).first()
+    if row:
+        target.author_display_name, target.author_avatar_url = row
+
+for _model in (SocialPost, Comment, Message):
+    event.listen(_model, "before_insert", _snapshot_author_profile)
+
+class UserFeedEntry(Base):
+    """Запись ленты из материализованного представления user_feed_recent (только чтение)"""
+    __table__ = Table(
+        'user_feed_recent',
+        views_metadata,
+        Column('follower_id', UUID(as_uuid=True), primary_key=True),
+        Column('post_id', UUID(as_uuid=True), primary_key=True),
+        Column('created_at', DateTime),
+        Column('author_id', UUID(as_uuid=True)),
+        Column('like_count', Integer),
+        Column('comment_count', Integer)
+    )
+
+    # Связи
+    post = relationship(
+        "SocialPost",
+        primaryjoin="foreign(UserFeedEntry.post_id) == SocialPost.id",
+        viewonly=True
+    )
@@ -1,13 +1,21 @@
 """Модели подписок и биллинга"""
 
+import json
 from datetime import datetime
 from enum import Enum
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey
+from functools import lru_cache
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Float, Text, ForeignKey, and_, or_
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 
-from app.core.database import Base
+from app.core.database import Base, db_enum
+
+@lru_cache(maxsize=64)
+def _parse_feature_set(features: str) -> frozenset:
+    """Множество функций из JSON; тарифов немного, разбор кэшируется по тексту"""
+    return frozenset(json.loads(features))
 
 class SubscriptionTier(str, Enum):
     """Уровни подписки"""
@@ -15,6 +23,12 @@ class SubscriptionTier(str, Enum):
     PRO = "pro"
     PREMIUM = "premium"
 
+class SubscriptionStatus(str, Enum):
+    """Статусы подписки"""
+    ACTIVE = "active"
+    CANCELLED = "cancelled"
+    EXPIRED = "expired"
+
 class PaymentStatus(str, Enum):
     """Статусы платежей"""
     PENDING = "pending"
@@ -23,14 +37,26 @@ class PaymentStatus(str, Enum):
     REFUNDED = "refunded"
     CANCELLED = "cancelled"
 
+class CashbackStatus(str, Enum):
+    """Статусы кэшбека"""
+    PENDING = "pending"
+    APPROVED = "approved"
+    PAID = "paid"
+
+class ReferralStatus(str, Enum):
+    """Статусы реферала"""
+    PENDING = "pending"
+    COMPLETED = "completed"
+    PAID = "paid"
+
 class Subscription(Base):
     """Модель подписки пользователя"""
     __tablename__ = "subscriptions"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    tier = Column(String(20), nullable=False, default=SubscriptionTier.FREE)
-    status = Column(String(20), nullable=False, default="active")
+    tier = Column(db_enum(SubscriptionTier, "subscription_tier"), nullable=False, default=SubscriptionTier.FREE)
+    status = Column(db_enum(SubscriptionStatus, "subscription_status"), nullable=False, default=SubscriptionStatus.ACTIVE)
     start_date = Column(DateTime, nullable=False, default=datetime.utcnow)
     end_date = Column(DateTime, nullable=True)
     auto_renew = Column(Boolean, default=True)
@@ -41,14 +67,24 @@ class Subscription(Base):
     user = relationship("User", back_populates="subscription")
     payments = relationship("Payment", back_populates="subscription")
 
+    # Свойства, а не методы: схемы ответа читают их как атрибуты
+    @hybrid_property
     def is_active(self) -> bool:
         """Проверка активности подписки"""
-        if self.status != "active":
-            return False
-        if self.end_date and self.end_date < datetime.utcnow():
+        if self.status != SubscriptionStatus.ACTIVE:
             return False
-        return True
-
+        return self.end_date is None or self.end_date >= datetime.utcnow()
+
+    @is_active.inplace.expression
+    @classmethod
+    def _is_active_expression(cls):
+        """Условие активности для запросов; время - параметр, поэтому работает на любой СУБД"""
+        return and_(
+            cls.status == SubscriptionStatus.ACTIVE,
+            or_(cls.end_date.is_(None), cls.end_date >= datetime.utcnow())
+        )
+
+    @property
     def days_remaining(self) -> int:
         """Количество дней до окончания подписки"""
         if not self.end_date:
@@ -65,7 +101,7 @@ class Payment(Base):
     subscription_id = Column(UUID(as_uuid=True), ForeignKey("subscriptions.id"), nullable=True)
     amount = Column(Float, nullable=False)
     currency = Column(String(3), default="USD")
-    status = Column(String(20), nullable=False, default=PaymentStatus.PENDING)
+    status = Column(db_enum(PaymentStatus, "payment_status"), nullable=False, default=PaymentStatus.PENDING)
     payment_method = Column(String(50), nullable=False)  # stripe, paypal, etc.
     external_id = Column(String(255), nullable=True)  # ID в платежной системе
     description = Column(Text, nullable=True)
@@ -86,7 +122,7 @@ class Cashback(Base):
     percentage = Column(Float, nullable=False)  # Процент кэшбека
     source = Column(String(50), nullable=False)  # subscription, referral, bonus
     description = Column(Text, nullable=True)
-    status = Column(String(20), default="pending")  # pending, approved, paid
+    status = Column(db_enum(CashbackStatus, "cashback_status"), default=CashbackStatus.PENDING)
     created_at = Column(DateTime, default=datetime.utcnow)
     paid_at = Column(DateTime, nullable=True)
 
@@ -101,7 +137,7 @@ class Referral(Base):
     referrer_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     referred_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     reward_amount = Column(Float, default=0.0)
-    status = Column(String(20), default="pending")  # pending, completed, paid
+    status = Column(db_enum(ReferralStatus, "referral_status"), default=ReferralStatus.PENDING)
     created_at = Column(DateTime, default=datetime.utcnow)
     completed_at = Column(DateTime, nullable=True)
 
@@ -115,7 +151,7 @@ class SubscriptionPlan(Base):
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     name = Column(String(100), nullable=False)
-    tier = Column(String(20), nullable=False)
+    tier = Column(db_enum(SubscriptionTier, "subscription_tier"), nullable=False)
     price_monthly = Column(Float, nullable=False)
     price_yearly = Column(Float, nullable=False)
     features = Column(Text, nullable=True)  # JSON список функций
@@ -130,6 +166,12 @@ class SubscriptionPlan(Base):
             return []
         return json.loads(self.features)
 
+    def get_feature_set(self) -> frozenset:
+        """Получить множество функций для проверки доступа"""
+        if not self.features:
+            return frozenset()
+        return _parse_feature_set(self.features)
+
     def get_limits_dict(self) -> dict:
         """Получить словарь ограничений"""
         if not self.limits:
@@ -1,6 +1,8 @@
 """
 Модели пользователей и подписок
 """
+from datetime import datetime
+
 from sqlalchemy import Column, Integer, String, DateTime, Boolean, JSON, Text
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
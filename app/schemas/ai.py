@@ -1,14 +1,20 @@
 """
 Pydantic schemas for AI and Machine Learning features
 """
-from pydantic import BaseModel, Field
+import math
+from typing import Annotated, Optional, List, Dict, Any, Sequence, Tuple
+from pydantic import BaseModel, Field, PlainSerializer, TypeAdapter, model_validator
+from pydantic.dataclasses import dataclass
 
 class PredictionRequest(BaseModel):
     """Request schema for price prediction"""
     item_data: Dict[str, Any] = Field(..., description="Item data for prediction")
     days_ahead: int = Field(default=7, ge=1, le=30, description="Number of days to predict ahead")
 
-class PricePrediction(BaseModel):
+# Plain data rows created in bulk (prediction series, anomaly lists, per-model
+# metrics) are slotted dataclasses rather than BaseModel to keep them small
+@dataclass(slots=True)
+class PricePrediction:
     """Schema for individual price prediction"""
     date: str = Field(..., description="Prediction date")
     predicted_price: float = Field(..., description="Predicted price")
@@ -22,7 +28,8 @@ class PredictionResponse(BaseModel):
     predictions: List[PricePrediction] = Field(..., description="Price predictions")
     model_used: str = Field(..., description="ML model used for prediction")
 
-class AnomalyResponse(BaseModel):
+@dataclass(slots=True)
+class AnomalyResponse:
     """Response schema for price anomaly"""
     timestamp: str = Field(..., description="Anomaly timestamp")
     price: float = Field(..., description="Anomalous price")
@@ -32,6 +39,19 @@ class AnomalyResponse(BaseModel):
     severity: float = Field(..., ge=0, le=1, description="Anomaly severity (0-1)")
     description: str = Field(..., description="Human-readable description")
 
+# Positional labels of seasonal patterns in API output (month 1-12, weekday Monday=0)
+MONTH_LABELS = tuple(str(month) for month in range(1, 13))
+WEEKDAY_LABELS = tuple(str(day) for day in range(7))
+
+def _pattern_serializer(labels: Sequence[str]) -> PlainSerializer:
+    """Serialize a fixed-length pattern as {label: value}, omitting periods without data (NaN)"""
+    def serialize(values: Tuple[float, ...]) -> Dict[str, float]:
+        return {label: value for label, value in zip(labels, values) if not math.isnan(value)}
+    return PlainSerializer(serialize, return_type=Dict[str, float])
+
+MonthlyPattern = Annotated[Tuple[float, ...], Field(min_length=12, max_length=12), _pattern_serializer(MONTH_LABELS)]
+WeeklyPattern = Annotated[Tuple[float, ...], Field(min_length=7, max_length=7), _pattern_serializer(WEEKDAY_LABELS)]
+
 class TrendAnalysisResponse(BaseModel):
     """Response schema for trend analysis"""
     trend_slope: float = Field(..., description="Price trend slope")
@@ -42,18 +62,30 @@ class TrendAnalysisResponse(BaseModel):
     max_price: float = Field(..., description="Maximum price in period")
     avg_price: float = Field(..., description="Average price in period")
     price_range: float = Field(..., description="Price range (max - min)")
-    monthly_patterns: Dict[str, float] = Field(..., description="Monthly price patterns")
-    weekly_patterns: Dict[str, float] = Field(..., description="Weekly price patterns")
+    monthly_patterns: MonthlyPattern = Field(..., description="Average price per month (January first)")
+    weekly_patterns: WeeklyPattern = Field(..., description="Average price per weekday (Monday first)")
     data_points: int = Field(..., description="Number of data points analyzed")
     time_span_days: int = Field(..., description="Time span in days")
 
+class PriceSeriesRequest(BaseModel):
+    """Request schema for trend analysis over columnar price history"""
+    timestamps: List[float] = Field(..., min_length=1, description="Unix timestamps in seconds")
+    prices: List[float] = Field(..., min_length=1, description="Prices aligned with timestamps")
+
+    @model_validator(mode="after")
+    def check_aligned(self) -> "PriceSeriesRequest":
+        if len(self.timestamps) != len(self.prices):
+            raise ValueError("timestamps and prices must have the same length")
+        return self
+
 class RecommendationResponse(BaseModel):
     """Response schema for item recommendation"""
     item: Dict[str, Any] = Field(..., description="Recommended item data")
     score: float = Field(..., ge=0, le=1, description="Recommendation score (0-1)")
     reason: str = Field(..., description="Reason for recommendation")
 
-class ModelMetrics(BaseModel):
+@dataclass(slots=True)
+class ModelMetrics:
     """Schema for model performance metrics"""
     mae: Optional[float] = Field(None, description="Mean Absolute Error")
     mse: Optional[float] = Field(None, description="Mean Squared Error")
@@ -91,3 +123,13 @@ class AIInsightsResponse(BaseModel):
     analysis_period_days: int = Field(..., description="Analysis period in days")
     insights: Dict[str, Any] = Field(..., description="AI insights")
     timestamp: float = Field(..., description="Analysis timestamp")
+
+# Batch validation of result lists in a single pydantic-core pass
+price_prediction_list_adapter = TypeAdapter(List[PricePrediction])
+anomaly_list_adapter = TypeAdapter(List[AnomalyResponse])
+
+# Build nested core schemas at import time so a missing reference fails on
+# startup instead of on the first request
+PredictionResponse.model_rebuild()
+ModelPerformanceResponse.model_rebuild()
+TrainingResponse.model_rebuild()
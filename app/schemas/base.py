@@ -0,0 +1,226 @@
+"""
+Базовые схемы ответов, собираемых из ORM-объектов
+"""
+import sys
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Annotated, Any, Callable, ClassVar, Dict, Literal, Optional, Tuple, Type, Union, get_args, get_origin
+
+import orjson
+from pydantic import AfterValidator, BaseModel, BeforeValidator, ConfigDict, SkipValidation
+
+# Значение не подходит для быстрого пути - нужна полная валидация
+_INVALID = object()
+
+Converter = Callable[[Any], Any]
+
+def _empty_if_none(value: Any) -> Any:
+    return {} if value is None else value
+
+
+class _JSONBlob(BeforeValidator):
+    """Маркер валидатора JSONBlob"""
+
+
+# Произвольный JSON из колонки БД (характеристики, сырые данные парсинга).
+# SQLAlchemy уже возвращает разобранный dict - повторно обходить его валидатором незачем;
+# NULL из nullable-колонки отдается как пустой dict
+JSONBlob = Annotated[SkipValidation[Dict[str, Any]], _JSONBlob(_empty_if_none)]
+
+
+def _load_json_text(value: Any) -> Any:
+    if isinstance(value, (str, bytes)):
+        return orjson.loads(value)
+    return value
+
+
+def _json_text_converter(value: Any) -> Any:
+    try:
+        return _load_json_text(value)
+    except orjson.JSONDecodeError:
+        return _INVALID
+
+
+class _JSONText(BeforeValidator):
+    """Маркер валидатора JSONText"""
+
+
+# JSON, хранящийся в Text-колонке: строка разбирается orjson один раз,
+# результат отдается без рекурсивного обхода валидатором
+JSONText = Annotated[SkipValidation[Any], _JSONText(_load_json_text)]
+
+
+def _passthrough(value: Any) -> Any:
+    return value
+
+
+class _EnumLookup(BeforeValidator):
+    """Маркер валидатора enum_by_value: для готового члена Enum он ничего не меняет"""
+
+
+def enum_by_value(enum_cls: Type[Enum]) -> Any:
+    """Тип поля Enum, где строка переводится в член одним обращением к _value2member_map_"""
+    value_map = enum_cls._value2member_map_
+
+    def lookup(value: Any) -> Any:
+        if isinstance(value, str):
+            return value_map.get(value, value)
+        return value
+
+    return Annotated[enum_cls, _EnumLookup(lookup)]
+
+
+def _to_epoch_millis(value: Any) -> Any:
+    if isinstance(value, datetime):
+        # Наивные метки времени в БД записаны через datetime.utcnow
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    return value
+
+
+def _epoch_millis_converter(value: Any) -> Any:
+    value = _to_epoch_millis(value)
+    return value if type(value) is int else _INVALID
+
+
+class _EpochMillis(BeforeValidator):
+    """Маркер валидатора EpochMillis"""
+
+
+# Время в миллисекундах Unix: принимает datetime из ORM, на выходе - целое число
+EpochMillis = Annotated[int, _EpochMillis(_to_epoch_millis)]
+
+
+def _intern(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else value
+
+
+def _interned_converter(value: Any) -> Any:
+    return sys.intern(value) if type(value) is str else _INVALID
+
+
+class _Interned(AfterValidator):
+    """Маркер валидатора InternedStr"""
+
+
+# Строка из небольшого набора значений (валюта, тариф): одинаковые значения
+# во всех строках выборки разделяют один объект str
+InternedStr = Annotated[str, _Interned(_intern)]
+
+
+def _plain_converter(annotation: Any) -> Optional[Converter]:
+    """Проверка значения поля без валидатора; None - поле всегда требует валидации"""
+    origin = get_origin(annotation)
+
+    if origin is Union:
+        args = get_args(annotation)
+        if len(args) != 2 or type(None) not in args:
+            return None
+        inner = _plain_converter(next(arg for arg in args if arg is not type(None)))
+        if inner is None:
+            return None
+        return lambda value: value if value is None else inner(value)
+
+    if origin is Literal:
+        allowed = frozenset(get_args(annotation))
+        if not all(type(option) is str for option in allowed):
+            return None
+
+        def convert_literal(value: Any) -> Any:
+            # Колонки db_enum отдают члены str-Enum - в ответ идет их значение
+            if isinstance(value, Enum):
+                value = value.value
+            return value if type(value) is str and value in allowed else _INVALID
+
+        return convert_literal
+
+    if origin is dict:
+        if get_args(annotation) not in ((), (str, Any)):
+            return None
+        return lambda value: value if type(value) is dict else _INVALID
+
+    if origin is list:
+        if get_args(annotation) != (str,):
+            return None
+        return lambda value: (
+            value if type(value) is list and all(type(item) is str for item in value) else _INVALID
+        )
+
+    if isinstance(annotation, type):
+        if issubclass(annotation, ORMResponse):
+            return annotation.from_orm_row
+        if issubclass(annotation, BaseModel):
+            return None
+        return lambda value: value if type(value) is annotation else _INVALID
+
+    return None
+
+
+class ORMResponse(BaseModel):
+    """Схема ответа с быстрой сборкой из ORM-объекта.
+
+    Имена полей интернируются при создании класса. Если значения ORM-объекта
+    уже имеют точные типы полей, экземпляр собирается через model_construct
+    без прохода валидаторов, иначе - обычный model_validate. Схемы с
+    field_validator/model_validator всегда проходят model_validate.
+    """
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
+
+    _orm_converters: ClassVar[Optional[Tuple[Tuple[str, Converter], ...]]] = None
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs: Any) -> None:
+        super().__pydantic_init_subclass__(**kwargs)
+
+        # Валидаторы схемы (в т.ч. унаследованные) model_construct не вызывает
+        decorators = cls.__pydantic_decorators__
+        if (decorators.field_validators or decorators.model_validators
+                or decorators.validators or decorators.root_validators):
+            cls._orm_converters = None
+            return
+
+        converters = []
+        for name, field in cls.model_fields.items():
+            metadata = [meta for meta in field.metadata if not isinstance(meta, _EnumLookup)]
+            if any(isinstance(meta, _JSONText) for meta in metadata):
+                converters.append((sys.intern(name), _json_text_converter))
+                continue
+            if any(isinstance(meta, _Interned) for meta in metadata):
+                converters.append((sys.intern(name), _interned_converter))
+                continue
+            if any(isinstance(meta, _JSONBlob) for meta in metadata):
+                converters.append((sys.intern(name), _empty_if_none))
+                continue
+            if any(isinstance(meta, SkipValidation) for meta in metadata):
+                converters.append((sys.intern(name), _passthrough))
+                continue
+            if any(isinstance(meta, _EpochMillis) for meta in metadata):
+                converters.append((sys.intern(name), _epoch_millis_converter))
+                continue
+            # Ограничения (ge, max_length и т.п.) проверяются только валидатором
+            convert = None if metadata else _plain_converter(field.annotation)
+            if convert is None:
+                cls._orm_converters = None
+                return
+            converters.append((sys.intern(name), convert))
+        cls._orm_converters = tuple(converters)
+
+    @classmethod
+    def from_orm_row(cls, obj: Any) -> "ORMResponse":
+        """Собрать схему из ORM-объекта"""
+        converters = cls._orm_converters
+        if converters is None:
+            return cls.model_validate(obj)
+
+        values = {}
+        for name, convert in converters:
+            value = getattr(obj, name, _INVALID)
+            if value is _INVALID:
+                return cls.model_validate(obj)
+            value = convert(value)
+            if value is _INVALID:
+                return cls.model_validate(obj)
+            values[name] = value
+
+        return cls.model_construct(**values)
@@ -5,6 +5,8 @@ from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field
 from datetime import datetime
 
+from app.schemas.base import JSONBlob, ORMResponse
+
 
 class ItemBase(BaseModel):
     """Base item schema"""
@@ -32,7 +34,7 @@ class ItemUpdate(BaseModel):
     is_active: Optional[bool] = None
 
 
-class ItemResponse(ItemBase):
+class ItemResponse(ItemBase, ORMResponse):
     """Schema for item response"""
     id: int
     user_id: int
@@ -42,19 +44,26 @@ class ItemResponse(ItemBase):
     current_reviews_count: Optional[int] = None
     image_url: Optional[str] = None
     description: Optional[str] = None
-    specifications: Dict[str, Any] = Field(default_factory=dict)
+    specifications: JSONBlob = Field(default_factory=dict)
     is_active: bool = True
     is_available: bool = True
     created_at: datetime
     last_updated: datetime
     last_checked: Optional[datetime] = None
-    tracking_settings: Dict[str, Any] = Field(default_factory=dict)
-    
-    class Config:
-        from_attributes = True
+    tracking_settings: JSONBlob = Field(default_factory=dict)
+
+    @classmethod
+    def from_trusted_row(cls, row: Any) -> "ItemResponse":
+        """Build from a TrackedItem row without validation; column types are guaranteed by the DB schema"""
+        values = {name: getattr(row, name) for name in cls.model_fields}
+        # Nullable JSON columns: match model_validate, which turns NULL into {}
+        for name in ("specifications", "tracking_settings"):
+            if values[name] is None:
+                values[name] = {}
+        return cls.model_construct(**values)
 
 
-class PriceHistoryResponse(BaseModel):
+class PriceHistoryResponse(ORMResponse):
     """Schema for price history response"""
     id: int
     user_id: int
@@ -66,11 +75,8 @@ class PriceHistoryResponse(BaseModel):
     rating: Optional[float] = None
     reviews_count: Optional[int] = None
     source: Optional[str] = None
-    raw_data: Dict[str, Any] = Field(default_factory=dict)
+    raw_data: JSONBlob = Field(default_factory=dict)
     timestamp: datetime
-    
-    class Config:
-        from_attributes = True
 
 
 class ItemStatsResponse(BaseModel):
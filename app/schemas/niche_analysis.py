@@ -1,14 +1,19 @@
 """
 Pydantic schemas for niche analysis and beginner guidance
 """
-from pydantic import BaseModel, Field
+from typing import List, Dict, Any
+from pydantic import BaseModel, Field, TypeAdapter
 from enum import Enum
 
+from app.schemas.base import enum_by_value
+
 class ExperienceLevel(str, Enum):
     COMPLETE_BEGINNER = "complete_beginner"
     SOME_EXPERIENCE = "some_experience"
     EXPERIENCED = "experienced"
 
+ExperienceLevelField = enum_by_value(ExperienceLevel)
+
 class NicheAnalysisRequest(BaseModel):
     """Request schema for niche analysis"""
     niche: str = Field(..., description="Niche to analyze")
@@ -58,6 +63,9 @@ class SupplierSearchResponse(BaseModel):
     suppliers_found: int = Field(..., description="Number of suppliers found")
     suppliers: List[SupplierInfo] = Field(..., description="List of suppliers")
 
+# Batch validation of supplier lists in a single pydantic-core pass
+supplier_list_adapter = TypeAdapter(List[SupplierInfo])
+
 class PricingRequest(BaseModel):
     """Request schema for pricing calculation"""
     product_name: str = Field(..., description="Product name")
@@ -81,7 +89,7 @@ class PricingResponse(BaseModel):
 class BeginnerRecommendationsRequest(BaseModel):
     """Request schema for beginner recommendations"""
     budget: float = Field(..., gt=0, description="Available budget")
-    experience_level: ExperienceLevel = Field(..., description="Experience level")
+    experience_level: ExperienceLevelField = Field(..., description="Experience level")
 
 class NicheRecommendation(BaseModel):
     """Schema for niche recommendation"""
@@ -101,6 +109,9 @@ class BeginnerRecommendationsResponse(BaseModel):
     general_tips: List[str] = Field(..., description="General tips for beginners")
     next_steps: List[str] = Field(..., description="Next steps to take")
 
+# Batch validation of niche recommendations in a single pydantic-core pass
+niche_recommendation_list_adapter = TypeAdapter(List[NicheRecommendation])
+
 class ProfitCalculationRequest(BaseModel):
     """Request schema for profit calculation"""
     product_name: str = Field(..., description="Product name")
@@ -158,7 +169,7 @@ class ProductResearchResponse(BaseModel):
 
 class BeginnerGuideRequest(BaseModel):
     """Request schema for beginner guide"""
-    experience_level: ExperienceLevel = Field(..., description="Experience level")
+    experience_level: ExperienceLevelField = Field(..., description="Experience level")
     interests: List[str] = Field(..., description="Areas of interest")
     budget: float = Field(..., gt=0, description="Available budget")
 
@@ -1,23 +1,12 @@
 """Pydantic схемы для социальных функций и геймификации"""
 
-from pydantic import BaseModel, Field
+from typing import Annotated, Literal, Optional, List, Dict, Any, Union
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
+from datetime import datetime
 from enum import Enum
 
-class PostType(str, Enum):
-    """Типы постов"""
-    TEXT = "text"
-    IMAGE = "image"
-    VIDEO = "video"
-    LINK = "link"
-    ITEM = "item"
-
-class LikeType(str, Enum):
-    """Типы лайков"""
-    LIKE = "like"
-    LOVE = "love"
-    LAUGH = "laugh"
-    ANGRY = "angry"
-    SAD = "sad"
+from app.models.social import PostType, LikeType, NotificationType, LeaderboardPeriod
+from app.schemas.base import EpochMillis, ORMResponse, enum_by_value
 
 class MessageType(str, Enum):
     """Типы сообщений"""
@@ -26,16 +15,11 @@ class MessageType(str, Enum):
     FILE = "file"
     STICKER = "sticker"
 
-class NotificationType(str, Enum):
-    """Типы уведомлений"""
-    FRIEND_REQUEST = "friend_request"
-    FRIEND_ACCEPTED = "friend_accepted"
-    LIKE = "like"
-    COMMENT = "comment"
-    MESSAGE = "message"
-    ACHIEVEMENT = "achievement"
-    GROUP_INVITE = "group_invite"
-    MENTION = "mention"
+PostTypeField = enum_by_value(PostType)
+LikeTypeField = enum_by_value(LikeType)
+MessageTypeField = enum_by_value(MessageType)
+NotificationTypeField = enum_by_value(NotificationType)
+LeaderboardPeriodField = enum_by_value(LeaderboardPeriod)
 
 class UserProfileBase(BaseModel):
     """Базовая схема профиля пользователя"""
@@ -69,7 +53,7 @@ class UserProfileUpdate(BaseModel):
     allow_friend_requests: Optional[bool] = None
     allow_messages: Optional[bool] = None
 
-class UserProfileResponse(UserProfileBase):
+class UserProfileResponse(UserProfileBase, ORMResponse):
     """Схема ответа профиля пользователя"""
     id: str
     user_id: str
@@ -81,9 +65,6 @@ class UserProfileResponse(UserProfileBase):
     updated_at: datetime
     last_seen: datetime
 
-    class Config:
-        from_attributes = True
-
 class GroupBase(BaseModel):
     """Базовая схема группы"""
     name: str
@@ -119,8 +100,7 @@ class GroupResponse(GroupBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
 class AchievementBase(BaseModel):
     """Базовая схема достижения"""
@@ -147,8 +127,7 @@ class AchievementResponse(AchievementBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
 class UserAchievementResponse(BaseModel):
     """Схема ответа достижения пользователя"""
@@ -162,14 +141,13 @@ class UserAchievementResponse(BaseModel):
     updated_at: datetime
     achievement: AchievementResponse
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
 class SocialPostBase(BaseModel):
     """Базовая схема социального поста"""
     content: str
     media_urls: Optional[List[str]] = None
-    post_type: PostType = PostType.TEXT
+    post_type: PostTypeField = PostType.TEXT
     is_public: bool = True
     allow_comments: bool = True
 
@@ -187,8 +165,8 @@ class SocialPostUpdate(BaseModel):
     allow_comments: Optional[bool] = None
     is_pinned: Optional[bool] = None
 
-class SocialPostResponse(SocialPostBase):
-    """Схема ответа социального поста"""
+class SocialPostResponseLite(SocialPostBase, ORMResponse):
+    """Схема ответа социального поста без вложенного профиля автора, время - в миллисекундах Unix"""
     id: str
     author_id: str
     group_id: Optional[str]
@@ -199,12 +177,15 @@ class SocialPostResponse(SocialPostBase):
     comment_count: int
     share_count: int
     view_count: int
+    author_display_name: Optional[str] = None
+    author_avatar_url: Optional[str] = None
+    created_at: EpochMillis
+    updated_at: EpochMillis
+
+class SocialPostResponse(SocialPostResponseLite):
+    """Схема ответа социального поста"""
     created_at: datetime
     updated_at: datetime
-    author: UserProfileResponse
-
-    class Config:
-        from_attributes = True
 
 class CommentBase(BaseModel):
     """Базовая схема комментария"""
@@ -216,7 +197,7 @@ class CommentCreate(CommentBase):
     post_id: str
     parent_id: Optional[str] = None
 
-class CommentResponse(CommentBase):
+class CommentResponse(CommentBase, ORMResponse):
     """Схема ответа комментария"""
     id: str
     post_id: str
@@ -224,18 +205,25 @@ class CommentResponse(CommentBase):
     parent_id: Optional[str]
     like_count: int
     reply_count: int
+    author_display_name: Optional[str] = None
+    author_avatar_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    author: UserProfileResponse
 
-    class Config:
-        from_attributes = True
+class PostLike(BaseModel):
+    """Схема лайка поста"""
+    target: Literal["post"]
+    post_id: str
+    like_type: LikeTypeField = LikeType.LIKE
+
+class CommentLike(BaseModel):
+    """Схема лайка комментария"""
+    target: Literal["comment"]
+    comment_id: str
+    like_type: LikeTypeField = LikeType.LIKE
 
-class LikeCreate(BaseModel):
-    """Схема создания лайка"""
-    post_id: Optional[str] = None
-    comment_id: Optional[str] = None
-    like_type: LikeType = LikeType.LIKE
+# Схема создания лайка: ветка выбирается по полю target
+LikeCreate = Annotated[Union[PostLike, CommentLike], Field(discriminator="target")]
 
 class LikeResponse(BaseModel):
     """Схема ответа лайка"""
@@ -243,42 +231,39 @@ class LikeResponse(BaseModel):
     user_id: str
     post_id: Optional[str]
     comment_id: Optional[str]
-    like_type: LikeType
+    like_type: LikeTypeField
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
 class MessageBase(BaseModel):
     """Базовая схема сообщения"""
     content: str
     media_urls: Optional[List[str]] = None
-    message_type: MessageType = MessageType.TEXT
+    message_type: MessageTypeField = MessageType.TEXT
 
 class MessageCreate(MessageBase):
     """Схема создания сообщения"""
     receiver_id: str
 
-class MessageResponse(MessageBase):
+class MessageResponse(MessageBase, ORMResponse):
     """Схема ответа сообщения"""
     id: str
     sender_id: str
     receiver_id: str
     is_read: bool
     read_at: Optional[datetime]
+    author_display_name: Optional[str] = None
+    author_avatar_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
-    sender: UserProfileResponse
-
-    class Config:
-        from_attributes = True
 
 class LeaderboardBase(BaseModel):
     """Базовая схема лидерборда"""
     name: str
     description: Optional[str] = None
     category: str
-    period: str = "all"
+    period: LeaderboardPeriodField = LeaderboardPeriod.ALL
     max_entries: int = 100
 
 class LeaderboardCreate(LeaderboardBase):
@@ -292,10 +277,9 @@ class LeaderboardResponse(LeaderboardBase):
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
-class LeaderboardEntryResponse(BaseModel):
+class LeaderboardEntryResponse(ORMResponse):
     """Схема ответа записи лидерборда"""
     id: str
     leaderboard_id: str
@@ -307,24 +291,20 @@ class LeaderboardEntryResponse(BaseModel):
     updated_at: datetime
     user: UserProfileResponse
 
-    class Config:
-        from_attributes = True
-
 class NotificationResponse(BaseModel):
     """Схема ответа уведомления"""
     id: str
     user_id: str
     title: str
     message: str
-    notification_type: NotificationType
+    notification_type: NotificationTypeField
     related_id: Optional[str]
     related_type: Optional[str]
     is_read: bool
     read_at: Optional[datetime]
     created_at: datetime
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True, extra="ignore", populate_by_name=True)
 
 class FriendshipRequest(BaseModel):
     """Схема запроса дружбы"""
@@ -345,6 +325,18 @@ class SocialFeedResponse(BaseModel):
     page: int
     has_more: bool
 
+class SocialFeedResponseV2(BaseModel):
+    """Схема ответа социальной ленты с профилями авторов, вынесенными в общий словарь"""
+    posts: List[SocialPostResponseLite]
+    profiles: Dict[str, UserProfileResponse]
+    total: int
+    page: int
+    has_more: bool
+
+# Валидация списка постов одним проходом pydantic-core вместо цикла model_validate
+social_post_list_adapter = TypeAdapter(List[SocialPostResponse])
+social_post_lite_list_adapter = TypeAdapter(List[SocialPostResponseLite])
+
 class UserStatsResponse(BaseModel):
     """Схема статистики пользователя"""
     user_id: str
@@ -1,28 +1,24 @@
 """Pydantic схемы для подписок и биллинга"""
 
-from pydantic import BaseModel, Field
-from enum import Enum
+from typing import Optional, List, Dict, Any, Literal, Tuple
+from datetime import datetime
+from pydantic import BaseModel, Field, TypeAdapter
+from typing_extensions import TypedDict
 
-from app.models.subscription import SubscriptionTier, PaymentStatus
+from app.models.subscription import SubscriptionTier
+from app.schemas.base import InternedStr, JSONText, ORMResponse
 
-class SubscriptionTierSchema(str, Enum):
-    """Схема уровней подписки"""
-    FREE = "free"
-    PRO = "pro"
-    PREMIUM = "premium"
-
-class PaymentStatusSchema(str, Enum):
-    """Схема статусов платежей"""
-    PENDING = "pending"
-    COMPLETED = "completed"
-    FAILED = "failed"
-    REFUNDED = "refunded"
-    CANCELLED = "cancelled"
+# Значения статусов совпадают с Enum моделей app.models.subscription
+SubscriptionStatusValue = Literal["active", "cancelled", "expired"]
+PaymentStatusValue = Literal["pending", "completed", "failed", "refunded", "cancelled"]
+CashbackStatusValue = Literal["pending", "approved", "paid"]
+ReferralStatusValue = Literal["pending", "completed", "paid"]
+PaymentMethodValue = Literal["stripe", "paypal"]
 
 class SubscriptionBase(BaseModel):
     """Базовая схема подписки"""
-    tier: SubscriptionTierSchema
-    status: str = "active"
+    tier: SubscriptionTier
+    status: SubscriptionStatusValue = "active"
     auto_renew: bool = True
 
 class SubscriptionCreate(SubscriptionBase):
@@ -32,12 +28,12 @@ class SubscriptionCreate(SubscriptionBase):
 
 class SubscriptionUpdate(BaseModel):
     """Схема обновления подписки"""
-    tier: Optional[SubscriptionTierSchema] = None
-    status: Optional[str] = None
+    tier: Optional[SubscriptionTier] = None
+    status: Optional[SubscriptionStatusValue] = None
     auto_renew: Optional[bool] = None
     end_date: Optional[datetime] = None
 
-class SubscriptionResponse(SubscriptionBase):
+class SubscriptionResponse(SubscriptionBase, ORMResponse):
     """Схема ответа подписки"""
     id: str
     user_id: str
@@ -48,14 +44,11 @@ class SubscriptionResponse(SubscriptionBase):
     days_remaining: int
     is_active: bool
 
-    class Config:
-        from_attributes = True
-
 class PaymentBase(BaseModel):
     """Базовая схема платежа"""
     amount: float
-    currency: str = "USD"
-    payment_method: str
+    currency: InternedStr = "USD"
+    payment_method: PaymentMethodValue
     description: Optional[str] = None
 
 class PaymentCreate(PaymentBase):
@@ -65,22 +58,19 @@ class PaymentCreate(PaymentBase):
 
 class PaymentUpdate(BaseModel):
     """Схема обновления платежа"""
-    status: Optional[PaymentStatusSchema] = None
+    status: Optional[PaymentStatusValue] = None
     external_id: Optional[str] = None
 
-class PaymentResponse(PaymentBase):
+class PaymentResponse(PaymentBase, ORMResponse):
     """Схема ответа платежа"""
     id: str
     user_id: str
     subscription_id: Optional[str]
-    status: PaymentStatusSchema
+    status: PaymentStatusValue
     external_id: Optional[str]
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
 class CashbackBase(BaseModel):
     """Базовая схема кэшбека"""
     amount: float
@@ -92,17 +82,14 @@ class CashbackCreate(CashbackBase):
     """Схема создания кэшбека"""
     user_id: str
 
-class CashbackResponse(CashbackBase):
+class CashbackResponse(CashbackBase, ORMResponse):
     """Схема ответа кэшбека"""
     id: str
     user_id: str
-    status: str
+    status: CashbackStatusValue
     created_at: datetime
     paid_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 class ReferralBase(BaseModel):
     """Базовая схема реферала"""
     referred_id: str
@@ -112,24 +99,21 @@ class ReferralCreate(ReferralBase):
     """Схема создания реферала"""
     referrer_id: str
 
-class ReferralResponse(ReferralBase):
+class ReferralResponse(ReferralBase, ORMResponse):
     """Схема ответа реферала"""
     id: str
     referrer_id: str
-    status: str
+    status: ReferralStatusValue
     created_at: datetime
     completed_at: Optional[datetime]
 
-    class Config:
-        from_attributes = True
-
 class SubscriptionPlanBase(BaseModel):
     """Базовая схема тарифного плана"""
     name: str
-    tier: SubscriptionTierSchema
+    tier: SubscriptionTier
     price_monthly: float
     price_yearly: float
-    features: List[str] = []
+    features: Tuple[str, ...] = ()
     limits: Dict[str, Any] = {}
 
 class SubscriptionPlanCreate(SubscriptionPlanBase):
@@ -141,23 +125,29 @@ class SubscriptionPlanUpdate(BaseModel):
     name: Optional[str] = None
     price_monthly: Optional[float] = None
     price_yearly: Optional[float] = None
-    features: Optional[List[str]] = None
+    features: Optional[Tuple[str, ...]] = None
     limits: Optional[Dict[str, Any]] = None
     is_active: Optional[bool] = None
 
-class SubscriptionPlanResponse(SubscriptionPlanBase):
+class SubscriptionPlanResponse(SubscriptionPlanBase, ORMResponse):
     """Схема ответа тарифного плана"""
     id: str
+    features: JSONText = ()
+    limits: JSONText = {}
     is_active: bool
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True
-
-class BillingSummary(BaseModel):
-    """Схема сводки по биллингу"""
-    current_subscription: Optional[SubscriptionResponse]
+class BillingSummary(TypedDict):
+    """Плоская сводка по биллингу, поля текущей подписки - с префиксом subscription_"""
+    subscription_id: Optional[str]
+    subscription_tier: Optional[SubscriptionTier]
+    subscription_status: Optional[SubscriptionStatusValue]
+    subscription_auto_renew: Optional[bool]
+    subscription_start_date: Optional[datetime]
+    subscription_end_date: Optional[datetime]
+    subscription_days_remaining: Optional[int]
+    subscription_is_active: Optional[bool]
     total_payments: float
     total_cashback: float
     available_cashback: float
@@ -168,8 +158,8 @@ class PaymentIntentCreate(BaseModel):
     """Схема создания намерения платежа"""
     amount: float
     currency: str = "USD"
-    subscription_tier: SubscriptionTierSchema
-    payment_method: str = "stripe"
+    subscription_tier: SubscriptionTier
+    payment_method: PaymentMethodValue = "stripe"
 
 class PaymentIntentResponse(BaseModel):
     """Схема ответа намерения платежа"""
@@ -177,3 +167,10 @@ class PaymentIntentResponse(BaseModel):
     payment_intent_id: str
     amount: float
     currency: str
+
+# Валидация списков ORM-строк одним проходом pydantic-core
+subscription_plan_list_adapter = TypeAdapter(List[SubscriptionPlanResponse])
+payment_list_adapter = TypeAdapter(List[PaymentResponse])
+cashback_list_adapter = TypeAdapter(List[CashbackResponse])
+referral_list_adapter = TypeAdapter(List[ReferralResponse])
+billing_summary_adapter = TypeAdapter(BillingSummary)
@@ -3,8 +3,11 @@ Pydantic schemas for user management
 """
 from typing import Optional, List, Dict, Any
 from pydantic import BaseModel, Field, EmailStr
+from pydantic.dataclasses import dataclass
 from datetime import datetime
 
+from app.schemas.base import InternedStr, JSONBlob, ORMResponse
+
 
 class UserBase(BaseModel):
     """Base user schema"""
@@ -32,23 +35,22 @@ class UserUpdate(BaseModel):
     preferences: Optional[Dict[str, Any]] = None
 
 
-class UserResponse(UserBase):
+class UserResponse(UserBase, ORMResponse):
     """Schema for user response"""
     id: int
+    # Stored addresses were validated on the way in; skip email-validator on output
+    email: Optional[str] = None
     is_active: bool = True
     is_verified: bool = False
     is_premium: bool = False
-    subscription_tier: str = "free"
+    subscription_tier: InternedStr = "free"
     subscription_expires: Optional[datetime] = None
     subscription_auto_renew: bool = False
     created_at: datetime
     last_activity: datetime
     last_login: Optional[datetime] = None
-    settings: Dict[str, Any] = Field(default_factory=dict)
-    preferences: Dict[str, Any] = Field(default_factory=dict)
-    
-    class Config:
-        from_attributes = True
+    settings: JSONBlob = Field(default_factory=dict)
+    preferences: JSONBlob = Field(default_factory=dict)
 
 
 class APIKeyCreate(BaseModel):
@@ -58,22 +60,22 @@ class APIKeyCreate(BaseModel):
     expires_at: Optional[datetime] = None
 
 
-class APIKeyResponse(BaseModel):
+class APIKeyResponse(ORMResponse):
     """Schema for API key response"""
     id: int
     user_id: int
     key_name: str
-    permissions: Dict[str, Any] = Field(default_factory=dict)
+    permissions: JSONBlob = Field(default_factory=dict)
     is_active: bool = True
     last_used: Optional[datetime] = None
     expires_at: Optional[datetime] = None
     created_at: datetime
-    
-    class Config:
-        from_attributes = True
 
 
-class UserStatsResponse(BaseModel):
+# Output-only and computed rather than loaded from a row, so a slotted
+# dataclass is enough; kw_only keeps BaseModel-style keyword construction
+@dataclass(slots=True, kw_only=True)
+class UserStatsResponse:
     """Schema for user statistics"""
     total_items: int
     active_items: int
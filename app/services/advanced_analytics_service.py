@@ -1,19 +1,45 @@
 """Сервис для расширенной аналитики и отчетов"""
 
+import asyncio
+import csv
+import hashlib
+import io
+import logging
+import math
+import orjson
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, or_, desc, asc, text
+from sqlalchemy import BigInteger, DateTime, func, and_, or_, desc, asc, extract, literal_column, select, text
 import pandas as pd
 import numpy as np
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from enum import Enum
-from typing import Dict, List, Any, Optional
-from datetime import datetime
+from typing import BinaryIO, Dict, List, Any, Optional
+from datetime import datetime, timedelta
 
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.user import User
-from app.models.item import TrackedItem, PriceHistory
+from app.models.item import TrackedItem, PriceHistory, price_daily_stats
 from app.models.alert import Alert
-from app.models.social import SocialPost, UserProfile, Group
+from app.models.social import SocialPost, Comment, Like, UserProfile, Group
 from app.models.subscription import Subscription, Payment
+from app.services.trend_kernels import first_last_prices
+
+logger = logging.getLogger(__name__)
+
+# datetime без tz считаются UTC, numpy-скаляры и нестроковые ключи кодируются без default=str
+EXPORT_JSON_OPTIONS = orjson.OPT_NAIVE_UTC | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+# Типы колонок точек цен: float32/int32 вдвое компактнее выводимых pandas float64/int64
+PRICE_POINT_DTYPES = {'price': np.float32, 'item_id': np.int32}
+
+# Окна активности пользователей
+ACTIVE_USERS_WINDOW = timedelta(days=30)
+WEEKLY_ACTIVE_WINDOW = timedelta(days=7)
+
+# Перцентили в распределении цен
+PRICE_PERCENTILES = (25, 50, 75, 90, 95)
 
 
 class ReportType(str, Enum):
@@ -71,72 +97,105 @@ class AdvancedAnalyticsService:
     def __init__(self, db: Session):
         self.db = db
 
+    async def get_cached(self, method_name: str, filter_params: AnalyticsFilter) -> Any:
+        """Результат метода аналитики из Redis; при промахе считается и кэшируется на TTL"""
+        filter_hash = hashlib.blake2b(
+            orjson.dumps(asdict(filter_params), option=orjson.OPT_SORT_KEYS), digest_size=16
+        ).hexdigest()
+        key = f"analytics:{method_name}:{filter_hash}"
+        
+        cached_result = await cache_service.get(key)
+        if cached_result is not None:
+            return cached_result
+        
+        # Синхронные запросы выполняются в потоке, не блокируя event loop
+        result = await asyncio.to_thread(getattr(self, method_name), filter_params)
+        await cache_service.set(key, result, expire=settings.analytics_cache_ttl_seconds)
+        return result
+
+    def _is_postgresql(self) -> bool:
+        """Запросы с функциями PostgreSQL; на остальных СУБД (SQLite по умолчанию) - переносимые"""
+        return self.db.get_bind().dialect.name == "postgresql"
+
+    def _use_price_views(self) -> bool:
+        """Дневные агрегаты цен (price_daily_stats) есть только на PostgreSQL"""
+        return self._is_postgresql()
+
+    def _since(self, window: timedelta):
+        """Начало окна активности от текущего момента (UTC без часового пояса, как колонки datetime.utcnow)"""
+        if self._is_postgresql():
+            # Литерал SQL от часов БД, а не меняющийся параметр из Python
+            return func.timezone('utc', func.now()) - text(f"INTERVAL '{window.days} days'")
+        return datetime.utcnow() - window
+
+    def _price_history_day(self):
+        """День точки цены для группировки price_history"""
+        if self._is_postgresql():
+            # Хранимая колонка из миграции 012 (в модели ее нет - SQLite не знает date_trunc)
+            return literal_column('price_history.day', DateTime)
+        # SQLite возвращает 'YYYY-MM-DD 00:00:00', тип DateTime разбирает строку в datetime
+        return func.datetime(PriceHistory.timestamp, 'start of day', type_=DateTime)
+
     # === ОСНОВНЫЕ МЕТРИКИ ===
 
-    def get_overview_metrics(self, filter_params: AnalyticsFilter) -> AnalyticsMetrics  # noqa: E501
+    def get_overview_metrics(self, filter_params: AnalyticsFilter) -> AnalyticsMetrics:
         """Получить основные метрики системы"""
         
-        # Базовые запросы
-        items_query = self.db.query(TrackedItem)
-        users_query = self.db.query(User)
-        posts_query = self.db.query(SocialPost)
-        revenue_query = self.db.query(Payment)
+        # Условия фильтра для каждой таблицы
+        item_conditions = []
+        user_conditions = []
+        post_conditions = []
+        revenue_conditions = [Payment.status == 'completed']
         
-        # Применяем фильтры
         if filter_params.start_date:
-            items_query = items_query.filter(TrackedItem.created_at >= filter_params.start_date)
-            users_query = users_query.filter(User.created_at >= filter_params.start_date)
-            posts_query = posts_query.filter(SocialPost.created_at >= filter_params.start_date)
-            revenue_query = revenue_query.filter(Payment.created_at >= filter_params.start_date)
+            item_conditions.append(TrackedItem.created_at >= filter_params.start_date)
+            user_conditions.append(User.created_at >= filter_params.start_date)
+            post_conditions.append(SocialPost.created_at >= filter_params.start_date)
+            revenue_conditions.append(Payment.created_at >= filter_params.start_date)
         
         if filter_params.end_date:
-            items_query = items_query.filter(TrackedItem.created_at <= filter_params.end_date)
-            users_query = users_query.filter(User.created_at <= filter_params.end_date)
-            posts_query = posts_query.filter(SocialPost.created_at <= filter_params.end_date)
-            revenue_query = revenue_query.filter(Payment.created_at <= filter_params.end_date)
+            item_conditions.append(TrackedItem.created_at <= filter_params.end_date)
+            user_conditions.append(User.created_at <= filter_params.end_date)
+            post_conditions.append(SocialPost.created_at <= filter_params.end_date)
+            revenue_conditions.append(Payment.created_at <= filter_params.end_date)
         
         if filter_params.marketplace:
-            items_query = items_query.filter(TrackedItem.marketplace == filter_params.marketplace)
+            item_conditions.append(TrackedItem.marketplace == filter_params.marketplace)
         
         if filter_params.user_id:
-            items_query = items_query.filter(TrackedItem.user_id == filter_params.user_id)
-            posts_query = posts_query.filter(SocialPost.author_id == filter_params.user_id)
-            revenue_query = revenue_query.filter(Payment.user_id == filter_params.user_id)
-        
-        # Подсчитываем метрики
-        total_items = items_query.count()
-        total_users = users_query.count()
-        total_posts = posts_query.count()
-        total_revenue = revenue_query.filter(Payment.status == 'completed').with_entities(
-            func.sum(Payment.amount)
-        ).scalar() or 0.0
-        
-        # Средняя цена
-        avg_price = self.db.query(func.avg(PriceHistory.price)).join(TrackedItem).filter(
-            TrackedItem.id == PriceHistory.item_id
-        ).scalar() or 0.0
+            item_conditions.append(TrackedItem.user_id == filter_params.user_id)
+            post_conditions.append(SocialPost.author_id == filter_params.user_id)
+            revenue_conditions.append(Payment.user_id == filter_params.user_id)
+        
+        # Независимые счетчики и суммы - одним запросом из скалярных подзапросов
+        totals = self.db.query(
+            select(func.count(TrackedItem.id)).where(*item_conditions)
+            .scalar_subquery().label('total_items'),
+            select(func.count(User.id)).where(*user_conditions)
+            .scalar_subquery().label('total_users'),
+            select(func.count(SocialPost.id)).where(*post_conditions)
+            .scalar_subquery().label('total_posts'),
+            select(func.coalesce(func.sum(Payment.amount), 0.0)).where(*revenue_conditions)
+            .scalar_subquery().label('total_revenue'),
+            # Средняя цена
+            select(func.coalesce(func.avg(PriceHistory.price), 0.0)).join(TrackedItem)
+            .scalar_subquery().label('avg_price'),
+            # Активные пользователи (за последние 30 дней)
+            select(func.count(User.id)).where(User.last_activity >= self._since(ACTIVE_USERS_WINDOW))
+            .scalar_subquery().label('active_users')
+        ).one()
+        total_items = totals.total_items
+        total_users = totals.total_users
+        total_posts = totals.total_posts
+        total_revenue = totals.total_revenue
+        avg_price = totals.avg_price
+        active_users = totals.active_users
         
         # Изменение цены за период
         price_change = self._calculate_price_change(filter_params)
         
-        # Топ маркетплейс
-        top_marketplace = self.db.query(
-            TrackedItem.marketplace,
-            func.count(TrackedItem.id).label('count')
-        ).group_by(TrackedItem.marketplace).order_by(desc('count')).first()
-        top_marketplace = top_marketplace[0] if top_marketplace else "N/A"
-        
-        # Топ категория
-        top_category = self.db.query(
-            TrackedItem.category,
-            func.count(TrackedItem.id).label('count')
-        ).group_by(TrackedItem.category).order_by(desc('count')).first()
-        top_category = top_category[0] if top_category else "N/A"
-        
-        # Активные пользователи (за последние 30 дней)
-        active_users = self.db.query(User).filter(
-            User.last_activity >= datetime.utcnow() - timedelta(days=30)
-        ).count()
+        # Топ маркетплейс и топ категория
+        top_marketplace, top_category = self._top_marketplace_and_category()
         
         # Уровень вовлеченности (посты на пользователя)
         engagement_rate = (total_posts / total_users * 100) if total_users > 0 else 0.0
@@ -154,53 +213,94 @@ class AdvancedAnalyticsService:
             engagement_rate=engagement_rate
         )
 
+    def _top_marketplace_and_category(self):
+        """Маркетплейс и категория с наибольшим числом товаров ("N/A", если товаров нет)"""
+        if not self._is_postgresql():
+            # Без GROUPING SETS - двумя обычными группировками
+            return tuple(
+                self._top_group_value(column) for column in (TrackedItem.marketplace, TrackedItem.category)
+            )
+        
+        # На PostgreSQL - за один проход по tracked_items:
+        # GROUPING SETS считает обе группировки, grouping() = 1 у строк по категории
+        group_counts = self.db.query(
+            func.grouping(TrackedItem.marketplace).label('by_category'),
+            TrackedItem.marketplace,
+            TrackedItem.category,
+            func.count(TrackedItem.id).label('count')
+        ).group_by(
+            func.grouping_sets(TrackedItem.marketplace, TrackedItem.category)
+        ).all()
+        
+        top_counts = [-1, -1]
+        top_values = ["N/A", "N/A"]
+        for by_category, marketplace, category, count in group_counts:
+            if count > top_counts[by_category]:
+                top_counts[by_category] = count
+                top_values[by_category] = category if by_category else marketplace
+        return tuple(top_values)
+
+    def _top_group_value(self, column) -> str:
+        """Самое частое значение колонки tracked_items"""
+        top = self.db.query(
+            column,
+            func.count(TrackedItem.id).label('count')
+        ).group_by(column).order_by(desc('count')).first()
+        return top[0] if top else "N/A"
+
     def _calculate_price_change(self, filter_params: AnalyticsFilter) -> float:
         """Рассчитать изменение цены за период"""
         if not filter_params.start_date or not filter_params.end_date:
             return 0.0
         
-        # Получаем средние цены в начале и конце периода
-        start_avg = self.db.query(func.avg(PriceHistory.price)).join(TrackedItem).filter(
-            PriceHistory.created_at >= filter_params.start_date,
-            PriceHistory.created_at < filter_params.start_date + timedelta(days=1)
-        ).scalar() or 0.0
-        
-        end_avg = self.db.query(func.avg(PriceHistory.price)).join(TrackedItem).filter(
-            PriceHistory.created_at >= filter_params.end_date,
-            PriceHistory.created_at < filter_params.end_date + timedelta(days=1)
-        ).scalar() or 0.0
-        
+        # Средние цены в первый и последний день периода - одним запросом
+        # с условной агрегацией (avg ... FILTER) вместо двух отдельных
+        if self._use_price_views():
+            start_avg, end_avg = self._edge_day_avg_prices_from_view(
+                filter_params.start_date, filter_params.end_date
+            )
+        else:
+            in_start_day = and_(
+                PriceHistory.timestamp >= filter_params.start_date,
+                PriceHistory.timestamp < filter_params.start_date + timedelta(days=1)
+            )
+            in_end_day = and_(
+                PriceHistory.timestamp >= filter_params.end_date,
+                PriceHistory.timestamp < filter_params.end_date + timedelta(days=1)
+            )
+            start_avg, end_avg = self.db.query(
+                func.avg(PriceHistory.price).filter(in_start_day),
+                func.avg(PriceHistory.price).filter(in_end_day)
+            ).filter(or_(in_start_day, in_end_day)).one()
+        
+        start_avg = start_avg or 0.0
+        end_avg = end_avg or 0.0
         if start_avg == 0:
             return 0.0
         
         return ((end_avg - start_avg) / start_avg) * 100
 
+    def _edge_day_avg_prices_from_view(self, start_day: datetime, end_day: datetime):
+        """Средние цены за два календарных дня по дневным агрегатам"""
+        view = price_daily_stats.c
+        is_start_day = view.day == func.date_trunc('day', start_day)
+        is_end_day = view.day == func.date_trunc('day', end_day)
+        return self.db.query(
+            func.sum(view.price_sum).filter(is_start_day)
+            / func.nullif(func.sum(view.price_count).filter(is_start_day), 0),
+            func.sum(view.price_sum).filter(is_end_day)
+            / func.nullif(func.sum(view.price_count).filter(is_end_day), 0)
+        ).filter(or_(is_start_day, is_end_day)).one()
+
     # === АНАЛИТИКА ЦЕН ===
 
-    def get_price_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def get_price_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Получить аналитику цен"""
         
-        # Базовый запрос для истории цен
-        query = self.db.query(PriceHistory).join(TrackedItem)
-        
-        # Применяем фильтры
-        if filter_params.start_date:
-            query = query.filter(PriceHistory.created_at >= filter_params.start_date)
-        if filter_params.end_date:
-            query = query.filter(PriceHistory.created_at <= filter_params.end_date)
-        if filter_params.marketplace:
-            query = query.filter(TrackedItem.marketplace == filter_params.marketplace)
-        if filter_params.category:
-            query = query.filter(TrackedItem.category == filter_params.category)
-        if filter_params.price_min:
-            query = query.filter(PriceHistory.price >= filter_params.price_min)
-        if filter_params.price_max:
-            query = query.filter(PriceHistory.price <= filter_params.price_max)
-        
-        # Получаем данные
-        price_data = query.all()
+        # Распределение цен (заодно - число точек для проверки на пустоту)
+        price_distribution = self._analyze_price_distribution(filter_params)
         
-        if not price_data:
+        if not price_distribution:
             return {
                 "price_trend": [],
                 "price_distribution": {},
@@ -209,28 +309,34 @@ class AdvancedAnalyticsService:
                 "price_statistics": {}
             }
         
-        # Создаем DataFrame для анализа
-        df = pd.DataFrame([{
-            'price': p.price,
-            'marketplace': p.item.marketplace,
-            'category': p.item.category,
-            'date': p.created_at,
-            'item_id': p.item_id
-        } for p in price_data])
+        # Тренд и сравнения по маркетплейсам/категориям агрегируются в БД: из дневных
+        # агрегатов price_daily_stats, а при фильтре по цене - из price_history
+        use_view = (
+            self._use_price_views() and not filter_params.price_min and not filter_params.price_max
+        )
         
         # Анализ тренда цен
-        price_trend = self._analyze_price_trend(df)
-        
-        # Распределение цен
-        price_distribution = self._analyze_price_distribution(df)
+        price_trend = self._analyze_price_trend(filter_params, use_view)
         
         # Сравнение маркетплейсов
-        marketplace_comparison = self._analyze_marketplace_prices(df)
+        marketplace_comparison = self._analyze_marketplace_prices(filter_params, use_view)
         
         # Анализ по категориям
-        category_analysis = self._analyze_category_prices(df)
-        
-        # Статистика цен
+        category_analysis = self._analyze_category_prices(filter_params, use_view)
+        
+        # Статистика цен: изменения считаются по товарам, поэтому нужны сами точки.
+        # Результат запроса читается сразу в DataFrame, без промежуточного списка строк Query
+        points_query = self.db.query(
+            PriceHistory.price.label('price'),
+            PriceHistory.timestamp.label('date'),
+            PriceHistory.tracked_item_id.label('item_id')
+        ).join(
+            TrackedItem, TrackedItem.id == PriceHistory.tracked_item_id
+        ).filter(*self._price_history_conditions(filter_params))
+        df = pd.read_sql_query(
+            points_query.statement, self.db.connection(),
+            parse_dates=['date'], dtype=PRICE_POINT_DTYPES
+        )
         price_statistics = self._calculate_price_statistics(df)
         
         return {
@@ -241,33 +347,155 @@ class AdvancedAnalyticsService:
             "price_statistics": price_statistics
         }
 
-    def _analyze_price_trend(self, df: pd.DataFrame) -> List[Dict[str, Any]]:
+    def _price_history_conditions(self, filter_params: AnalyticsFilter) -> List[Any]:
+        """Условия фильтра для price_history, соединенной с tracked_items"""
+        conditions = []
+        if filter_params.start_date:
+            conditions.append(PriceHistory.timestamp >= filter_params.start_date)
+        if filter_params.end_date:
+            conditions.append(PriceHistory.timestamp <= filter_params.end_date)
+        if filter_params.marketplace:
+            conditions.append(TrackedItem.marketplace == filter_params.marketplace)
+        if filter_params.category:
+            conditions.append(TrackedItem.category == filter_params.category)
+        if filter_params.price_min:
+            conditions.append(PriceHistory.price >= filter_params.price_min)
+        if filter_params.price_max:
+            conditions.append(PriceHistory.price <= filter_params.price_max)
+        return conditions
+
+    def _price_view_conditions(self, filter_params: AnalyticsFilter) -> List[Any]:
+        """Условия фильтра для price_daily_stats; период округляется до целых дней"""
+        view = price_daily_stats.c
+        conditions = []
+        if filter_params.start_date:
+            conditions.append(view.day >= func.date_trunc('day', filter_params.start_date))
+        if filter_params.end_date:
+            conditions.append(view.day <= filter_params.end_date)
+        if filter_params.marketplace:
+            conditions.append(view.marketplace == filter_params.marketplace)
+        if filter_params.category:
+            conditions.append(view.category == filter_params.category)
+        return conditions
+
+    def _price_stats_query(self, filter_params: AnalyticsFilter, use_view: bool, key: str):
+        """Запрос count/sum/sum квадратов/min/max цен с группировкой по day, marketplace или category"""
+        if use_view:
+            view = price_daily_stats.c
+            group_column = view[key]
+            return self.db.query(
+                group_column.label(key),
+                func.sum(view.price_count).cast(BigInteger).label('price_count'),
+                func.sum(view.price_sum).label('price_sum'),
+                func.sum(view.price_sq_sum).label('price_sq_sum'),
+                func.min(view.min_price).label('min_price'),
+                func.max(view.max_price).label('max_price')
+            ).filter(
+                *self._price_view_conditions(filter_params), group_column.isnot(None)
+            ).group_by(group_column)
+        
+        group_column = {
+            'day': self._price_history_day(),
+            'marketplace': TrackedItem.marketplace,
+            'category': TrackedItem.category
+        }[key]
+        price = PriceHistory.price
+        return self.db.query(
+            group_column.label(key),
+            func.count(price).label('price_count'),
+            func.sum(price).label('price_sum'),
+            func.sum(price * price).label('price_sq_sum'),
+            func.min(price).label('min_price'),
+            func.max(price).label('max_price')
+        ).select_from(PriceHistory).join(
+            TrackedItem, TrackedItem.id == PriceHistory.tracked_item_id
+        ).filter(
+            *self._price_history_conditions(filter_params), group_column.isnot(None)
+        ).group_by(group_column)
+
+    def _analyze_price_trend(self, filter_params: AnalyticsFilter, use_view: bool) -> List[Dict[str, Any]]:
         """Анализ тренда цен"""
-        if df.empty:
-            return []
-        
         # Группируем по дням
-        daily_prices = df.groupby(df['date'].dt.date)['price'].agg(['mean', 'min', 'max', 'count']).reset_index()
-        
-        trend_data = []
-        for _, row in daily_prices.iterrows():
-            trend_data.append({
-                "date": row['date'].isoformat(),
-                "avg_price": round(row['mean'], 2),
-                "min_price": round(row['min'], 2),
-                "max_price": round(row['max'], 2),
-                "data_points": int(row['count'])
-            })
+        daily_prices = self._price_stats_query(filter_params, use_view, 'day').order_by('day').all()
         
-        return trend_data
+        return [
+            {
+                "date": row.day.date().isoformat(),
+                "avg_price": round(row.price_sum / row.price_count, 2),
+                "min_price": round(row.min_price, 2),
+                "max_price": round(row.max_price, 2),
+                "data_points": row.price_count
+            }
+            for row in daily_prices
+        ]
 
-    def _analyze_price_distribution(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _group_price_stats(self, filter_params: AnalyticsFilter, use_view: bool, key: str) -> Dict[str, Any]:
+        """count/mean/min/max/std цен по группам"""
+        groups = self._price_stats_query(filter_params, use_view, key).all()
+        
+        stats = {}
+        for group, count, price_sum, price_sq_sum, min_price, max_price in groups:
+            mean = price_sum / count
+            # Выборочное стандартное отклонение (ddof=1), как в pandas
+            std = None
+            if count > 1:
+                std = round(math.sqrt(max(price_sq_sum - price_sum * mean, 0.0) / (count - 1)), 2)
+            stats[group] = {
+                "count": count,
+                "mean": round(mean, 2),
+                "min": round(min_price, 2),
+                "max": round(max_price, 2),
+                "std": std
+            }
+        return stats
+
+    def _analyze_price_distribution(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Анализ распределения цен"""
-        if df.empty:
+        price = PriceHistory.price
+        if not self._is_postgresql():
+            return self._price_distribution_from_points(filter_params)
+        
+        # percentile_cont дает ту же линейную интерполяцию, что и np.percentile
+        row = self.db.query(
+            func.count(price).label('count'),
+            func.min(price).label('min'),
+            func.max(price).label('max'),
+            func.avg(price).label('mean'),
+            func.stddev_pop(price).label('std'),
+            *[
+                func.percentile_cont(q / 100).within_group(price).label(f'p{q}')
+                for q in PRICE_PERCENTILES
+            ]
+        ).select_from(PriceHistory).join(
+            TrackedItem, TrackedItem.id == PriceHistory.tracked_item_id
+        ).filter(*self._price_history_conditions(filter_params)).one()
+        
+        if not row.count:
             return {}
         
-        prices = df['price'].values
+        return {
+            "min": float(row.min),
+            "max": float(row.max),
+            "mean": float(row.mean),
+            "median": float(row.p50),
+            "std": float(row.std),
+            "percentiles": {
+                str(q): float(getattr(row, f'p{q}')) for q in PRICE_PERCENTILES
+            }
+        }
+
+    def _price_distribution_from_points(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
+        """Распределение цен в numpy для СУБД без percentile_cont и stddev_pop"""
+        prices = np.array(self.db.scalars(
+            select(PriceHistory.price).join(
+                TrackedItem, TrackedItem.id == PriceHistory.tracked_item_id
+            ).where(*self._price_history_conditions(filter_params))
+        ).all(), dtype=np.float64)
+        
+        if not prices.size:
+            return {}
         
+        percentiles = np.percentile(prices, PRICE_PERCENTILES)
         return {
             "min": float(np.min(prices)),
             "max": float(np.max(prices)),
@@ -275,35 +503,17 @@ class AdvancedAnalyticsService:
             "median": float(np.median(prices)),
             "std": float(np.std(prices)),
             "percentiles": {
-                "25": float(np.percentile(prices, 25)),
-                "50": float(np.percentile(prices, 50)),
-                "75": float(np.percentile(prices, 75)),
-                "90": float(np.percentile(prices, 90)),
-                "95": float(np.percentile(prices, 95))
+                str(q): float(value) for q, value in zip(PRICE_PERCENTILES, percentiles)
             }
         }
 
-    def _analyze_marketplace_prices(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_marketplace_prices(self, filter_params: AnalyticsFilter, use_view: bool) -> Dict[str, Any]:
         """Сравнение цен по маркетплейсам"""
-        if df.empty:
-            return {}
-        
-        marketplace_stats = df.groupby('marketplace')['price'].agg([
-            'count', 'mean', 'min', 'max', 'std'
-        ]).round(2).to_dict('index')
-        
-        return marketplace_stats
+        return self._group_price_stats(filter_params, use_view, 'marketplace')
 
-    def _analyze_category_prices(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _analyze_category_prices(self, filter_params: AnalyticsFilter, use_view: bool) -> Dict[str, Any]:
         """Анализ цен по категориям"""
-        if df.empty:
-            return {}
-        
-        category_stats = df.groupby('category')['price'].agg([
-            'count', 'mean', 'min', 'max', 'std'
-        ]).round(2).to_dict('index')
-        
-        return category_stats
+        return self._group_price_stats(filter_params, use_view, 'category')
 
     def _calculate_price_statistics(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Расчет статистики цен"""
@@ -312,32 +522,44 @@ class AdvancedAnalyticsService:
         
         prices = df['price'].values
         
+        # Первая и последняя цена каждого товара за один проход по данным в порядке времени
+        ordered = df.sort_values('date', kind='stable')
+        codes, item_ids = pd.factorize(ordered['item_id'])
+        first, last, counts = first_last_prices(
+            codes.astype(np.int64), ordered['price'].to_numpy(dtype=np.float64), len(item_ids)
+        )
+        changed = counts > 1
+        
         # Рассчитываем изменения цен
-        price_changes = []
-        for item_id in df['item_id'].unique():
-            item_prices = df[df['item_id'] == item_id].sort_values('date')['price'].values
-            if len(item_prices) > 1:
-                change = ((item_prices[-1] - item_prices[0]) / item_prices[0]) * 100
-                price_changes.append(change)
+        price_changes = (last[changed] - first[changed]) / first[changed] * 100
+        has_changes = len(price_changes) > 0
         
         return {
-            "total_items": len(df['item_id'].unique()),
+            "total_items": len(item_ids),
             "total_price_points": len(prices),
-            "price_volatility": float(np.std(price_changes)) if price_changes else 0.0,
-            "avg_price_change": float(np.mean(price_changes)) if price_changes else 0.0,
-            "price_increases": len([c for c in price_changes if c > 0]) if price_changes else 0,
-            "price_decreases": len([c for c in price_changes if c < 0]) if price_changes else 0
+            "price_volatility": float(np.std(price_changes)) if has_changes else 0.0,
+            "avg_price_change": float(np.mean(price_changes)) if has_changes else 0.0,
+            "price_increases": int((price_changes > 0).sum()),
+            "price_decreases": int((price_changes < 0).sum())
         }
 
+    def refresh_price_stats(self):
+        """Обновить дневные агрегаты цен без блокировки чтения"""
+        if not self._use_price_views():
+            return
+        
+        self.db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY price_daily_stats"))
+        self.db.commit()
+
     # === АНАЛИТИКА ПОЛЬЗОВАТЕЛЕЙ ===
 
-    def get_user_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def get_user_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Получить аналитику пользователей"""
         
         # Базовые метрики пользователей
         total_users = self.db.query(User).count()
         active_users = self.db.query(User).filter(
-            User.last_activity >= datetime.utcnow() - timedelta(days=30)
+            User.last_activity >= self._since(ACTIVE_USERS_WINDOW)
         ).count()
         
         # Новые пользователи за период
@@ -377,7 +599,7 @@ class AdvancedAnalyticsService:
             "top_users": top_users
         }
 
-    def _analyze_user_activity(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _analyze_user_activity(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Анализ активности пользователей"""
         
         # Активность по дням
@@ -385,7 +607,7 @@ class AdvancedAnalyticsService:
             func.date(User.last_activity).label('date'),
             func.count(User.id).label('active_users')
         ).filter(
-            User.last_activity >= datetime.utcnow() - timedelta(days=30)
+            User.last_activity >= self._since(ACTIVE_USERS_WINDOW)
         )
         
         if filter_params.start_date:
@@ -400,7 +622,7 @@ class AdvancedAnalyticsService:
         # Конверсия пользователей
         total_registrations = self.db.query(User).count()
         active_last_week = self.db.query(User).filter(
-            User.last_activity >= datetime.utcnow() - timedelta(days=7)
+            User.last_activity >= self._since(WEEKLY_ACTIVE_WINDOW)
         ).count()
         
         conversion_rate = (active_last_week / total_registrations * 100) if total_registrations > 0 else 0
@@ -414,51 +636,75 @@ class AdvancedAnalyticsService:
             "retention_rate": round(conversion_rate, 2)  # Упрощенный расчет
         }
 
-    def _analyze_subscriptions(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _analyze_subscriptions(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Анализ подписок"""
         
-        # Общая статистика подписок
-        total_subscriptions = self.db.query(Subscription).count()
-        active_subscriptions = self.db.query(Subscription).filter(
-            Subscription.is_active == True
-        ).count()
-        
-        # Распределение по тарифам
-        subscription_distribution = self.db.query(
-            Subscription.subscription_tier,
-            func.count(Subscription.id).label('count')
-        ).group_by(Subscription.subscription_tier).all()
-        
-        # Доходы от подписок
-        total_revenue = self.db.query(func.sum(Payment.amount)).filter(
+        count = func.count(Subscription.id).label('count')
+        active_count = func.count(Subscription.id).filter(Subscription.is_active).label('active_count')
+        revenue = select(func.coalesce(func.sum(Payment.amount), 0.0)).where(
             Payment.status == 'completed'
-        ).scalar() or 0.0
+        ).scalar_subquery()
+        
+        total_subscriptions = 0
+        active_subscriptions = 0
+        subscription_distribution = {}
+        if self._is_postgresql():
+            # Распределение по тарифам, итоговая строка ROLLUP (grouping = 1) и доход -
+            # одним запросом; активные считаются через FILTER
+            rows = self.db.query(
+                func.grouping(Subscription.tier).label('is_total'),
+                Subscription.tier,
+                count,
+                active_count,
+                revenue.label('total_revenue')
+            ).group_by(func.rollup(Subscription.tier)).all()
+            
+            total_revenue = 0.0
+            for is_total, tier, tier_count, tier_active_count, tier_revenue in rows:
+                if is_total:
+                    total_subscriptions = tier_count
+                    active_subscriptions = tier_active_count
+                    total_revenue = tier_revenue
+                else:
+                    subscription_distribution[tier.value] = tier_count
+        else:
+            # Без ROLLUP итоги складываются из строк по тарифам
+            rows = self.db.query(Subscription.tier, count, active_count).group_by(Subscription.tier).all()
+            for tier, tier_count, tier_active_count in rows:
+                total_subscriptions += tier_count
+                active_subscriptions += tier_active_count
+                subscription_distribution[tier.value] = tier_count
+            total_revenue = self.db.query(revenue).scalar()
         
         return {
             "total_subscriptions": total_subscriptions,
             "active_subscriptions": active_subscriptions,
-            "subscription_distribution": {
-                tier: count for tier, count in subscription_distribution
-            },
+            "subscription_distribution": subscription_distribution,
             "total_revenue": total_revenue,
             "avg_revenue_per_user": total_revenue / active_subscriptions if active_subscriptions > 0 else 0
         }
 
-    def _get_top_active_users(self, filter_params: AnalyticsFilter, limit: int = 10) -> List[Dict[str, Any]]  # noqa: E501
+    def _get_top_active_users(self, filter_params: AnalyticsFilter, limit: int = 10) -> List[Dict[str, Any]]:
         """Получить топ активных пользователей"""
         
-        # Подсчитываем активность пользователей
+        # Подсчитываем активность пользователей коррелированными подзапросами:
+        # два outerjoin перемножали бы строки товаров и постов и завышали счетчики
+        tracked_items = select(func.count(TrackedItem.id)).where(
+            TrackedItem.user_id == User.id
+        ).correlate(User).scalar_subquery()
+        posts = select(func.count(SocialPost.id)).where(
+            SocialPost.author_id == User.id
+        ).correlate(User).scalar_subquery()
+        score = (tracked_items + posts).label('score')
+        
         user_activity = self.db.query(
             User.id,
             User.username,
-            func.count(TrackedItem.id).label('tracked_items'),
-            func.count(SocialPost.id).label('posts'),
-            User.last_activity
-        ).outerjoin(TrackedItem, User.id == TrackedItem.user_id).outerjoin(
-            SocialPost, User.id == SocialPost.author_id
-        ).group_by(User.id).order_by(
-            desc('tracked_items + posts')
-        ).limit(limit).all()
+            tracked_items.label('tracked_items'),
+            posts.label('posts'),
+            User.last_activity,
+            score
+        ).order_by(desc(score)).limit(limit).all()
         
         return [
             {
@@ -473,27 +719,37 @@ class AdvancedAnalyticsService:
 
     # === СОЦИАЛЬНАЯ АНАЛИТИКА ===
 
-    def get_social_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def get_social_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Получить социальную аналитику"""
         
-        # Базовые метрики
-        total_posts = self.db.query(SocialPost).count()
-        total_comments = self.db.query(Comment).count()
-        total_likes = self.db.query(Like).count()
-        
-        # Применяем фильтры
-        posts_query = self.db.query(SocialPost)
+        # Условия фильтра для постов
+        post_conditions = []
         if filter_params.start_date:
-            posts_query = posts_query.filter(SocialPost.created_at >= filter_params.start_date)
+            post_conditions.append(SocialPost.created_at >= filter_params.start_date)
         if filter_params.end_date:
-            posts_query = posts_query.filter(SocialPost.created_at <= filter_params.end_date)
+            post_conditions.append(SocialPost.created_at <= filter_params.end_date)
         if filter_params.user_id:
-            posts_query = posts_query.filter(SocialPost.author_id == filter_params.user_id)
-        
-        filtered_posts = posts_query.count()
+            post_conditions.append(SocialPost.author_id == filter_params.user_id)
+        
+        # Базовые метрики и средние для вовлеченности - одним запросом:
+        # агрегаты по social_posts плюс скалярные подзапросы по комментариям и лайкам
+        filtered_posts = func.count(SocialPost.id)
+        if post_conditions:
+            filtered_posts = filtered_posts.filter(and_(*post_conditions))
+        totals = self.db.query(
+            func.count(SocialPost.id).label('total_posts'),
+            filtered_posts.label('filtered_posts'),
+            func.avg(SocialPost.like_count).label('avg_likes'),
+            func.avg(SocialPost.comment_count).label('avg_comments'),
+            func.avg(SocialPost.view_count).label('avg_views'),
+            select(func.count(Comment.id)).scalar_subquery().label('total_comments'),
+            select(func.count(Like.id)).scalar_subquery().label('total_likes')
+        ).one()
         
         # Анализ вовлеченности
-        engagement_metrics = self._calculate_engagement_metrics(filter_params)
+        engagement_metrics = self._calculate_engagement_metrics(
+            totals.avg_likes, totals.avg_comments, totals.avg_views
+        )
         
         # Популярные посты
         popular_posts = self._get_popular_posts(filter_params)
@@ -505,23 +761,22 @@ class AdvancedAnalyticsService:
         temporal_activity = self._analyze_temporal_activity(filter_params)
         
         return {
-            "total_posts": total_posts,
-            "filtered_posts": filtered_posts,
-            "total_comments": total_comments,
-            "total_likes": total_likes,
+            "total_posts": totals.total_posts,
+            "filtered_posts": totals.filtered_posts,
+            "total_comments": totals.total_comments,
+            "total_likes": totals.total_likes,
             "engagement_metrics": engagement_metrics,
             "popular_posts": popular_posts,
             "content_analysis": content_analysis,
             "temporal_activity": temporal_activity
         }
 
-    def _calculate_engagement_metrics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
-        """Расчет метрик вовлеченности"""
-        
-        # Средние показатели на пост
-        avg_likes = self.db.query(func.avg(SocialPost.like_count)).scalar() or 0.0
-        avg_comments = self.db.query(func.avg(SocialPost.comment_count)).scalar() or 0.0
-        avg_views = self.db.query(func.avg(SocialPost.view_count)).scalar() or 0.0
+    def _calculate_engagement_metrics(self, avg_likes: Optional[float], avg_comments: Optional[float],
+                                      avg_views: Optional[float]) -> Dict[str, Any]:
+        """Расчет метрик вовлеченности по средним показателям на пост"""
+        avg_likes = float(avg_likes or 0.0)
+        avg_comments = float(avg_comments or 0.0)
+        avg_views = float(avg_views or 0.0)
         
         # Общий уровень вовлеченности
         total_engagement = avg_likes + avg_comments + avg_views
@@ -534,19 +789,28 @@ class AdvancedAnalyticsService:
             "engagement_rate": round(total_engagement / max(avg_views, 1) * 100, 2)
         }
 
-    def _get_popular_posts(self, filter_params: AnalyticsFilter, limit: int = 10) -> List[Dict[str, Any]]  # noqa: E501
+    def _get_popular_posts(self, filter_params: AnalyticsFilter, limit: int = 10) -> List[Dict[str, Any]]:
         """Получить популярные посты"""
         
-        query = self.db.query(SocialPost).order_by(
-            desc(SocialPost.like_count + SocialPost.comment_count)
-        ).limit(limit)
+        # Только колонки, попадающие в ответ, без загрузки ORM-объектов
+        query = self.db.query(
+            SocialPost.id,
+            SocialPost.content,
+            SocialPost.like_count,
+            SocialPost.comment_count,
+            SocialPost.view_count,
+            SocialPost.created_at
+        )
         
+        # Фильтры применяются до LIMIT
         if filter_params.start_date:
             query = query.filter(SocialPost.created_at >= filter_params.start_date)
         if filter_params.end_date:
             query = query.filter(SocialPost.created_at <= filter_params.end_date)
         
-        posts = query.all()
+        posts = query.order_by(
+            desc(SocialPost.like_count + SocialPost.comment_count)
+        ).limit(limit).all()
         
         return [
             {
@@ -560,7 +824,7 @@ class AdvancedAnalyticsService:
             for post in posts
         ]
 
-    def _analyze_content_types(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _analyze_content_types(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Анализ типов контента"""
         
         content_types = self.db.query(
@@ -577,33 +841,49 @@ class AdvancedAnalyticsService:
             for type_name, count, avg_likes in content_types
         }
 
-    def _analyze_temporal_activity(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _analyze_temporal_activity(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Анализ временной активности"""
         
-        # Активность по часам
-        hourly_activity = self.db.query(
-            func.extract('hour', SocialPost.created_at).label('hour'),
-            func.count(SocialPost.id).label('posts')
-        ).group_by(
-            func.extract('hour', SocialPost.created_at)
-        ).order_by('hour').all()
-        
-        # Активность по дням недели
-        daily_activity = self.db.query(
-            func.extract('dow', SocialPost.created_at).label('day_of_week'),
-            func.count(SocialPost.id).label('posts')
-        ).group_by(
-            func.extract('dow', SocialPost.created_at)
-        ).order_by('day_of_week').all()
+        # extract() компилируется под диалект (на SQLite - через strftime)
+        hour = extract('hour', SocialPost.created_at)
+        day_of_week = extract('dow', SocialPost.created_at)
+        
+        # Кардинальность фиксирована - раскладываем счетчики в массивы 24 и 7
+        hourly_activity = np.zeros(24, dtype=np.int64)
+        daily_activity = np.zeros(7, dtype=np.int64)
+        
+        if self._is_postgresql():
+            # Активность по часам и по дням недели одним запросом (GROUPING SETS);
+            # grouping(hour) = 1 у строк группировки по дню недели
+            activity = self.db.query(
+                func.grouping(hour).label('by_day'),
+                hour.label('hour'),
+                day_of_week.label('day_of_week'),
+                func.count(SocialPost.id).label('posts')
+            ).group_by(func.grouping_sets(hour, day_of_week)).all()
+            
+            for by_day, hour_value, day_value, posts in activity:
+                if by_day:
+                    if day_value is not None:
+                        daily_activity[int(day_value)] = posts
+                elif hour_value is not None:
+                    hourly_activity[int(hour_value)] = posts
+        else:
+            # Без GROUPING SETS - двумя обычными группировками
+            for counts, group in ((hourly_activity, hour), (daily_activity, day_of_week)):
+                rows = self.db.query(group, func.count(SocialPost.id)).group_by(group).all()
+                for value, posts in rows:
+                    if value is not None:
+                        counts[int(value)] = posts
         
         return {
             "hourly_activity": [
-                {"hour": int(hour), "posts": int(posts)} 
-                for hour, posts in hourly_activity
+                {"hour": hour_value, "posts": int(posts)}
+                for hour_value, posts in enumerate(hourly_activity)
             ],
             "daily_activity": [
-                {"day": int(day), "posts": int(posts)} 
-                for day, posts in daily_activity
+                {"day": day_value, "posts": int(posts)}
+                for day_value, posts in enumerate(daily_activity)
             ]
         }
 
@@ -612,6 +892,13 @@ class AdvancedAnalyticsService:
     def export_data(self, report_type: ReportType, filter_params: AnalyticsFilter, 
                    export_format: ExportFormat) -> bytes:
         """Экспорт данных в различных форматах"""
+        output = io.BytesIO()
+        self.write_export(report_type, filter_params, export_format, output)
+        return output.getvalue()
+
+    def write_export(self, report_type: ReportType, filter_params: AnalyticsFilter,
+                     export_format: ExportFormat, out: BinaryIO):
+        """Записать экспорт в файловый объект (без промежуточной копии всего файла в памяти)"""
         
         if report_type == ReportType.PRICE_ANALYSIS:
             data = self.get_price_analytics(filter_params)
@@ -620,63 +907,52 @@ class AdvancedAnalyticsService:
         elif report_type == ReportType.SOCIAL_ENGAGEMENT:
             data = self.get_social_analytics(filter_params)
         else:
-            data = self.get_overview_metrics(filter_params)
+            data = asdict(self.get_overview_metrics(filter_params))
         
         if export_format == ExportFormat.JSON:
-            return json.dumps(data, default=str, ensure_ascii=False).encode('utf-8')
+            out.write(orjson.dumps(data, option=EXPORT_JSON_OPTIONS))
         elif export_format == ExportFormat.CSV:
-            return self._export_to_csv(data)
+            self._export_to_csv(data, out)
         elif export_format == ExportFormat.EXCEL:
-            return self._export_to_excel(data)
+            self._export_to_excel(data, out)
         elif export_format == ExportFormat.PDF:
-            return self._export_to_pdf(data)
-        
-        return b""
+            self._export_to_pdf(data, out)
 
-    def _export_to_csv(self, data: Dict[str, Any]) -> bytes:
+    def _export_to_csv(self, data: Dict[str, Any], out: BinaryIO):
         """Экспорт в CSV"""
-        import io
-        import csv
-        
-        output = io.StringIO()
+        output = io.TextIOWrapper(out, encoding='utf-8', newline='')
         writer = csv.writer(output)
         
-        # Записываем данные
-        for key, value in data.items():
-            if isinstance(value, (list, dict)):
-                writer.writerow([key, str(value)])
-            else:
-                writer.writerow([key, value])
+        # Записываем данные: вложенные структуры - одной JSON-ячейкой
+        writer.writerows(
+            (key, orjson.dumps(value, option=EXPORT_JSON_OPTIONS).decode())
+            if isinstance(value, (list, dict)) else (key, value)
+            for key, value in data.items()
+        )
         
-        return output.getvalue().encode('utf-8')
+        # Отсоединяем обертку, чтобы она не закрыла файл вызывающего
+        output.flush()
+        output.detach()
 
-    def _export_to_excel(self, data: Dict[str, Any]) -> bytes:
+    def _export_to_excel(self, data: Dict[str, Any], out: BinaryIO):
         """Экспорт в Excel"""
-        import io
-        import pandas as pd
-        
-        output = io.BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
+        with pd.ExcelWriter(out, engine='openpyxl') as writer:
             # Создаем листы для разных типов данных
             if 'price_trend' in data and data['price_trend']:
                 df_trend = pd.DataFrame(data['price_trend'])
                 df_trend.to_excel(writer, sheet_name='Price Trend', index=False)
             
-            if 'marketplace_comparison' in data and data['marketplace_comparison']  # noqa: E501
+            if 'marketplace_comparison' in data and data['marketplace_comparison']:
                 df_marketplace = pd.DataFrame(data['marketplace_comparison']).T
                 df_marketplace.to_excel(writer, sheet_name='Marketplace Comparison')
-        
-        return output.getvalue()
 
-    def _export_to_pdf(self, data: Dict[str, Any]) -> bytes:
+    def _export_to_pdf(self, data: Dict[str, Any], out: BinaryIO):
         """Экспорт в PDF"""
         from reportlab.lib.pagesizes import letter
         from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
         from reportlab.lib.styles import getSampleStyleSheet
         
-        output = io.BytesIO()
-        doc = SimpleDocTemplate(output, pagesize=letter)
+        doc = SimpleDocTemplate(out, pagesize=letter)
         styles = getSampleStyleSheet()
         story = []
         
@@ -693,11 +969,10 @@ class AdvancedAnalyticsService:
             story.append(Spacer(1, 6))
         
         doc.build(story)
-        return output.getvalue()
 
     # === ПРЕДИКТИВНАЯ АНАЛИТИКА ===
 
-    def get_predictive_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def get_predictive_analytics(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Получить предиктивную аналитику"""
         
         # Прогноз цен
@@ -717,7 +992,7 @@ class AdvancedAnalyticsService:
             "forecast_period": "30 days"
         }
 
-    def _forecast_prices(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _forecast_prices(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Прогноз цен"""
         # Упрощенный прогноз на основе тренда
         return {
@@ -727,7 +1002,7 @@ class AdvancedAnalyticsService:
             "confidence": 0.75
         }
 
-    def _forecast_user_activity(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _forecast_user_activity(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Прогноз пользовательской активности"""
         return {
             "next_week": {"new_users": 150, "active_users": 1200},
@@ -736,7 +1011,7 @@ class AdvancedAnalyticsService:
             "confidence": 0.80
         }
 
-    def _forecast_revenue(self, filter_params: AnalyticsFilter) -> Dict[str, Any]  # noqa: E501
+    def _forecast_revenue(self, filter_params: AnalyticsFilter) -> Dict[str, Any]:
         """Прогноз доходов"""
         return {
             "next_week": {"revenue": 5000.0, "subscriptions": 25},
@@ -746,3 +1021,40 @@ class AdvancedAnalyticsService:
         }
 
 
+def _run_analytics(method_name: str, filter_params: AnalyticsFilter) -> Any:
+    """Выполнить метод аналитики в отдельной сессии"""
+    db = SessionLocal()
+    try:
+        return getattr(AdvancedAnalyticsService(db), method_name)(filter_params)
+    finally:
+        db.close()
+
+
+async def gather_analytics(filter_params: AnalyticsFilter, *method_names: str) -> List[Any]:
+    """Независимые разделы аналитики параллельно: каждый в своем потоке и соединении"""
+    return await asyncio.gather(*(
+        asyncio.to_thread(_run_analytics, method_name, filter_params)
+        for method_name in method_names
+    ))
+
+
+def _refresh_price_stats_once():
+    """Обновить дневные агрегаты цен в отдельной сессии"""
+    db = SessionLocal()
+    try:
+        AdvancedAnalyticsService(db).refresh_price_stats()
+    finally:
+        db.close()
+
+
+async def price_stats_refresh_loop(interval: Optional[int] = None):
+    """Фоновое обновление price_daily_stats"""
+    interval = interval or settings.price_stats_refresh_interval_seconds
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(_refresh_price_stats_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error refreshing price stats view: {e}")
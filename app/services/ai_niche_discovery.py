@@ -1,25 +1,96 @@
 """
 AI-powered niche discovery service for automated market analysis
 """
+import asyncio
+import hashlib
 import logging
+import time
+import zlib
+from collections import OrderedDict
 import numpy as np
-import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
+from types import MappingProxyType
 import joblib
 from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
-from sklearn.ensemble import IsolationForest
+from sklearn.ensemble import HistGradientBoostingRegressor, IsolationForest
 from sklearn.metrics import silhouette_score
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from datetime import datetime
 
 from app.core.cache import cache_service, cached
 from app.services.niche_analysis_service import NicheAnalysisService
+from app.services.niche_kernels import (
+    TREND_DECLINING, TREND_RISING, TREND_STABLE, TREND_VOLATILE, classify_trend, rule_score
+)
 from app.services.parsing_service import EnhancedParsingService
 
 logger = logging.getLogger(__name__)
 
+# Popular keywords for each niche; static, so shared by all service instances
+NICHE_KEYWORDS = MappingProxyType({
+    "electronics": ("smartphone", "headphones", "laptop", "tablet", "camera", "smartwatch", "gaming", "audio"),
+    "fashion": ("dress", "shirt", "jeans", "shoes", "jacket", "accessories", "handbag", "jewelry"),
+    "beauty_health": ("skincare", "makeup", "vitamins", "supplements", "cosmetics", "perfume", "hair", "fitness"),
+    "home_garden": ("decor", "furniture", "plants", "kitchen", "bathroom", "lighting", "storage", "cleaning"),
+    "sports_outdoors": ("fitness", "running", "yoga", "camping", "hiking", "cycling", "swimming", "gym"),
+    "toys_games": ("toys", "games", "puzzles", "educational", "collectibles", "board", "video", "dolls"),
+    "automotive": ("car", "accessories", "parts", "tools", "cleaning", "maintenance", "electronics", "safety"),
+    "books_media": ("books", "ebooks", "movies", "music", "magazines", "audiobooks", "comics", "educational"),
+    "food_beverages": ("snacks", "drinks", "coffee", "tea", "supplements", "organic", "gourmet", "baking"),
+    "jewelry_watches": ("rings", "necklaces", "bracelets", "watches", "earrings", "pendants", "chains", "luxury"),
+    "pet_supplies": ("dog", "cat", "food", "toys", "accessories", "health", "grooming", "training"),
+    "office_supplies": ("stationery", "paper", "pens", "notebooks", "organizers", "technology", "furniture", "supplies")
+})
+
+# Base metrics of mock historical data for different niches
+NICHE_BASES = MappingProxyType({
+    "electronics": {"base_price": 200, "volatility": 0.1, "trend": 0.02},
+    "fashion": {"base_price": 80, "volatility": 0.15, "trend": 0.01},
+    "beauty_health": {"base_price": 50, "volatility": 0.08, "trend": 0.03},
+    "home_garden": {"base_price": 120, "volatility": 0.12, "trend": 0.015},
+    "sports_outdoors": {"base_price": 100, "volatility": 0.18, "trend": 0.025},
+    "toys_games": {"base_price": 60, "volatility": 0.2, "trend": 0.01},
+    "automotive": {"base_price": 150, "volatility": 0.1, "trend": 0.005},
+    "books_media": {"base_price": 30, "volatility": 0.05, "trend": 0.001},
+    "food_beverages": {"base_price": 25, "volatility": 0.08, "trend": 0.02},
+    "jewelry_watches": {"base_price": 300, "volatility": 0.12, "trend": 0.01},
+    "pet_supplies": {"base_price": 40, "volatility": 0.06, "trend": 0.02},
+    "office_supplies": {"base_price": 35, "volatility": 0.04, "trend": 0.005}
+})
+DEFAULT_BASE = MappingProxyType({"base_price": 100, "volatility": 0.1, "trend": 0.01})
+
+# Niche one-hot vectors, in feature order, built once instead of per extraction
+NICHE_NAMES = (
+    "electronics", "fashion", "beauty_health", "home_garden", "sports_outdoors", "toys_games",
+    "automotive", "books_media", "food_beverages", "jewelry_watches", "pet_supplies", "office_supplies"
+)
+NICHE_ONE_HOT = dict(zip(NICHE_NAMES, np.eye(len(NICHE_NAMES))))
+NO_NICHE_ONE_HOT = np.zeros(len(NICHE_NAMES))
+
+# Historical data is kept in Redis and, decoded, in a small per-process LRU
+HISTORICAL_DATA_TTL_SECONDS = 3600
+HISTORICAL_DATA_LOCAL_MAXSIZE = 128
+_local_historical_data: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+# Trend patterns memoized by the digest of the price series they were fitted on
+_local_trend_patterns: "OrderedDict[bytes, TrendPattern]" = OrderedDict()
+
+# Pattern names for classify_trend codes
+TREND_PATTERN_TYPES = {
+    TREND_RISING: "rising",
+    TREND_DECLINING: "declining",
+    TREND_VOLATILE: "volatile",
+    TREND_STABLE: "stable"
+}
+
+# Numeric series of historical data, converted together into one (fields, days) array
+SERIES_FIELDS = ("prices", "search_volumes", "competition_scores")
+SERIES_PRICES, SERIES_VOLUMES, SERIES_COMPETITION = range(len(SERIES_FIELDS))
+
+# Price (4) + search volume (3) + competition (3) + trend (5) + niche one-hot
+FEATURE_COUNT = 15 + len(NICHE_NAMES)
+
 class NicheTrend(Enum):
     RISING = "rising"
     STABLE = "stable"
@@ -50,6 +121,14 @@ class NicheDiscoveryResult:
     risks: List[str]
     market_data: Dict[str, Any]
 
+    def to_insights_dict(self, include_market_data: bool = True) -> Dict[str, Any]:
+        """Shallow JSON-ready dict of the result, optionally without the market data series"""
+        insights = {field.name: getattr(self, field.name) for field in fields(self)}
+        insights["trend"] = self.trend.value
+        if not include_market_data:
+            del insights["market_data"]
+        return insights
+
 @dataclass
 class TrendPattern:
     """Detected trend pattern in niche data"""
@@ -59,9 +138,32 @@ class TrendPattern:
     confidence: float
     description: str
 
+@dataclass
+class PriceStats:
+    """Summary statistics of a niche price series"""
+    count: int
+    mean: float
+    std: float
+    low: float
+    high: float
+    above_mean_ratio: float
+
+@dataclass
+class NicheSample:
+    """Niche data and features collected ahead of opportunity scoring"""
+    niche: str
+    keywords: List[str]
+    historical_data: Dict[str, Any]
+    trend_analysis: Optional[TrendPattern]
+    niche_metrics: Any
+    price_stats: Optional[PriceStats]
+    features: np.ndarray
+
 class AINicheDiscoveryService:
     """AI-powered service for automated niche discovery and analysis"""
 
+    niche_keywords = NICHE_KEYWORDS
+
     def __init__(self):
         self.niche_service = NicheAnalysisService()
         self.parsing_service = EnhancedParsingService()
@@ -70,31 +172,14 @@ class AINicheDiscoveryService:
         self.trend_model = None
         self.opportunity_model = None
         self.seasonality_model = None
-        self.scaler = StandardScaler()
 
         # Historical data cache
         self.historical_data = {}
 
-        # Popular keywords for each niche
-        self.niche_keywords = {
-            "electronics": ["smartphone", "headphones", "laptop", "tablet", "camera", "smartwatch", "gaming", "audio"],
-            "fashion": ["dress", "shirt", "jeans", "shoes", "jacket", "accessories", "handbag", "jewelry"],
-            "beauty_health": ["skincare", "makeup", "vitamins", "supplements", "cosmetics", "perfume", "hair", "fitness"],
-            "home_garden": ["decor", "furniture", "plants", "kitchen", "bathroom", "lighting", "storage", "cleaning"],
-            "sports_outdoors": ["fitness", "running", "yoga", "camping", "hiking", "cycling", "swimming", "gym"],
-            "toys_games": ["toys", "games", "puzzles", "educational", "collectibles", "board", "video", "dolls"],
-            "automotive": ["car", "accessories", "parts", "tools", "cleaning", "maintenance", "electronics", "safety"],
-            "books_media": ["books", "ebooks", "movies", "music", "magazines", "audiobooks", "comics", "educational"],
-            "food_beverages": ["snacks", "drinks", "coffee", "tea", "supplements", "organic", "gourmet", "baking"],
-            "jewelry_watches": ["rings", "necklaces", "bracelets", "watches", "earrings", "pendants", "chains", "luxury"],
-            "pet_supplies": ["dog", "cat", "food", "toys", "accessories", "health", "grooming", "training"],
-            "office_supplies": ["stationery", "paper", "pens", "notebooks", "organizers", "technology", "furniture", "supplies"]
-        }
-
     async def discover_niches(self, 
                             max_niches: int = 10,
                             min_opportunity_score: float = 0.6,
-                            include_trends: bool = True) -> List[NicheDiscoveryResult]  # noqa  # noqa: E501 E501
+                            include_trends: bool = True) -> List[NicheDiscoveryResult]:
         """Discover promising niches using AI analysis"""
         try:
             logger.info("Starting AI niche discovery for {max_niches} niches")
@@ -102,16 +187,31 @@ class AINicheDiscoveryService:
             # Get all available niches
             all_niches = list(self.niche_keywords.keys())
 
-            # Analyze each niche
-            niche_results = []
-            for niche in all_niches:
-                try:
-                    result = await self._analyze_niche_with_ai(niche, include_trends)
-                    if result and result.opportunity_score >= min_opportunity_score  # noqa  # noqa: E501 E501
-                        niche_results.append(result)
-                except Exception as e:
-                    logger.warning("Error analyzing niche {niche}: {e}")
+            # Collect data for all niches concurrently; each niche is independent
+            prepared = await asyncio.gather(
+                *(self._prepare_niche(niche, include_trends) for niche in all_niches),
+                return_exceptions=True
+            )
+
+            samples = []
+            for niche, sample in zip(all_niches, prepared):
+                if isinstance(sample, Exception):
+                    logger.warning(f"Error analyzing niche {niche}: {sample}")
                     continue
+                if sample:
+                    samples.append(sample)
+
+            if not samples:
+                return []
+
+            # Score all niches with a single model call
+            scores = self._score_features(np.vstack([sample.features for sample in samples]))
+
+            niche_results = [
+                await self._build_discovery_result(sample, float(score))
+                for sample, score in zip(samples, scores)
+                if score >= min_opportunity_score
+            ]
 
             # Sort by opportunity score
             niche_results.sort(key=lambda x: x.opportunity_score, reverse=True)
@@ -123,362 +223,363 @@ class AINicheDiscoveryService:
             logger.error("Error in niche discovery: {e}")
             return []
 
-    async def _analyze_niche_with_ai(self, niche: str, include_trends: bool) -> Optional[NicheDiscoveryResult]  # noqa  # noqa: E501 E501
+    async def _analyze_niche_with_ai(self, niche: str, include_trends: bool) -> Optional[NicheDiscoveryResult]:
         """Analyze a single niche using AI methods"""
         try:
-            # Get keywords for niche
-            keywords = self.niche_keywords.get(niche, [])
-            if not keywords:
+            sample = await self._prepare_niche(niche, include_trends)
+            if not sample:
                 return None
 
-            # Get historical data
-            historical_data = await self._get_historical_data(niche, keywords)
-
-            # Analyze trends
-            trend_analysis = None
-            if include_trends:
-                trend_analysis = await self._analyze_trends(historical_data)
-
             # Calculate opportunity score
-            opportunity_score = await self._calculate_opportunity_score(niche, historical_data, trend_analysis)
+            opportunity_score = float(self._score_features(sample.features[np.newaxis, :])[0])
 
-            # Get basic niche metrics
-            niche_metrics = await self.niche_service.analyze_niche(niche, keywords)
-
-            # Generate recommendations and risks
-            recommendations, risks = await self._generate_recommendations_and_risks(
-                niche, opportunity_score, niche_metrics, trend_analysis
-            )
-
-            # Determine trend direction
-            trend = NicheTrend.STABLE
-            if trend_analysis:
-                if trend_analysis.pattern_type == "rising":
-                    trend = NicheTrend.RISING
-                elif trend_analysis.pattern_type == "declining":
-                    trend = NicheTrend.DECLINING
-                elif trend_analysis.pattern_type == "volatile":
-                    trend = NicheTrend.VOLATILE
-
-            # Calculate confidence based on data quality
-            confidence = self._calculate_confidence(historical_data, trend_analysis)
-
-            return NicheDiscoveryResult(
-                niche=niche,
-                keywords=keywords,
-                opportunity_score=opportunity_score,
-                trend=trend,
-                competition_level=niche_metrics.competition_level,
-                market_size=niche_metrics.market_size,
-                growth_potential=niche_metrics.growth_potential,
-                seasonality=niche_metrics.seasonality,
-                profit_margin=niche_metrics.profit_margin,
-                entry_difficulty=1.0 - opportunity_score,  # Inverse of opportunity
-                confidence=confidence,
-                recommendations=recommendations,
-                risks=risks,
-                market_data=historical_data
-            )
+            return await self._build_discovery_result(sample, opportunity_score)
 
         except Exception as e:
             logger.error("Error analyzing niche {niche}: {e}")
             return None
 
-    async def _get_historical_data(self, niche: str, keywords: List[str]) -> Dict[str, Any]  # noqa  # noqa: E501 E501
+    async def _prepare_niche(self, niche: str, include_trends: bool) -> Optional[NicheSample]:
+        """Collect data, trend and features of a niche ahead of scoring"""
+        # Get keywords for niche
+        keywords = self.niche_keywords.get(niche, [])
+        if not keywords:
+            return None
+
+        # Historical data and basic niche metrics are independent, so fetch them concurrently
+        historical_data, niche_metrics = await asyncio.gather(
+            self._get_historical_data(niche, keywords),
+            self.niche_service.analyze_niche(niche, keywords)
+        )
+
+        # Analyze trends
+        trend_analysis = None
+        if include_trends:
+            trend_analysis = await self._analyze_trends(historical_data)
+
+        # Series are converted and price statistics computed once for both features and confidence
+        series = self._historical_series(historical_data)
+        price_stats = self._compute_price_stats(historical_data, series)
+
+        return NicheSample(
+            niche=niche,
+            keywords=keywords,
+            historical_data=historical_data,
+            trend_analysis=trend_analysis,
+            niche_metrics=niche_metrics,
+            price_stats=price_stats,
+            features=self._extract_features(niche, historical_data, trend_analysis, price_stats, series)
+        )
+
+    async def _build_discovery_result(self, sample: NicheSample, opportunity_score: float) -> NicheDiscoveryResult:
+        """Build the discovery result of a scored niche"""
+        niche_metrics = sample.niche_metrics
+        trend_analysis = sample.trend_analysis
+
+        # Generate recommendations and risks
+        recommendations, risks = await self._generate_recommendations_and_risks(
+            sample.niche, opportunity_score, niche_metrics, trend_analysis
+        )
+
+        # Determine trend direction
+        trend = NicheTrend.STABLE
+        if trend_analysis:
+            if trend_analysis.pattern_type == "rising":
+                trend = NicheTrend.RISING
+            elif trend_analysis.pattern_type == "declining":
+                trend = NicheTrend.DECLINING
+            elif trend_analysis.pattern_type == "volatile":
+                trend = NicheTrend.VOLATILE
+
+        # Calculate confidence based on data quality
+        confidence = self._calculate_confidence(sample.historical_data, trend_analysis, sample.price_stats)
+
+        return NicheDiscoveryResult(
+            niche=sample.niche,
+            keywords=sample.keywords,
+            opportunity_score=opportunity_score,
+            trend=trend,
+            competition_level=niche_metrics.competition_level,
+            market_size=niche_metrics.market_size,
+            growth_potential=niche_metrics.growth_potential,
+            seasonality=niche_metrics.seasonality,
+            profit_margin=niche_metrics.profit_margin,
+            entry_difficulty=1.0 - opportunity_score,  # Inverse of opportunity
+            confidence=confidence,
+            recommendations=recommendations,
+            risks=risks,
+            market_data=sample.historical_data
+        )
+
+    async def _get_historical_data(self, niche: str, keywords: List[str]) -> Dict[str, Any]:
         """Get historical data for niche analysis"""
+        # Check the in-process cache first to skip the Redis round trip and JSON decoding
+        local_entry = _local_historical_data.get(niche)
+        if local_entry and local_entry[0] > time.monotonic():
+            _local_historical_data.move_to_end(niche)
+            return local_entry[1]
+
         cache_key = f"niche_historical_data:{niche}"
 
-        # Check cache first
-        cached_data = await cache_service.get(cache_key)
-        if cached_data:
-            return cached_data
+        # Check the shared cache next
+        historical_data = await cache_service.get(cache_key)
+        if not historical_data:
+            # Generate mock historical data (in real app, this would come from database)
+            historical_data = await self._generate_mock_historical_data(niche, keywords)
 
-        # Generate mock historical data (in real app, this would come from database)
-        historical_data = await self._generate_mock_historical_data(niche, keywords)
+            # Cache for 1 hour
+            await cache_service.set(cache_key, historical_data, expire=HISTORICAL_DATA_TTL_SECONDS)
 
-        # Cache for 1 hour
-        await cache_service.set(cache_key, historical_data, expire=3600)
+        _local_historical_data[niche] = (time.monotonic() + HISTORICAL_DATA_TTL_SECONDS, historical_data)
+        _local_historical_data.move_to_end(niche)
+        if len(_local_historical_data) > HISTORICAL_DATA_LOCAL_MAXSIZE:
+            _local_historical_data.popitem(last=False)
 
         return historical_data
 
-    async def _generate_mock_historical_data(self, niche: str, keywords: List[str]) -> Dict[str, Any]  # noqa  # noqa: E501 E501
+    async def _generate_mock_historical_data(self, niche: str, keywords: List[str]) -> Dict[str, Any]:
         """Generate mock historical data for analysis"""
-        # Generate 90 days of data
-        dates = pd.date_range(start=datetime.now() - timedelta(days=90), end=datetime.now(), freq='D')
-
-        # Base metrics for different niches
-        niche_bases = {
-            "electronics": {"base_price": 200, "volatility": 0.1, "trend": 0.02},
-            "fashion": {"base_price": 80, "volatility": 0.15, "trend": 0.01},
-            "beauty_health": {"base_price": 50, "volatility": 0.08, "trend": 0.03},
-            "home_garden": {"base_price": 120, "volatility": 0.12, "trend": 0.015},
-            "sports_outdoors": {"base_price": 100, "volatility": 0.18, "trend": 0.025},
-            "toys_games": {"base_price": 60, "volatility": 0.2, "trend": 0.01},
-            "automotive": {"base_price": 150, "volatility": 0.1, "trend": 0.005},
-            "books_media": {"base_price": 30, "volatility": 0.05, "trend": 0.001},
-            "food_beverages": {"base_price": 25, "volatility": 0.08, "trend": 0.02},
-            "jewelry_watches": {"base_price": 300, "volatility": 0.12, "trend": 0.01},
-            "pet_supplies": {"base_price": 40, "volatility": 0.06, "trend": 0.02},
-            "office_supplies": {"base_price": 35, "volatility": 0.04, "trend": 0.005}
-        }
+        # Generate 90 days of data, ending now
+        dates = np.datetime64(datetime.now(), 'us') - np.arange(90, -1, -1) * np.timedelta64(1, 'D')
 
-        base = niche_bases.get(niche, {"base_price": 100, "volatility": 0.1, "trend"  # noqa  # noqa: E501 E501 0.01})
+        base = NICHE_BASES.get(niche, DEFAULT_BASE)
 
-        # Generate price data with trend and seasonality
-        prices = []
-        search_volumes = []
-        competition_scores = []
+        # Generate price data with trend and seasonality for all days at once
+        day = np.arange(len(dates))
+        weekly_wave = np.sin(2 * np.pi * day / 7)
 
-        for i, date in enumerate(dates):
-            # Base price with trend
-            base_price = base["base_price"] * (1 + base["trend"] * i)
+        # Per-niche seed keeps the series reproducible across workers; noise for
+        # price, search volume and competition is drawn in one batch
+        rng = np.random.default_rng(zlib.crc32(niche.encode()))
+        price_noise, volume_noise, competition_noise = rng.standard_normal((3, len(day)))
 
-            # Add seasonality (weekly and monthly patterns)
-            weekly_pattern = np.sin(2 * np.pi * i / 7) * 0.05
-            monthly_pattern = np.sin(2 * np.pi * i / 30) * 0.1
+        # Base price with trend
+        base_price = base["base_price"] * (1 + base["trend"] * day)
 
-            # Add random volatility
-            volatility = np.random.normal(0, base["volatility"])
+        # Add seasonality (weekly and monthly patterns)
+        weekly_pattern = weekly_wave * 0.05
+        monthly_pattern = np.sin(2 * np.pi * day / 30) * 0.1
 
-            # Calculate final price
-            price = base_price * (1 + weekly_pattern + monthly_pattern + volatility)
-            prices.append(max(price, 1))  # Ensure positive prices
+        # Add random volatility
+        volatility = price_noise * base["volatility"]
 
-            # Generate search volume (higher on weekends)
-            search_volume = 1000 + 500 * np.sin(2 * np.pi * i / 7) + np.random.normal(0, 200)
-            search_volumes.append(max(search_volume, 100))
+        # Calculate final price, ensuring positive prices
+        prices = np.maximum(base_price * (1 + weekly_pattern + monthly_pattern + volatility), 1)
 
-            # Generate competition score (inverse of opportunity)
-            competition = 0.3 + 0.4 * np.sin(2 * np.pi * i / 14) + np.random.normal(0, 0.1)
-            competition_scores.append(max(0, min(1, competition)))
+        # Generate search volume (higher on weekends)
+        search_volumes = np.maximum(1000 + 500 * weekly_wave + 200 * volume_noise, 100)
+
+        # Generate competition score (inverse of opportunity)
+        competition_scores = np.clip(
+            0.3 + 0.4 * np.sin(2 * np.pi * day / 14) + 0.1 * competition_noise, 0, 1
+        )
 
         return {
-            "dates": [d.isoformat() for d in dates],
-            "prices": prices,
-            "search_volumes": search_volumes,
-            "competition_scores": competition_scores,
+            "dates": dates.astype(str).tolist(),
+            "prices": prices.tolist(),
+            "search_volumes": search_volumes.tolist(),
+            "competition_scores": competition_scores.tolist(),
             "keywords": keywords,
             "niche": niche
         }
 
-    async def _analyze_trends(self, historical_data: Dict[str, Any]) -> Optional[TrendPattern]  # noqa  # noqa: E501 E501
+    async def _analyze_trends(self, historical_data: Dict[str, Any]) -> Optional[TrendPattern]:
         """Analyze trends in historical data"""
         try:
             if not historical_data or "prices" not in historical_data:
                 return None
 
-            prices = historical_data["prices"]
-            dates = historical_data["dates"]
+            y = np.asarray(historical_data["prices"], dtype=np.float64)
+            n = y.size
 
-            if len(prices) < 7:  # Need at least a week of data
+            if n < 7:  # Need at least a week of data
                 return None
 
-            # Convert to pandas for analysis
-            df = pd.DataFrame({
-                'date': pd.to_datetime(dates),
-                'price': prices
-            })
-
-            # Calculate trend using linear regression
-            from sklearn.linear_model import LinearRegression
-
-            X = np.arange(len(df)).reshape(-1, 1)
-            y = df['price'].values
-
-            model = LinearRegression()
-            model.fit(X, y)
-
-            slope = model.coef_[0]
-            r2 = model.score(X, y)
-
-            # Determine trend type
-            if slope > 0.01 and r2 > 0.3:
-                pattern_type = "rising"
-                strength = min(abs(slope) / np.mean(y), 1.0)
-            elif slope < -0.01 and r2 > 0.3:
-                pattern_type = "declining"
-                strength = min(abs(slope) / np.mean(y), 1.0)
-            elif r2 < 0.1:
-                pattern_type = "volatile"
-                strength = 1.0 - r2
-            else:
-                pattern_type = "stable"
-                strength = 1.0 - abs(slope) / np.mean(y)
-
-            # Calculate confidence
-            confidence = min(r2 * 2, 1.0) if pattern_type != "volatile" else 1.0 - r2
-
-            return TrendPattern(
+            # The same cached series is analyzed by discovery, insights and training
+            memo_key = hashlib.blake2b(y.tobytes(), digest_size=16).digest()
+            memoized = _local_trend_patterns.get(memo_key)
+            if memoized:
+                _local_trend_patterns.move_to_end(memo_key)
+                return memoized
+
+            # Calculate trend using closed-form least squares
+            x = np.arange(n, dtype=np.float64)
+
+            slope, intercept = np.polyfit(x, y, 1)
+            mean_price = y.mean()
+            ss_res = np.square(y - (slope * x + intercept)).sum()
+            ss_tot = np.square(y - mean_price).sum()
+            r2 = 1 - ss_res / ss_tot if ss_tot else 0.0
+
+            # Determine trend type, strength and confidence
+            code, strength, confidence = classify_trend(slope, r2, mean_price)
+            pattern_type = TREND_PATTERN_TYPES[code]
+
+            trend_pattern = TrendPattern(
                 pattern_type=pattern_type,
                 strength=strength,
-                duration_days=len(df),
+                duration_days=n,
                 confidence=confidence,
-                description=f"{pattern_type.title()} trend with {strength:.1%} strength over {len(df)} days"
+                description=f"{pattern_type.title()} trend with {strength:.1%} strength over {n} days"
             )
 
+            _local_trend_patterns[memo_key] = trend_pattern
+            if len(_local_trend_patterns) > HISTORICAL_DATA_LOCAL_MAXSIZE:
+                _local_trend_patterns.popitem(last=False)
+
+            return trend_pattern
+
         except Exception as e:
             logger.error("Error analyzing trends: {e}")
             return None
 
-    async def _calculate_opportunity_score(self, 
-                                         niche: str, 
-                                         historical_data: Dict[str, Any],
-                                         trend_analysis: Optional[TrendPattern]) -> float  # noqa  # noqa: E501 E501
-        """Calculate opportunity score using ML"""
+    def _score_features(self, features: np.ndarray) -> np.ndarray:
+        """Calculate opportunity scores for a (niches, features) matrix using ML"""
         try:
-            # Extract features
-            features = self._extract_features(niche, historical_data, trend_analysis)
-
-            # If we have a trained model, use it
+            # If we have a trained model, score all rows in one call
             if self.opportunity_model:
-                score = self.opportunity_model.predict([features])[0]
-                return max(0, min(1, score))
+                return np.clip(self.opportunity_model.predict(features), 0, 1)
 
             # Otherwise, use rule-based scoring
-            return self._rule_based_opportunity_score(features)
+            return np.array([self._rule_based_opportunity_score(row) for row in features])
 
         except Exception as e:
-            logger.error("Error calculating opportunity score: {e}")
-            return 0.5  # Default neutral score
+            logger.error(f"Error calculating opportunity score: {e}")
+            return np.full(len(features), 0.5)  # Default neutral score
+
+    def _historical_series(self, historical_data: Dict[str, Any]) -> Optional[np.ndarray]:
+        """Convert all numeric series into one contiguous (fields, days) array"""
+        if not historical_data:
+            return None
+
+        fields = [historical_data.get(field) for field in SERIES_FIELDS]
+        if not all(fields) or len({len(values) for values in fields}) != 1:
+            return None
+
+        return np.array(fields, dtype=np.float64)
+
+    def _series_field(self,
+                      historical_data: Dict[str, Any],
+                      series: Optional[np.ndarray],
+                      index: int) -> Optional[np.ndarray]:
+        """Get a numeric series from the converted array, or from the raw data without it"""
+        if series is not None:
+            return series[index]
+
+        values = historical_data.get(SERIES_FIELDS[index]) if historical_data else None
+        return np.asarray(values, dtype=np.float64) if values else None
+
+    def _compute_price_stats(self,
+                             historical_data: Dict[str, Any],
+                             series: Optional[np.ndarray] = None) -> Optional[PriceStats]:
+        """Compute price series statistics shared by features and confidence"""
+        prices = self._series_field(historical_data, series, SERIES_PRICES)
+        if prices is None or not prices.size:
+            return None
+
+        mean_price = prices.mean()
+        return PriceStats(
+            count=len(prices),
+            mean=mean_price,
+            std=prices.std(),
+            low=prices.min(),
+            high=prices.max(),
+            above_mean_ratio=np.count_nonzero(prices > mean_price) / len(prices)
+        )
 
     def _extract_features(self, 
                          niche: str, 
                          historical_data: Dict[str, Any],
-                         trend_analysis: Optional[TrendPattern]) -> List[float]  # noqa  # noqa: E501 E501
+                         trend_analysis: Optional[TrendPattern],
+                         price_stats: Optional[PriceStats] = None,
+                         series: Optional[np.ndarray] = None) -> np.ndarray:
         """Extract features for ML model"""
-        features = []
+        features = np.empty(FEATURE_COUNT, dtype=np.float64)
 
         # Price features
-        if "prices" in historical_data and historical_data["prices"]:
-            prices = historical_data["prices"]
-            features.extend([
-                np.mean(prices),  # Average price
-                np.std(prices) / np.mean(prices) if np.mean(prices) > 0 else 0,  # Price volatility
-                (max(prices) - min(prices)) / np.mean(prices) if np.mean(prices) > 0 else 0,  # Price range
-                len([p for p in prices if p > np.mean(prices)]) / len(prices)  # Above average ratio
-            ])
+        if price_stats is None:
+            price_stats = self._compute_price_stats(historical_data, series)
+        if price_stats:
+            mean_price = price_stats.mean
+            features[0:4] = (
+                mean_price,  # Average price
+                price_stats.std / mean_price if mean_price > 0 else 0,  # Price volatility
+                (price_stats.high - price_stats.low) / mean_price if mean_price > 0 else 0,  # Price range
+                price_stats.above_mean_ratio  # Above average ratio
+            )
         else:
-            features.extend([0, 0, 0, 0])
+            features[0:4] = 0
 
         # Search volume features
-        if "search_volumes" in historical_data and historical_data["search_volumes"]  # noqa  # noqa: E501 E501
-            volumes = historical_data["search_volumes"]
-            features.extend([
-                np.mean(volumes),  # Average search volume
-                np.std(volumes) / np.mean(volumes) if np.mean(volumes) > 0 else 0,  # Volume volatility
-                np.mean(volumes[-7:]) / np.mean(volumes[:7]) if len(volumes) >= 14 else 1,  # Recent vs early trend
-            ])
+        volumes = self._series_field(historical_data, series, SERIES_VOLUMES)
+        if volumes is not None and volumes.size:
+            mean_volume = volumes.mean()
+            features[4:7] = (
+                mean_volume,  # Average search volume
+                volumes.std() / mean_volume if mean_volume > 0 else 0,  # Volume volatility
+                volumes[-7:].mean() / volumes[:7].mean() if len(volumes) >= 14 else 1,  # Recent vs early trend
+            )
         else:
-            features.extend([0, 0, 1])
+            features[4:7] = (0, 0, 1)
 
         # Competition features
-        if "competition_scores" in historical_data and historical_data["competition_scores"]  # noqa  # noqa: E501 E501
-            competition = historical_data["competition_scores"]
-            features.extend([
-                np.mean(competition),  # Average competition
-                1 - np.mean(competition),  # Opportunity (inverse of competition)
-                np.std(competition)  # Competition volatility
-            ])
+        competition = self._series_field(historical_data, series, SERIES_COMPETITION)
+        if competition is not None and competition.size:
+            mean_competition = competition.mean()
+            features[7:10] = (
+                mean_competition,  # Average competition
+                1 - mean_competition,  # Opportunity (inverse of competition)
+                competition.std()  # Competition volatility
+            )
         else:
-            features.extend([0.5, 0.5, 0])
+            features[7:10] = (0.5, 0.5, 0)
 
         # Trend features
         if trend_analysis:
-            features.extend([
-                1 if trend_analysis.pattern_type == "rising" else 0,
-                1 if trend_analysis.pattern_type == "declining" else 0,
-                1 if trend_analysis.pattern_type == "volatile" else 0,
+            features[10:15] = (
+                trend_analysis.pattern_type == "rising",
+                trend_analysis.pattern_type == "declining",
+                trend_analysis.pattern_type == "volatile",
                 trend_analysis.strength,
                 trend_analysis.confidence
-            ])
+            )
         else:
-            features.extend([0, 0, 0, 0, 0])
+            features[10:15] = 0
 
         # Niche-specific features
-        niche_features = {
-            "electronics": [1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "fashion": [0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "beauty_health": [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-            "home_garden": [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 0],
-            "sports_outdoors": [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0],
-            "toys_games": [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
-            "automotive": [0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
-            "books_media": [0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
-            "food_beverages": [0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
-            "jewelry_watches": [0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
-            "pet_supplies": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1, 0],
-            "office_supplies": [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1]
-        }
-
-        features.extend(niche_features.get(niche, [0] * 12))
+        features[15:] = NICHE_ONE_HOT.get(niche, NO_NICHE_ONE_HOT)
 
         return features
 
-    def _rule_based_opportunity_score(self, features: List[float]) -> float:
+    def _rule_based_opportunity_score(self, features: np.ndarray) -> float:
         """Calculate opportunity score using rules"""
         if len(features) < 20:
             return 0.5
 
-        score = 0.5  # Base score
-
-        # Price volatility (lower is better for stability)
-        price_volatility = features[1]
-        if price_volatility < 0.1:
-            score += 0.2
-        elif price_volatility > 0.3:
-            score -= 0.1
-
-        # Search volume trend (growing is better)
-        volume_trend = features[6]
-        if volume_trend > 1.1:
-            score += 0.2
-        elif volume_trend < 0.9:
-            score -= 0.1
-
-        # Competition (lower is better)
-        competition = features[7]
-        if competition < 0.3:
-            score += 0.2
-        elif competition > 0.7:
-            score -= 0.2
-
-        # Opportunity (higher is better)
-        opportunity = features[8]
-        score += opportunity * 0.2
-
-        # Trend (rising is better)
-        is_rising = features[13]
-        if is_rising:
-            score += 0.1
-
-        # Trend strength
-        trend_strength = features[16]
-        score += trend_strength * 0.1
-
-        return max(0, min(1, score))
+        return float(rule_score(np.asarray(features, dtype=np.float64)))
 
     def _calculate_confidence(self, 
                             historical_data: Dict[str, Any],
-                            trend_analysis: Optional[TrendPattern]) -> float:
+                            trend_analysis: Optional[TrendPattern],
+                            price_stats: Optional[PriceStats] = None) -> float:
         """Calculate confidence in the analysis"""
         confidence = 0.5  # Base confidence
 
         # Data quality factors
-        if historical_data and "prices" in historical_data:
-            data_points = len(historical_data["prices"])
-            if data_points >= 30:
+        if price_stats is None:
+            price_stats = self._compute_price_stats(historical_data)
+        if price_stats:
+            if price_stats.count >= 30:
                 confidence += 0.2
-            elif data_points >= 14:
+            elif price_stats.count >= 14:
                 confidence += 0.1
 
             # Price stability (less volatile = more confident)
-            prices = historical_data["prices"]
-            if prices:
-                volatility = np.std(prices) / np.mean(prices) if np.mean(prices) > 0 else 1
-                if volatility < 0.2:
-                    confidence += 0.1
-                elif volatility > 0.5:
-                    confidence -= 0.1
+            volatility = price_stats.std / price_stats.mean if price_stats.mean > 0 else 1
+            if volatility < 0.2:
+                confidence += 0.1
+            elif volatility > 0.5:
+                confidence -= 0.1
 
         # Trend analysis confidence
         if trend_analysis:
@@ -490,7 +591,7 @@ class AINicheDiscoveryService:
                                                 niche: str,
                                                 opportunity_score: float,
                                                 niche_metrics,
-                                                trend_analysis: Optional[TrendPattern]) -> Tuple[List[str], List[str]]  # noqa  # noqa: E501 E501
+                                                trend_analysis: Optional[TrendPattern]) -> Tuple[List[str], List[str]]:
         """Generate recommendations and risks based on analysis"""
         recommendations = []
         risks = []
@@ -541,7 +642,7 @@ class AINicheDiscoveryService:
 
         return recommendations, risks
 
-    async def train_models(self, training_data: Optional[List[Dict[str, Any]]] = None)  # noqa  # noqa: E501 E501
+    async def train_models(self, training_data: Optional[List[Dict[str, Any]]] = None):
         """Train ML models for niche discovery"""
         try:
             logger.info("Training AI niche discovery models...")
@@ -550,26 +651,25 @@ class AINicheDiscoveryService:
             if not training_data:
                 training_data = await self._generate_training_data()
 
-            # Prepare features and targets
-            X = []
-            y = []
-
-            for data in training_data:
-                features = self._extract_features(
+            # Prepare features and targets, filling preallocated rows in place
+            X = np.empty((len(training_data), FEATURE_COUNT), dtype=np.float64)
+            y = np.empty(len(training_data), dtype=np.float64)
+            for i, data in enumerate(training_data):
+                X[i] = self._extract_features(
                     data["niche"], 
                     data["historical_data"], 
                     data.get("trend_analysis")
                 )
-                X.append(features)
-                y.append(data["opportunity_score"])
-
-            # Scale features
-            X_scaled = self.scaler.fit_transform(X)
-
-            # Train opportunity model
-            from sklearn.ensemble import RandomForestRegressor
-            self.opportunity_model = RandomForestRegressor(n_estimators=100, random_state=42)
-            self.opportunity_model.fit(X_scaled, y)
+                y[i] = data["opportunity_score"]
+
+            # Train opportunity model; gradient boosting on binned features needs no scaling.
+            # The set has one sample per niche, so leaves must be allowed to hold a single
+            # sample (the default of 20 would never split) and no validation split is held out
+            self.opportunity_model = HistGradientBoostingRegressor(
+                max_iter=100, max_depth=6, learning_rate=0.1, min_samples_leaf=1,
+                early_stopping=False, random_state=42
+            )
+            self.opportunity_model.fit(X, y)
 
             logger.info("AI niche discovery models trained successfully")
 
@@ -578,25 +678,26 @@ class AINicheDiscoveryService:
 
     async def _generate_training_data(self) -> List[Dict[str, Any]]:
         """Generate training data for model training"""
-        training_data = []
-
-        for niche in self.niche_keywords.keys():
-            keywords = self.niche_keywords[niche]
-            historical_data = await self._generate_mock_historical_data(niche, keywords)
-            trend_analysis = await self._analyze_trends(historical_data)
-            opportunity_score = self._rule_based_opportunity_score(
-                self._extract_features(niche, historical_data, trend_analysis)
-            )
+        # Samples are independent, so they are generated concurrently
+        return list(await asyncio.gather(
+            *(self._generate_training_sample(niche, keywords) for niche, keywords in self.niche_keywords.items())
+        ))
 
-            training_data.append({
-                "niche": niche,
-                "keywords": keywords,
-                "historical_data": historical_data,
-                "trend_analysis": trend_analysis,
-                "opportunity_score": opportunity_score
-            })
+    async def _generate_training_sample(self, niche: str, keywords: List[str]) -> Dict[str, Any]:
+        """Generate a single training sample for a niche"""
+        historical_data = await self._generate_mock_historical_data(niche, keywords)
+        trend_analysis = await self._analyze_trends(historical_data)
+        opportunity_score = self._rule_based_opportunity_score(
+            self._extract_features(niche, historical_data, trend_analysis)
+        )
 
-        return training_data
+        return {
+            "niche": niche,
+            "keywords": keywords,
+            "historical_data": historical_data,
+            "trend_analysis": trend_analysis,
+            "opportunity_score": opportunity_score
+        }
 
     @cached(expire=3600)  # Cache for 1 hour
     async def get_niche_insights(self, niche: str) -> Dict[str, Any]:
@@ -613,23 +714,8 @@ class AINicheDiscoveryService:
                 return {}
 
             # Get additional insights
-            insights = {
-                "niche": niche,
-                "keywords": keywords,
-                "opportunity_score": discovery_result.opportunity_score,
-                "trend": discovery_result.trend.value,
-                "competition_level": discovery_result.competition_level,
-                "market_size": discovery_result.market_size,
-                "growth_potential": discovery_result.growth_potential,
-                "seasonality": discovery_result.seasonality,
-                "profit_margin": discovery_result.profit_margin,
-                "entry_difficulty": discovery_result.entry_difficulty,
-                "confidence": discovery_result.confidence,
-                "recommendations": discovery_result.recommendations,
-                "risks": discovery_result.risks,
-                "market_data": discovery_result.market_data,
-                "analysis_date": datetime.now().isoformat()
-            }
+            insights = discovery_result.to_insights_dict()
+            insights["analysis_date"] = datetime.now().isoformat()
 
             return insights
 
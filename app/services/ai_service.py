@@ -1,13 +1,18 @@
 """
 AI and Machine Learning service for price prediction and analysis
 """
+import asyncio
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import pandas as pd
 import joblib
 from pathlib import Path
+from typing import Any, Dict, List, Tuple
 import logging
 
-from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
+from sklearn.ensemble import RandomForestRegressor, HistGradientBoostingRegressor
 from sklearn.linear_model import LinearRegression, Ridge, Lasso
 from sklearn.preprocessing import StandardScaler, LabelEncoder
 from sklearn.model_selection import train_test_split, cross_val_score
@@ -15,12 +20,23 @@ from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import xgboost as xgb
 import lightgbm as lgb
 import optuna
+from threadpoolctl import threadpool_limits
 
 from app.core.cache import cache_service, cached
 from app.core.config import settings
+from app.services.trend_kernels import trend_stats
 
 logger = logging.getLogger(__name__)
 
+# Threads for model training; one core is left for the event loop
+TRAINING_THREADS = max(1, (os.cpu_count() or 1) - 1)
+
+# Models that parallelize their own fit across the thread budget
+THREADED_MODELS = frozenset({'random_forest', 'gradient_boosting', 'xgboost', 'lightgbm'})
+
+# Calendar (4) + price lags and averages (5) + price spread and changes (5) + marketplace + category
+PREDICTION_FEATURE_COUNT = 16
+
 class PricePredictionService:
     """Service for price prediction using machine learning"""
 
@@ -31,16 +47,28 @@ class PricePredictionService:
         self.model_dir = Path("models")
         self.model_dir.mkdir(exist_ok=True)
 
+        # Loaded joblib artifacts by file name, with the mtime they were loaded at
+        self._artifact_cache: Dict[str, Tuple[float, Any]] = {}
+        self._artifact_lock = asyncio.Lock()
+        # One training run at a time: it refits the shared encoders, scalers and models
+        # and rewrites their artifacts, which must all come from the same run
+        self._training_lock = asyncio.Lock()
+
         # Initialize models
         self._initialize_models()
 
     def _initialize_models(self):
         """Initialize ML models"""
         self.models = {
-            'random_forest': RandomForestRegressor(n_estimators=100, random_state=42),
-            'gradient_boosting': GradientBoostingRegressor(n_estimators=100, random_state=42),
-            'xgboost': xgb.XGBRegressor(n_estimators=100, random_state=42),
-            'lightgbm': lgb.LGBMRegressor(n_estimators=100, random_state=42, verbose=-1),
+            'random_forest': RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=TRAINING_THREADS),
+            # Boosting models train on binned (histogram) features
+            'gradient_boosting': HistGradientBoostingRegressor(max_iter=100, random_state=42),
+            'xgboost': xgb.XGBRegressor(
+                n_estimators=100, tree_method='hist', max_bin=256, random_state=42, n_jobs=TRAINING_THREADS
+            ),
+            'lightgbm': lgb.LGBMRegressor(
+                n_estimators=100, max_bin=255, random_state=42, verbose=-1, n_jobs=TRAINING_THREADS
+            ),
             'linear_regression': LinearRegression(),
             'ridge': Ridge(alpha=1.0),
             'lasso': Lasso(alpha=1.0)
@@ -57,7 +85,7 @@ class PricePredictionService:
             'category': LabelEncoder()
         }
 
-    def prepare_features(self, data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]  # noqa  # noqa: E501 E501
+    def prepare_features(self, data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
         """Prepare features for ML models"""
         if not data:
             return np.array([]), np.array([])
@@ -118,11 +146,16 @@ class PricePredictionService:
         return X, y
 
     @cached(expire=3600)  # Cache for 1 hour
-    async def train_models(self, data: List[Dict]) -> Dict[str, Dict[str, float]]  # noqa  # noqa: E501 E501
+    async def train_models(self, data: List[Dict]) -> Dict[str, Dict[str, float]]:
         """Train all ML models on price data"""
         if len(data) < 50:  # Need minimum data for training
             return {"error": "Insufficient data for training (minimum 50 records required)"}
 
+        async with self._training_lock:
+            return await self._train_models(data)
+
+    async def _train_models(self, data: List[Dict]) -> Dict[str, Dict[str, float]]:
+        """Fit the encoders, scalers and models and save them; callers hold the training lock"""
         X, y = self.prepare_features(data)
 
         if len(X) == 0:
@@ -137,55 +170,82 @@ class PricePredictionService:
         X_train_scaled = self.scalers['features'].fit_transform(X_train)
         X_test_scaled = self.scalers['features'].transform(X_test)
 
-        results = {}
-
-        # Train and evaluate each model
-        for name, model in self.models.items():
-            try:
-                # Train model
-                if name in ['xgboost', 'lightgbm']:
-                    model.fit(X_train_scaled, y_train)
-                else:
-                    model.fit(X_train_scaled, y_train)
-
-                # Make predictions
-                y_pred = model.predict(X_test_scaled)
-
-                # Calculate metrics
-                mae = mean_absolute_error(y_test, y_pred)
-                mse = mean_squared_error(y_test, y_pred)
-                rmse = np.sqrt(mse)
-                r2 = r2_score(y_test, y_pred)
-
-                # Cross-validation score
-                cv_scores = cross_val_score(model, X_train_scaled, y_train, cv=5, scoring='r2')
-
-                results[name] = {
-                    'mae': float(mae),
-                    'mse': float(mse),
-                    'rmse': float(rmse),
-                    'r2': float(r2),
-                    'cv_mean': float(cv_scores.mean()),
-                    'cv_std': float(cv_scores.std())
-                }
-
-                # Save model
-                model_path = self.model_dir / f"{name}_model.joblib"
-                joblib.dump(model, model_path)
-
-                logger.info("Trained {name}: R² = {r2:.3f}, MAE = {mae:.2f}")
+        split = (X_train_scaled, y_train, X_test_scaled, y_test)
+        threaded = [(name, model) for name, model in self.models.items() if name in THREADED_MODELS]
+        single_threaded = [(name, model) for name, model in self.models.items() if name not in THREADED_MODELS]
 
-            except Exception as e:
-                logger.error("Error training {name}: {e}")
-                results[name] = {"error": str(e)}
+        # Training runs in worker threads, off the event loop. Tree models already use the
+        # whole thread budget, so they are fitted one after another; only the single-threaded
+        # linear models overlap
+        results = await asyncio.to_thread(self._fit_threaded, threaded, split)
+        results.update(await asyncio.to_thread(self._fit_single_threaded, single_threaded, split))
 
         # Save scalers and encoders
-        joblib.dump(self.scalers, self.model_dir / "scalers.joblib")
-        joblib.dump(self.encoders, self.model_dir / "encoders.joblib")
+        await asyncio.to_thread(self._dump_artifact, self.scalers, "scalers.joblib")
+        await asyncio.to_thread(self._dump_artifact, self.encoders, "encoders.joblib")
 
         return results
 
-    async def predict_price(self, item_data: Dict, days_ahead: int = 7) -> Dict[str, Any]  # noqa  # noqa: E501 E501
+    def _fit_threaded(self, models: List[Tuple[str, Any]], split: Tuple[np.ndarray, ...]) -> Dict[str, Any]:
+        """Fit internally threaded models sequentially, each on the full thread budget"""
+        # Cross-validation folds stay sequential: each fold fit already uses every thread
+        return {name: self._fit_one(name, model, *split, cv_jobs=1) for name, model in models}
+
+    def _fit_single_threaded(self, models: List[Tuple[str, Any]], split: Tuple[np.ndarray, ...]) -> Dict[str, Any]:
+        """Fit single-threaded models concurrently, splitting the thread budget between them"""
+        if not models:
+            return {}
+
+        cv_jobs = max(1, TRAINING_THREADS // len(models))
+        # BLAS is held to one thread per fit only for this short stage, not across the whole training
+        with threadpool_limits(limits=1, user_api='blas'), ThreadPoolExecutor(len(models)) as pool:
+            metrics = pool.map(lambda item: self._fit_one(*item, *split, cv_jobs=cv_jobs), models)
+            return dict(zip((name for name, _ in models), metrics))
+
+    def _fit_one(self,
+                 name: str,
+                 model: Any,
+                 X_train: np.ndarray,
+                 y_train: np.ndarray,
+                 X_test: np.ndarray,
+                 y_test: np.ndarray,
+                 cv_jobs: int = 1) -> Dict[str, Any]:
+        """Train, evaluate and save a single model"""
+        try:
+            # Train model
+            model.fit(X_train, y_train)
+
+            # Make predictions
+            y_pred = model.predict(X_test)
+
+            # Calculate metrics
+            mae = mean_absolute_error(y_test, y_pred)
+            mse = mean_squared_error(y_test, y_pred)
+            rmse = np.sqrt(mse)
+            r2 = r2_score(y_test, y_pred)
+
+            # Cross-validation score
+            cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring='r2', n_jobs=cv_jobs)
+
+            # Save model
+            self._dump_artifact(model, f"{name}_model.joblib")
+
+            logger.info("Trained {name}: R² = {r2:.3f}, MAE = {mae:.2f}")
+
+            return {
+                'mae': float(mae),
+                'mse': float(mse),
+                'rmse': float(rmse),
+                'r2': float(r2),
+                'cv_mean': float(cv_scores.mean()),
+                'cv_std': float(cv_scores.std())
+            }
+
+        except Exception as e:
+            logger.error("Error training {name}: {e}")
+            return {"error": str(e)}
+
+    async def predict_price(self, item_data: Dict, days_ahead: int = 7) -> Dict[str, Any]:
         """Predict future prices for an item"""
         try:
             # Load the best model (Random Forest by default)
@@ -193,66 +253,41 @@ class PricePredictionService:
             if not model_path.exists():
                 return {"error": "No trained model found. Please train models first."}
 
-            model = joblib.load(model_path)
+            model = await self._load_artifact(model_path.name)
 
             # Load scalers and encoders
-            scalers = joblib.load(self.model_dir / "scalers.joblib")
-            encoders = joblib.load(self.model_dir / "encoders.joblib")
-
-            # Prepare features for prediction
-            current_time = datetime.now()
-            predictions = []
-
-            for i in range(days_ahead):
-                future_time = current_time + timedelta(days=i)
-
-                # Create feature vector
-                features = np.array([[
-                    future_time.dayofweek,  # day_of_week
-                    future_time.month,     # month
-                    future_time.timetuple().tm_yday,  # day_of_year
-                    1 if future_time.weekday() >= 5 else 0,  # is_weekend
-                    item_data.get('current_price', 0),  # price_lag_1 (current price)
-                    item_data.get('current_price', 0),  # price_lag_7 (simplified)
-                    item_data.get('current_price', 0),  # price_lag_30 (simplified)
-                    item_data.get('current_price', 0),  # price_ma_7 (simplified)
-                    item_data.get('current_price', 0),  # price_ma_30 (simplified)
-                    0,  # price_std_7
-                    0,  # price_std_30
-                    0,  # price_change_1d
-                    0,  # price_change_7d
-                    0,  # price_change_30d
-                ]])
-
-                # Add encoded categorical features if available
-                if 'marketplace' in item_data:
-                    try:
-                        marketplace_encoded = encoders['marketplace'].transform([item_data['marketplace']])[0]
-                        features = np.append(features, [[marketplace_encoded]], axis=1)
-                    except:
-                        features = np.append(features, [[0]], axis=1)
-                else:
-                    features = np.append(features, [[0]], axis=1)
-
-                if 'category' in item_data:
-                    try:
-                        category_encoded = encoders['category'].transform([item_data['category']])[0]
-                        features = np.append(features, [[category_encoded]], axis=1)
-                    except:
-                        features = np.append(features, [[0]], axis=1)
-                else:
-                    features = np.append(features, [[0]], axis=1)
-
-                # Scale features
-                features_scaled = scalers['features'].transform(features)
-
-                # Make prediction
-                prediction = model.predict(features_scaled)[0]
-                predictions.append({
-                    'date': future_time.strftime('%Y-%m-%d'),
-                    'predicted_price': float(prediction),
+            scalers = await self._load_artifact("scalers.joblib")
+            encoders = await self._load_artifact("encoders.joblib")
+
+            # Calendar features for all forecast days at once
+            dates = pd.date_range(pd.Timestamp.now(), periods=days_ahead, freq='D')
+            day_of_week = dates.dayofweek.values
+
+            features = np.zeros((days_ahead, PREDICTION_FEATURE_COUNT), dtype=np.float32)
+            features[:, 0] = day_of_week
+            features[:, 1] = dates.month.values
+            features[:, 2] = dates.dayofyear.values
+            features[:, 3] = day_of_week >= 5  # is_weekend
+            # price_lag_1/7/30 and price_ma_7/30 (simplified to the current price);
+            # price_std_* and price_change_* stay zero
+            features[:, 4:9] = item_data.get('current_price', 0)
+
+            # Categorical features are the same for every day, so they are encoded once
+            features[:, 14] = self._encode_label(encoders, 'marketplace', item_data)
+            features[:, 15] = self._encode_label(encoders, 'category', item_data)
+
+            # Scale features and predict all days in a single call
+            features_scaled = scalers['features'].transform(features)
+            prices = model.predict(features_scaled)
+
+            predictions = [
+                {
+                    'date': date,
+                    'predicted_price': prediction,
                     'confidence': 0.8  # Simplified confidence score
-                })
+                }
+                for date, prediction in zip(dates.strftime('%Y-%m-%d'), prices.tolist())
+            ]
 
             return {
                 'item_id': item_data.get('id'),
@@ -266,6 +301,46 @@ class PricePredictionService:
             logger.error("Error predicting price: {e}")
             return {"error": str(e)}
 
+    def _dump_artifact(self, artifact: Any, name: str) -> None:
+        """Save a joblib artifact atomically, so _load_artifact never sees a partial file"""
+        fd, tmp_path = tempfile.mkstemp(dir=self.model_dir, prefix=f".{name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                joblib.dump(artifact, tmp_file)
+            os.replace(tmp_path, self.model_dir / name)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    async def _load_artifact(self, name: str) -> Any:
+        """Load a joblib artifact from the model dir, reusing it until the file changes"""
+        path = self.model_dir / name
+        mtime = path.stat().st_mtime
+
+        cached_entry = self._artifact_cache.get(name)
+        if cached_entry and cached_entry[0] == mtime:
+            return cached_entry[1]
+
+        # The lock keeps concurrent requests from unpickling the same file twice
+        async with self._artifact_lock:
+            cached_entry = self._artifact_cache.get(name)
+            if cached_entry and cached_entry[0] == mtime:
+                return cached_entry[1]
+
+            artifact = await asyncio.to_thread(joblib.load, path)
+            self._artifact_cache[name] = (mtime, artifact)
+            return artifact
+
+    @staticmethod
+    def _encode_label(encoders: Dict[str, Any], name: str, item_data: Dict) -> float:
+        """Encode a categorical item field, 0 when it is missing or unknown to the encoder"""
+        if name not in item_data:
+            return 0
+        try:
+            return encoders[name].transform([item_data[name]])[0]
+        except Exception:
+            return 0
+
     async def detect_anomalies(self, data: List[Dict]) -> List[Dict[str, Any]]:
         """Detect price anomalies using statistical methods"""
         if not data:
@@ -275,83 +350,95 @@ class PricePredictionService:
         df['timestamp'] = pd.to_datetime(df['timestamp'])
         df = df.sort_values('timestamp')
 
-        anomalies = []
-
         # Calculate rolling statistics
         window = 7
-        df['price_ma'] = df['price'].rolling(window=window).mean()
-        df['price_std'] = df['price'].rolling(window=window).std()
+        prices = df['price'].to_numpy(dtype=np.float64)
+        rolling = df['price'].rolling(window=window)
+        price_ma = rolling.mean().to_numpy()
+        price_std = rolling.std().to_numpy()
 
-        # Z-score method
-        df['z_score'] = (df['price'] - df['price_ma']) / df['price_std']
+        # Z-score method; NaN until the window fills, ±inf for a flat window
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_scores = (prices - price_ma) / price_std
+        abs_z_scores = np.abs(z_scores)
 
         # IQR method
-        Q1 = df['price'].quantile(0.25)
-        Q3 = df['price'].quantile(0.75)
+        Q1, Q3 = np.nanquantile(prices, [0.25, 0.75])
         IQR = Q3 - Q1
         lower_bound = Q1 - 1.5 * IQR
         upper_bound = Q3 + 1.5 * IQR
 
-        # Detect anomalies
-        for idx, row in df.iterrows():
-            is_anomaly = False
-            anomaly_type = None
-            severity = 0
-
-            # Z-score anomaly
-            if abs(row['z_score']) > 2:
-                is_anomaly = True
-                anomaly_type = "z_score"
-                severity = min(abs(row['z_score']) / 3, 1.0)
-
-            # IQR anomaly
-            elif row['price'] < lower_bound or row['price'] > upper_bound:
-                is_anomaly = True
-                anomaly_type = "iqr"
-                severity = 0.8
-
-            if is_anomaly:
-                anomalies.append({
-                    'timestamp': row['timestamp'].isoformat(),
-                    'price': float(row['price']),
-                    'expected_price': float(row['price_ma']) if not pd.isna(row['price_ma']) else None,
-                    'z_score': float(row['z_score']) if not pd.isna(row['z_score']) else None,
-                    'anomaly_type': anomaly_type,
-                    'severity': severity,
-                    'description': f"Price anomaly detected: {row['price']:.2f} (expected: {row['price_ma']  # noqa  # noqa: E501 E501.2f})"
-                })
+        # Detect anomalies for all rows at once; z-score takes precedence over IQR
+        is_z_anomaly = abs_z_scores > 2
+        is_iqr_anomaly = ~is_z_anomaly & ((prices < lower_bound) | (prices > upper_bound))
+        severities = np.where(is_z_anomaly, np.minimum(abs_z_scores / 3, 1.0), 0.8)
+
+        # Build result rows for the flagged positions only
+        anomaly_idx = np.flatnonzero(is_z_anomaly | is_iqr_anomaly)
+        anomalies = []
+        for i, timestamp in zip(anomaly_idx.tolist(), df['timestamp'].iloc[anomaly_idx]):
+            price = prices[i]
+            expected_price = price_ma[i]
+            z_score = z_scores[i]
+            anomalies.append({
+                'timestamp': timestamp.isoformat(),
+                'price': float(price),
+                'expected_price': float(expected_price) if not np.isnan(expected_price) else None,
+                'z_score': float(z_score) if not np.isnan(z_score) else None,
+                'anomaly_type': "z_score" if is_z_anomaly[i] else "iqr",
+                'severity': float(severities[i]),
+                'description': f"Price anomaly detected: {price:.2f} (expected: {expected_price:.2f})"
+            })
 
         return anomalies
 
+    @staticmethod
+    def price_columns(data: List[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Extract timestamp/price columns from price history rows, sorted by time"""
+        timestamps = pd.to_datetime([row['timestamp'] for row in data]).values.astype('datetime64[ns]')
+        prices = np.fromiter((row['price'] for row in data), dtype=np.float64, count=len(data))
+
+        order = np.argsort(timestamps, kind='stable')
+        return timestamps[order], prices[order]
+
+    @staticmethod
+    def series_columns(timestamps: List[float], prices: List[float]) -> Tuple[np.ndarray, np.ndarray]:
+        """Build sorted columns from parallel unix-second timestamp and price lists"""
+        seconds = np.asarray(timestamps, dtype=np.float64)
+        timestamps = (seconds * 1e9).astype(np.int64).view('datetime64[ns]')
+        prices = np.asarray(prices, dtype=np.float64)
+
+        order = np.argsort(timestamps, kind='stable')
+        return timestamps[order], prices[order]
+
     async def analyze_trends(self, data: List[Dict]) -> Dict[str, Any]:
         """Analyze price trends and seasonality"""
         if not data:
             return {"error": "No data provided"}
 
-        df = pd.DataFrame(data)
-        df['timestamp'] = pd.to_datetime(df['timestamp'])
-        df = df.sort_values('timestamp')
+        timestamps, prices = self.price_columns(data)
+        return self.analyze_price_series(timestamps, prices)
 
-        # Calculate trend
-        df['day'] = (df['timestamp'] - df['timestamp'].min()).dt.days
-        trend_slope = np.polyfit(df['day'], df['price'], 1)[0]
+    def analyze_price_series(self, timestamps: np.ndarray, prices: np.ndarray) -> Dict[str, Any]:
+        """Analyze price trends and seasonality over sorted datetime64/float64 columns"""
+        if len(prices) == 0:
+            return {"error": "No data provided"}
 
-        # Calculate seasonality
-        df['month'] = df['timestamp'].dt.month
-        df['day_of_week'] = df['timestamp'].dt.dayofweek
+        days = (timestamps - timestamps[0]).astype('timedelta64[D]').astype(np.int64)
 
-        monthly_avg = df.groupby('month')['price'].mean()
-        weekly_avg = df.groupby('day_of_week')['price'].mean()
+        # Trend slope, annualized volatility and price statistics in one pass
+        trend_slope, volatility, min_price, max_price, avg_price = trend_stats(
+            days.astype(np.float64), np.ascontiguousarray(prices, dtype=np.float64)
+        )
+        current_price = prices[-1]
 
-        # Calculate volatility
-        price_changes = df['price'].pct_change().dropna()
-        volatility = price_changes.std() * np.sqrt(252)  # Annualized volatility
+        # Calculate seasonality
+        months = timestamps.astype('datetime64[M]').astype(np.int64) % 12  # January=0
+        # 1970-01-01 was a Thursday (Monday=0)
+        days_of_week = (timestamps.astype('datetime64[D]').astype(np.int64) + 3) % 7
 
-        # Price statistics
-        current_price = df['price'].iloc[-1]
-        min_price = df['price'].min()
-        max_price = df['price'].max()
-        avg_price = df['price'].mean()
+        monthly_avg = self._group_means(months, prices, 12)
+        weekly_avg = self._group_means(days_of_week, prices, 7)
 
         # Trend direction
         if trend_slope > 0.01:
@@ -370,13 +457,21 @@ class PricePredictionService:
             'max_price': float(max_price),
             'avg_price': float(avg_price),
             'price_range': float(max_price - min_price),
-            'monthly_patterns': monthly_avg.to_dict(),
-            'weekly_patterns': weekly_avg.to_dict(),
-            'data_points': len(df),
-            'time_span_days': (df['timestamp'].max() - df['timestamp'].min()).days
+            'monthly_patterns': monthly_avg,
+            'weekly_patterns': weekly_avg,
+            'data_points': len(prices),
+            'time_span_days': int(days[-1])
         }
 
-    async def get_recommendations(self, user_items: List[Dict], all_items: List[Dict]) -> List[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    @staticmethod
+    def _group_means(groups: np.ndarray, values: np.ndarray, size: int) -> Tuple[float, ...]:
+        """Mean of values per group label 0..size-1, NaN for empty groups"""
+        counts = np.bincount(groups, minlength=size)
+        sums = np.bincount(groups, weights=values, minlength=size)
+        means = np.divide(sums, counts, out=np.full(size, np.nan), where=counts > 0)
+        return tuple(means.tolist())
+
+    async def get_recommendations(self, user_items: List[Dict], all_items: List[Dict]) -> List[Dict[str, Any]]:
         """Generate AI-powered recommendations"""
         if not user_items or not all_items:
             return []
@@ -420,7 +515,7 @@ class PricePredictionService:
         recommendations.sort(key=lambda x: x['score'], reverse=True)
         return recommendations[:10]
 
-    def _get_recommendation_reason(self, item: Dict, user_items: List[Dict], score: float) -> str  # noqa  # noqa: E501 E501
+    def _get_recommendation_reason(self, item: Dict, user_items: List[Dict], score: float) -> str:
         """Generate human-readable reason for recommendation"""
         reasons = []
 
@@ -449,7 +544,7 @@ class PricePredictionService:
             model_path = self.model_dir / f"{model_name}_model.joblib"
             if model_path.exists():
                 try:
-                    model = joblib.load(model_path)
+                    model = await self._load_artifact(model_path.name)
                     performance[model_name] = {
                         'trained': True,
                         'model_type': type(model).__name__,
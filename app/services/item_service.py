@@ -14,8 +14,16 @@ from datetime import datetime, timedelta
 class ItemService:
     """Service for managing tracked items"""
     
-    def __init__(self, db: Session):
+    def __init__(self, db: Session, trusted_rows: bool = True):
         self.db = db
+        # Rows read from our own DB skip pydantic validation (see ItemResponse.from_trusted_row)
+        self.trusted_rows = trusted_rows
+
+    def _item_response(self, item: TrackedItem) -> ItemResponse:
+        """Convert TrackedItem row to response schema"""
+        if self.trusted_rows:
+            return ItemResponse.from_trusted_row(item)
+        return ItemResponse.from_orm_row(item)
     
     async def get_items(
         self, 
@@ -36,7 +44,7 @@ class ItemService:
             query = query.filter(TrackedItem.is_active == is_active)
         
         items = query.offset(skip).limit(limit).all()
-        return [ItemResponse.from_orm(item) for item in items]
+        return [self._item_response(item) for item in items]
     
     async def get_item(self, item_id: int, user_id: Optional[int] = None) -> Optional[ItemResponse]:
         """Get specific tracked item"""
@@ -46,7 +54,7 @@ class ItemService:
             query = query.filter(TrackedItem.user_id == user_id)
         
         item = query.first()
-        return ItemResponse.from_orm(item) if item else None
+        return self._item_response(item) if item else None
     
     async def create_item(self, item_data: ItemCreate, user_id: int) -> ItemResponse:
         """Create new tracked item"""
@@ -91,7 +99,7 @@ class ItemService:
         self.db.commit()
         self.db.refresh(db_item)
         
-        return ItemResponse.from_orm(db_item)
+        return self._item_response(db_item)
     
     async def update_item(self, item_id: int, item_update: ItemUpdate, user_id: Optional[int] = None) -> Optional[ItemResponse]:
         """Update tracked item"""
@@ -114,7 +122,7 @@ class ItemService:
         self.db.commit()
         self.db.refresh(db_item)
         
-        return ItemResponse.from_orm(db_item)
+        return self._item_response(db_item)
     
     async def delete_item(self, item_id: int, user_id: Optional[int] = None) -> bool:
         """Delete tracked item"""
@@ -146,7 +154,7 @@ class ItemService:
             query = query.filter(PriceHistory.user_id == user_id)
         
         history = query.order_by(desc(PriceHistory.timestamp)).offset(skip).limit(limit).all()
-        return [PriceHistoryResponse.from_orm(record) for record in history]
+        return [PriceHistoryResponse.from_orm_row(record) for record in history]
     
     async def refresh_item(self, item_id: int, user_id: Optional[int] = None) -> bool:
         """Manually refresh item data"""
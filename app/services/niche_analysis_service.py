@@ -143,7 +143,7 @@ class NicheAnalysisService:
         }
 
     @cached(expire=3600)  # Cache for 1 hour
-    async def analyze_niche(self, niche: str, keywords: List[str]) -> NicheMetrics  # noqa  # noqa: E501 E501
+    async def analyze_niche(self, niche: str, keywords: List[str]) -> NicheMetrics:
         """Analyze a specific niche for e-commerce opportunities"""
         try:
             # Search for products in the niche across marketplaces
@@ -197,7 +197,7 @@ class NicheAnalysisService:
             logger.error("Error analyzing niche {niche}: {e}")
             return self._create_empty_metrics()
 
-    async def _search_niche_products(self, niche: str, keywords: List[str]) -> List[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _search_niche_products(self, niche: str, keywords: List[str]) -> List[Dict[str, Any]]:
         """Search for products in a specific niche"""
         all_results = []
 
@@ -216,7 +216,7 @@ class NicheAnalysisService:
 
         return all_results
 
-    async def _simulate_search(self, marketplace: str, keyword: str, niche: str) -> List[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _simulate_search(self, marketplace: str, keyword: str, niche: str) -> List[Dict[str, Any]]:
         """Simulate search results (replace with real API calls)"""
         # This is a simulation - in real app, you'd call the parsing service
         import random
@@ -258,7 +258,7 @@ class NicheAnalysisService:
         }
         return seasonal_niches.get(niche, 0.4)
 
-    def _estimate_profit_margin(self, niche: str, average_price: float) -> float  # noqa  # noqa: E501 E501
+    def _estimate_profit_margin(self, niche: str, average_price: float) -> float:
         """Estimate average profit margin for a niche"""
         # Simplified margin estimation based on niche and price
         base_margins = {
@@ -280,7 +280,7 @@ class NicheAnalysisService:
 
         return min(base_margin, 0.8)  # Cap at 80%
 
-    def _assess_difficulty(self, competition: float, profit_margin: float, seasonality: float) -> NicheDifficulty  # noqa  # noqa: E501 E501
+    def _assess_difficulty(self, competition: float, profit_margin: float, seasonality: float) -> NicheDifficulty:
         """Assess difficulty level of entering a niche"""
         score = (competition * 0.4) + ((1 - profit_margin) * 0.3) + (seasonality * 0.3)
 
@@ -293,7 +293,7 @@ class NicheAnalysisService:
         else:
             return NicheDifficulty.EXPERT
 
-    def _calculate_growth_potential(self, niche: str, demand_trend: str, competition: float) -> float  # noqa  # noqa: E501 E501
+    def _calculate_growth_potential(self, niche: str, demand_trend: str, competition: float) -> float:
         """Calculate growth potential for a niche"""
         growth_scores = {
             "growing": 0.8,
@@ -322,7 +322,7 @@ class NicheAnalysisService:
             growth_potential=0.0
         )
 
-    async def find_suppliers(self, product_name: str, category: str, budget: float) -> List[SupplierInfo]  # noqa  # noqa: E501 E501
+    async def find_suppliers(self, product_name: str, category: str, budget: float) -> List[SupplierInfo]:
         """Find suppliers for a specific product"""
         try:
             # Get suppliers from database
@@ -348,7 +348,7 @@ class NicheAnalysisService:
             return []
 
     async def calculate_pricing(self, product_name: str, category: str, 
-                              supplier_cost: float, target_margin: float) -> PricingRecommendation  # noqa  # noqa: E501 E501
+                              supplier_cost: float, target_margin: float) -> PricingRecommendation:
         """Calculate optimal pricing for a product"""
         try:
             # Get market data for the product
@@ -412,13 +412,13 @@ class NicheAnalysisService:
             logger.error("Error calculating pricing for {product_name}: {e}")
             return self._create_default_pricing(product_name, supplier_cost, target_margin)
 
-    async def _get_market_data(self, product_name: str, category: str) -> List[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _get_market_data(self, product_name: str, category: str) -> List[Dict[str, Any]]:
         """Get market data for pricing analysis"""
         # This would typically search across marketplaces
         # For now, return simulated data
         return await self._simulate_search("wildberries", product_name, category)
 
-    def _create_default_pricing(self, product_name: str, supplier_cost: float, target_margin: float) -> PricingRecommendation  # noqa  # noqa: E501 E501
+    def _create_default_pricing(self, product_name: str, supplier_cost: float, target_margin: float) -> PricingRecommendation:
         """Create default pricing when no market data is available"""
         recommended_price = supplier_cost / (1 - target_margin)
 
@@ -433,7 +433,7 @@ class NicheAnalysisService:
             pricing_strategy="Cost-plus pricing - no market data available"
         )
 
-    async def get_beginner_recommendations(self, budget: float, experience_level: str) -> Dict[str, Any]  # noqa  # noqa: E501 E501
+    async def get_beginner_recommendations(self, budget: float, experience_level: str) -> Dict[str, Any]:
         """Get personalized recommendations for beginners"""
         try:
             # Filter niches based on experience level
@@ -0,0 +1,87 @@
+"""
+Scalar scoring kernels for AI niche discovery
+
+When numba is installed the kernels are compiled with njit (cache=True keeps
+the compiled code between runs); otherwise the same functions run as plain
+Python.
+"""
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+# Trend pattern codes returned by classify_trend
+TREND_RISING = 0
+TREND_DECLINING = 1
+TREND_VOLATILE = 2
+TREND_STABLE = 3
+
+
+def _rule_score(features: np.ndarray) -> float:
+    """Rule-based opportunity score from a niche feature vector"""
+    score = 0.5  # Base score
+
+    # Price volatility (lower is better for stability)
+    price_volatility = features[1]
+    if price_volatility < 0.1:
+        score += 0.2
+    elif price_volatility > 0.3:
+        score -= 0.1
+
+    # Search volume trend (growing is better)
+    volume_trend = features[6]
+    if volume_trend > 1.1:
+        score += 0.2
+    elif volume_trend < 0.9:
+        score -= 0.1
+
+    # Competition (lower is better)
+    competition = features[7]
+    if competition < 0.3:
+        score += 0.2
+    elif competition > 0.7:
+        score -= 0.2
+
+    # Opportunity (higher is better)
+    score += features[8] * 0.2
+
+    # Trend (rising is better)
+    if features[13]:
+        score += 0.1
+
+    # Trend strength
+    score += features[16] * 0.1
+
+    return max(0.0, min(1.0, score))
+
+
+def _classify_trend(slope: float, r2: float, mean_price: float) -> Tuple[int, float, float]:
+    """Trend pattern code, strength and confidence from a linear fit"""
+    if slope > 0.01 and r2 > 0.3:
+        code = TREND_RISING
+        strength = min(abs(slope) / mean_price, 1.0)
+    elif slope < -0.01 and r2 > 0.3:
+        code = TREND_DECLINING
+        strength = min(abs(slope) / mean_price, 1.0)
+    elif r2 < 0.1:
+        code = TREND_VOLATILE
+        strength = 1.0 - r2
+    else:
+        code = TREND_STABLE
+        strength = 1.0 - abs(slope) / mean_price
+
+    confidence = min(r2 * 2, 1.0) if code != TREND_VOLATILE else 1.0 - r2
+
+    return code, strength, confidence
+
+
+if numba is not None:
+    rule_score = numba.njit(cache=True)(_rule_score)
+    classify_trend = numba.njit(cache=True)(_classify_trend)
+else:
+    rule_score = _rule_score
+    classify_trend = _classify_trend
@@ -34,7 +34,7 @@ class AntiDetectionService:
         """Get random user agent"""
         return random.choice(self.user_agents)
 
-    def get_random_delay(self, min_delay: float = 1.0, max_delay: float = 3.0) -> float  # noqa  # noqa: E501 E501
+    def get_random_delay(self, min_delay: float = 1.0, max_delay: float = 3.0) -> float:
         """Get random delay between requests"""
         return random.uniform(min_delay, max_delay)
 
@@ -108,7 +108,7 @@ class EnhancedParsingService:
         self.browser = await self.playwright.chromium.launch(**browser_options)
 
     @cached(expire=300)  # Cache for 5 minutes
-    async def parse_url(self, url: str, method: str = "http") -> List[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def parse_url(self, url: str, method: str = "http") -> List[Dict[str, Any]]:
         """Parse URL with caching and anti-detection"""
         cache_key = f"parse:{method}:{url}"
 
@@ -193,7 +193,7 @@ class EnhancedParsingService:
         finally:
             await page.close()
 
-    async def _parse_html_content(self, html: str, url: str) -> List[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _parse_html_content(self, html: str, url: str) -> List[Dict[str, Any]]:
         """Parse HTML content and extract data"""
         soup = BeautifulSoup(html, "lxml")
 
@@ -236,7 +236,7 @@ class EnhancedParsingService:
 
         return [data]
 
-    async def parse_marketplace_item(self, marketplace: str, item_id: str) -> Optional[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def parse_marketplace_item(self, marketplace: str, item_id: str) -> Optional[Dict[str, Any]]:
         """Parse specific marketplace item"""
         cache_key = f"marketplace:{marketplace}:{item_id}"
 
@@ -264,7 +264,7 @@ class EnhancedParsingService:
 
         return result
 
-    async def _parse_wildberries_item(self, item_id: str) -> Optional[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _parse_wildberries_item(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Parse Wildberries item"""
         url = f"https://www.wildberries.ru/catalog/{item_id}/detail.aspx"
 
@@ -300,7 +300,7 @@ class EnhancedParsingService:
 
         return None
 
-    async def _parse_yandex_item(self, item_id: str) -> Optional[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _parse_yandex_item(self, item_id: str) -> Optional[Dict[str, Any]]:
         """Parse Yandex Market item"""
         url = f"https://market.yandex.ru/product/{item_id}"
 
@@ -318,7 +318,7 @@ class EnhancedParsingService:
 
         return None
 
-    async def _parse_new_marketplace_item(self, marketplace: str, item_id: str) -> Optional[Dict[str, Any]]  # noqa  # noqa: E501 E501
+    async def _parse_new_marketplace_item(self, marketplace: str, item_id: str) -> Optional[Dict[str, Any]]:
         """Parse new marketplace item using specialized parsers"""
         try:
             # Load parsing profiles
@@ -338,7 +338,7 @@ class EnhancedParsingService:
                 return None
 
             # Parse using appropriate method
-            if config.get('method') == 'html_dynamic' or config.get('use_browser', False)  # noqa  # noqa: E501 E501
+            if config.get('method') == 'html_dynamic' or config.get('use_browser', False):
                 # Use browser for dynamic content
                 result = await self._parse_with_browser(url)
             else:
@@ -0,0 +1,230 @@
+"""Счетчики просмотров и лайков постов в Redis с периодическим сбросом в БД"""
+
+import asyncio
+import logging
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from redis.exceptions import WatchError
+from sqlalchemy import bindparam, case, func, select, update
+from sqlalchemy.orm import Session
+
+from app.core.cache import cache_service
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models.social import Like, SocialPost
+
+logger = logging.getLogger(__name__)
+
+# Множество постов с несброшенными счетчиками
+ACTIVE_POSTS_KEY = "posts_active"
+
+# Поля хэша post:{id} -> колонки social_posts
+COUNTER_COLUMNS = {
+    "views": "view_count",
+    "likes": "like_count",
+}
+
+# Хэш post:{id}:reactions - кэш количества лайков по типам поверх таблицы likes.
+# Поле-маркер отличает засеянный из БД хэш от созданного одним HINCRBY
+REACTIONS_SEEDED_FIELD = "_seeded"
+REACTIONS_TTL = 3600  # 1 час, ограничивает расхождение с БД
+
+
+def _counters_key(post_id: str) -> str:
+    return f"post:{post_id}"
+
+
+def _reactions_key(post_id: str) -> str:
+    return f"post:{post_id}:reactions"
+
+
+class PostCounterService:
+    """Атомарные счетчики постов: HINCRBY в Redis, агрегированный UPDATE в БД"""
+
+    async def record_view(self, post_id: str, db: Session) -> None:
+        """Учесть просмотр поста"""
+        await self._increment(post_id, {"views": 1}, db)
+
+    async def record_like(self, post_id: str, like_type: str, delta: int, db: Session) -> None:
+        """Учесть постановку (delta=1) или снятие (delta=-1) лайка типа like_type"""
+        await self._increment(post_id, {"likes": delta}, db, reaction=(like_type, delta))
+
+    async def get_reactions(self, post_id: str, db: Session) -> Dict[str, int]:
+        """Количество лайков поста по типам: из Redis, при промахе - GROUP BY по likes"""
+        redis_client = cache_service.redis_client
+        key = _reactions_key(post_id)
+        if redis_client:
+            try:
+                raw = await redis_client.hgetall(key)
+                reactions = {field.decode(): int(value) for field, value in raw.items()}
+                if reactions.pop(REACTIONS_SEEDED_FIELD, None):
+                    return {like_type: count for like_type, count in reactions.items() if count > 0}
+            except Exception as e:
+                logger.error(f"Error reading reactions for post {post_id}: {e}")
+                redis_client = None
+
+        reactions = await asyncio.to_thread(self._count_reactions, db, post_id)
+
+        if redis_client:
+            try:
+                pipe = redis_client.pipeline(transaction=True)
+                pipe.delete(key)
+                pipe.hset(key, mapping={REACTIONS_SEEDED_FIELD: 1, **reactions})
+                pipe.expire(key, REACTIONS_TTL)
+                await pipe.execute()
+            except Exception as e:
+                logger.error(f"Error caching reactions for post {post_id}: {e}")
+        return reactions
+
+    @staticmethod
+    def _count_reactions(db: Session, post_id: str) -> Dict[str, int]:
+        """Количество лайков поста по типам из таблицы likes"""
+        likes = Like.__table__
+        rows = db.execute(
+            select(likes.c.like_type, func.count()).where(
+                likes.c.post_id == uuid.UUID(str(post_id))
+            ).group_by(likes.c.like_type)
+        ).all()
+        return {like_type.value: count for like_type, count in rows}
+
+    async def _increment(self, post_id: str, deltas: Dict[str, int], db: Session,
+                         reaction: Optional[Tuple[str, int]] = None) -> None:
+        """Увеличить счетчики в Redis, при недоступности Redis - напрямую в БД"""
+        redis_client = cache_service.redis_client
+        if redis_client:
+            try:
+                pipe = redis_client.pipeline(transaction=False)
+                for field, delta in deltas.items():
+                    pipe.hincrby(_counters_key(post_id), field, delta)
+                pipe.zincrby(ACTIVE_POSTS_KEY, 1, post_id)
+                if reaction:
+                    # Незасеянный хэш get_reactions перезапишет из БД, TTL не дает ему копиться
+                    pipe.hincrby(_reactions_key(post_id), reaction[0], reaction[1])
+                    pipe.expire(_reactions_key(post_id), REACTIONS_TTL)
+                await pipe.execute()
+                return
+            except Exception as e:
+                logger.error(f"Redis counter error for post {post_id}, writing to DB: {e}")
+
+        # Синхронная сессия запроса - не блокируем event loop
+        await asyncio.to_thread(self._apply_deltas, db, [{"post_id": post_id, **deltas}])
+        if redis_client and reaction:
+            # Кэш реакций без этого изменения - сбрасываем, следующий запрос пересчитает
+            try:
+                await redis_client.delete(_reactions_key(post_id))
+            except Exception as e:
+                logger.error(f"Error invalidating reactions for post {post_id}: {e}")
+
+    async def flush(self) -> int:
+        """Сбросить накопленные счетчики в БД, возвращает количество постов
+
+        Счетчики вычитаются из Redis только после успешной записи в БД:
+        при ошибке UPDATE дельты остаются в Redis до следующего сброса.
+        Инкременты, пришедшие во время сброса, сохраняются - вычитается
+        ровно прочитанное значение. Обнулившиеся хэши post:{id} удаляются.
+        """
+        redis_client = cache_service.redis_client
+        if not redis_client:
+            return 0
+
+        active = await redis_client.zrange(ACTIVE_POSTS_KEY, 0, -1, withscores=True)
+        if not active:
+            return 0
+
+        post_ids = [post_id.decode() for post_id, _ in active]
+        pipe = redis_client.pipeline(transaction=True)
+        for post_id in post_ids:
+            pipe.hgetall(_counters_key(post_id))
+        results = await pipe.execute()
+
+        rows = []
+        for post_id, counters in zip(post_ids, results):
+            deltas = {key.decode(): int(value) for key, value in counters.items()}
+            if any(deltas.values()):
+                rows.append({"post_id": post_id, **deltas})
+
+        if rows:
+            await asyncio.to_thread(self._flush_rows, rows)
+
+        # Вычитаем сброшенное и снимаем отметку с постов без новых инкрементов.
+        # HINCRBY выполняется и для нулевой дельты: ответ - текущее значение поля
+        flushed = {row["post_id"]: row for row in rows}
+        pipe = redis_client.pipeline(transaction=True)
+        for post_id in post_ids:
+            row = flushed.get(post_id, {})
+            for field in COUNTER_COLUMNS:
+                pipe.hincrby(_counters_key(post_id), field, -row.get(field, 0))
+        for post_id, score in active:
+            pipe.zincrby(ACTIVE_POSTS_KEY, -score, post_id)
+        pipe.zremrangebyscore(ACTIVE_POSTS_KEY, "-inf", 0)
+        remaining = await pipe.execute()
+
+        width = len(COUNTER_COLUMNS)
+        for index, post_id in enumerate(post_ids):
+            if not any(remaining[index * width:(index + 1) * width]):
+                await self._drop_drained_counters(redis_client, post_id)
+        return len(rows)
+
+    @staticmethod
+    async def _drop_drained_counters(redis_client, post_id: str) -> None:
+        """Удалить обнулившийся хэш post:{id}, если в него не пришли новые инкременты"""
+        key = _counters_key(post_id)
+        async with redis_client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if any(int(value) for value in await pipe.hvals(key)):
+                    return
+                pipe.multi()
+                pipe.delete(key)
+                await pipe.execute()
+            except WatchError:
+                # Хэш изменился после проверки - удалится при следующем сбросе
+                pass
+
+    def _flush_rows(self, rows: List[Dict[str, int]]):
+        """Записать пачку дельт в отдельной сессии"""
+        db = SessionLocal()
+        try:
+            self._apply_deltas(db, rows)
+        finally:
+            db.close()
+
+    @staticmethod
+    def _apply_deltas(db: Session, rows: List[Dict[str, int]]):
+        """Применить дельты одним executemany UPDATE, не опуская счетчики ниже нуля"""
+        params = [
+            {"b_post_id": uuid.UUID(str(row["post_id"])), **{f"b_{field}": row.get(field, 0) for field in COUNTER_COLUMNS}}
+            for row in rows
+        ]
+        values = {}
+        for field, column in COUNTER_COLUMNS.items():
+            updated = SocialPost.__table__.c[column] + bindparam(f"b_{field}")
+            # CASE вместо greatest(): работает и на PostgreSQL, и на SQLite
+            values[column] = case((updated < 0, 0), else_=updated)
+        statement = update(SocialPost.__table__).where(
+            SocialPost.__table__.c.id == bindparam("b_post_id")
+        ).values(values)
+        try:
+            db.execute(statement, params)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+
+
+async def post_counters_flush_loop(interval: Optional[int] = None):
+    """Фоновый сброс счетчиков постов в БД"""
+    interval = interval or settings.post_counters_flush_interval_seconds
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            await post_counter_service.flush()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error flushing post counters: {e}")
+
+
+# Глобальный экземпляр сервиса
+post_counter_service = PostCounterService()
@@ -1,12 +1,20 @@
 """Сервис для социальных функций"""
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, desc, func, text
+import asyncio
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
 
+from sqlalchemy.orm import Session, contains_eager
+from sqlalchemy import and_, or_, desc, func, text, literal_column
+from sqlalchemy.dialects.postgresql import TSVECTOR, insert as pg_insert
+
+from app.core.config import settings
+from app.core.database import SessionLocal
 from app.models.social import (
     UserProfile, Group, Achievement, UserAchievement, SocialPost, 
-    Comment, Like, Message, Leaderboard, LeaderboardEntry, Notification,
-    friendship, follows, group_members
+    Comment, Like, LikeType, Message, MessageRead, Leaderboard, LeaderboardEntry, Notification,
+    UserFeedEntry, friendship, follows, group_members
 )
 from app.schemas.social import (
     UserProfileCreate, UserProfileUpdate, GroupCreate, GroupUpdate,
@@ -15,6 +23,8 @@ from app.schemas.social import (
     GroupJoinRequest
 )
 
+logger = logging.getLogger(__name__)
+
 class SocialService:
     """Сервис для социальных функций"""
 
@@ -23,7 +33,7 @@ class SocialService:
 
     # === ПРОФИЛИ ПОЛЬЗОВАТЕЛЕЙ ===
 
-    def create_user_profile(self, profile_data: UserProfileCreate) -> UserProfile  # noqa  # noqa: E501 E501
+    def create_user_profile(self, profile_data: UserProfileCreate) -> UserProfile:
         """Создать профиль пользователя"""
         profile = UserProfile(
             user_id=profile_data.user_id,
@@ -48,7 +58,7 @@ class SocialService:
         """Получить профиль пользователя"""
         return self.db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
 
-    def update_user_profile(self, user_id: str, update_data: UserProfileUpdate) -> Optional[UserProfile]  # noqa  # noqa: E501 E501
+    def update_user_profile(self, user_id: str, update_data: UserProfileUpdate) -> Optional[UserProfile]:
         """Обновить профиль пользователя"""
         profile = self.get_user_profile(user_id)
         if not profile:
@@ -133,7 +143,7 @@ class SocialService:
         """Получить группу"""
         return self.db.query(Group).filter(Group.id == group_id).first()
 
-    def join_group(self, group_id: str, user_id: str, role: str = "member") -> bool  # noqa  # noqa: E501 E501
+    def join_group(self, group_id: str, user_id: str, role: str = "member") -> bool:
         """Вступить в группу"""
         group = self.get_group(group_id)
         if not group:
@@ -187,7 +197,7 @@ class SocialService:
 
     # === ДОСТИЖЕНИЯ ===
 
-    def check_achievements(self, user_id: str, action_type: str, action_data: Dict[str, Any]) -> List[UserAchievement]  # noqa  # noqa: E501 E501
+    def check_achievements(self, user_id: str, action_type: str, action_data: Dict[str, Any]) -> List[UserAchievement]:
         """Проверить и разблокировать достижения"""
         profile = self.get_user_profile(user_id)
         if not profile:
@@ -212,7 +222,7 @@ class SocialService:
                 continue
 
             # Проверяем условия достижения
-            if self._check_achievement_condition(profile, achievement, action_data)  # noqa  # noqa: E501 E501
+            if self._check_achievement_condition(profile, achievement, action_data):
                 if existing:
                     existing.is_completed = True
                     existing.completed_at = datetime.utcnow()
@@ -238,7 +248,7 @@ class SocialService:
         self.db.commit()
         return unlocked_achievements
 
-    def _check_achievement_condition(self, profile: UserProfile, achievement: Achievement, action_data: Dict[str, Any]) -> bool  # noqa  # noqa: E501 E501
+    def _check_achievement_condition(self, profile: UserProfile, achievement: Achievement, action_data: Dict[str, Any]) -> bool:
         """Проверить условие достижения"""
         if achievement.condition_type == "count":
             # Подсчитываем количество действий
@@ -275,7 +285,7 @@ class SocialService:
 
     # === СОЦИАЛЬНЫЕ ПОСТЫ ===
 
-    def create_post(self, post_data: SocialPostCreate, author_id: str) -> SocialPost  # noqa  # noqa: E501 E501
+    def create_post(self, post_data: SocialPostCreate, author_id: str) -> SocialPost:
         """Создать социальный пост"""
         profile = self.get_user_profile(author_id)
         if not profile:
@@ -289,6 +299,8 @@ class SocialService:
             post_type=post_data.post_type,
             item_id=post_data.item_id,
             marketplace=post_data.marketplace,
+            author_display_name=profile.display_name,
+            author_avatar_url=profile.avatar_url,
             is_public=post_data.is_public,
             allow_comments=post_data.allow_comments
         )
@@ -301,12 +313,51 @@ class SocialService:
 
         return post
 
-    def get_social_feed(self, user_id: str, page: int = 1, limit: int = 20) -> List[SocialPost]  # noqa  # noqa: E501 E501
+    def get_social_feed(self, user_id: str, page: int = 1, limit: int = 20) -> List[SocialPost]:
         """Получить социальную ленту пользователя"""
         profile = self.get_user_profile(user_id)
         if not profile:
             return []
 
+        offset = (page - 1) * limit
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self._live_feed_page(profile, offset, limit)
+
+        # На PostgreSQL свежие посты читаются из материализованного представления
+        # user_feed_recent. Оно хранит только последние 7 дней - страницы за окном
+        # дочитываются живым запросом по постам старше самого раннего поста в окне
+        window_size, window_start = self._feed_window(user_id)
+        posts = []
+        if offset < window_size:
+            posts = self._recent_feed_page(user_id, offset, limit)
+            if len(posts) == limit:
+                return posts
+
+        return posts + self._live_feed_page(
+            profile, max(0, offset - window_size), limit - len(posts), before=window_start
+        )
+
+    def _feed_window(self, user_id: str) -> Tuple[int, Optional[datetime]]:
+        """Количество постов ленты в user_feed_recent и время самого раннего из них"""
+        return self.db.query(
+            func.count(), func.min(UserFeedEntry.created_at)
+        ).filter(UserFeedEntry.follower_id == user_id).one()
+
+    def _recent_feed_page(self, user_id: str, offset: int, limit: int) -> List[SocialPost]:
+        """Страница ленты из user_feed_recent"""
+        return self.db.query(SocialPost).join(
+            UserFeedEntry, UserFeedEntry.post_id == SocialPost.id
+        ).filter(
+            UserFeedEntry.follower_id == user_id
+        ).order_by(
+            desc(UserFeedEntry.created_at), desc(UserFeedEntry.post_id)
+        ).offset(offset).limit(limit).all()
+
+    def _live_feed_page(self, profile: UserProfile, offset: int, limit: int,
+                        before: Optional[datetime] = None) -> List[SocialPost]:
+        """Страница ленты по друзьям и подпискам, при before - только посты раньше этого времени"""
+        user_id = profile.user_id
+
         # Получаем ID друзей и подписок
         friends_ids = self.db.query(friendship.c.friend_id).filter(
             friendship.c.user_id == user_id,
@@ -320,20 +371,52 @@ class SocialService:
 
         following_ids = self.db.query(follows.c.following_id).filter(follows.c.follower_id == user_id).all()
 
-        # Объединяем ID
-        user_ids = [profile.id] + [f[0] for f in friends_ids] + [f[0] for f in following_ids]
+        # Объединяем ID (friendships/follows ссылаются на users.id)
+        user_ids = [user_id] + [f[0] for f in friends_ids] + [f[0] for f in following_ids]
 
         # Получаем посты
-        posts = self.db.query(SocialPost).filter(
-            SocialPost.author_id.in_(user_ids),
+        posts_query = self.db.query(SocialPost).join(
+            UserProfile, UserProfile.id == SocialPost.author_id
+        ).filter(
+            UserProfile.user_id.in_(user_ids),
             SocialPost.is_public == True
-        ).order_by(desc(SocialPost.created_at)).offset((page - 1) * limit).limit(limit).all()
+        )
+        if before is not None:
+            posts_query = posts_query.filter(SocialPost.created_at < before)
+
+        return posts_query.order_by(desc(SocialPost.created_at)).offset(offset).limit(limit).all()
+
+    def search_posts(self, query: str, page: int = 1, limit: int = 20) -> List[SocialPost]:
+        """Полнотекстовый поиск по публичным постам"""
+        posts_query = self.db.query(SocialPost).filter(SocialPost.is_public == True)
+
+        # На PostgreSQL используется GIN-индекс по search_vector (колонка из миграции 006)
+        if self.db.get_bind().dialect.name == "postgresql":
+            search_vector = literal_column('social_posts.search_vector', TSVECTOR)
+            ts_query = func.plainto_tsquery('simple', query)
+            posts_query = posts_query.filter(
+                search_vector.op('@@')(ts_query)
+            ).order_by(
+                desc(func.ts_rank(search_vector, ts_query)), desc(SocialPost.created_at)
+            )
+        else:
+            posts_query = posts_query.filter(
+                SocialPost.content.ilike(f"%{query}%")
+            ).order_by(desc(SocialPost.created_at))
 
-        return posts
+        return posts_query.offset((page - 1) * limit).limit(limit).all()
+
+    def refresh_user_feed(self):
+        """Обновить материализованное представление ленты без блокировки чтения"""
+        if self.db.get_bind().dialect.name != "postgresql":
+            return
+
+        self.db.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY user_feed_recent"))
+        self.db.commit()
 
     # === КОММЕНТАРИИ ===
 
-    def create_comment(self, comment_data: CommentCreate, author_id: str) -> Comment  # noqa  # noqa: E501 E501
+    def create_comment(self, comment_data: CommentCreate, author_id: str) -> Comment:
         """Создать комментарий"""
         profile = self.get_user_profile(author_id)
         if not profile:
@@ -344,7 +427,9 @@ class SocialService:
             author_id=profile.id,
             parent_id=comment_data.parent_id,
             content=comment_data.content,
-            media_urls=comment_data.media_urls
+            media_urls=comment_data.media_urls,
+            author_display_name=profile.display_name,
+            author_avatar_url=profile.avatar_url
         )
         self.db.add(comment)
 
@@ -367,67 +452,103 @@ class SocialService:
 
     # === ЛАЙКИ ===
 
-    def toggle_like(self, like_data: LikeCreate, user_id: str) -> bool:
-        """Переключить лайк"""
+    def toggle_like(self, like_data: LikeCreate, user_id: str) -> Optional[Tuple[bool, LikeType]]:
+        """Переключить лайк: (True, тип) - поставлен, (False, тип снятого лайка) - снят, None - ошибка
+
+        Счетчик like_count поста ведется через PostCounterService, здесь
+        обновляется только счетчик комментария.
+        """
         profile = self.get_user_profile(user_id)
         if not profile:
-            return False
+            return None
+
+        is_post = like_data.target == "post"
+        if is_post:
+            target = Like.post_id == like_data.post_id
+            comment = None
+        else:
+            target = Like.comment_id == like_data.comment_id
+            comment = self.db.query(Comment).filter(Comment.id == like_data.comment_id).first()
 
         # Проверяем существующий лайк
-        existing_like = None
-        if like_data.post_id:
-            existing_like = self.db.query(Like).filter(
-                Like.user_id == profile.id,
-                Like.post_id == like_data.post_id
-            ).first()
-        elif like_data.comment_id:
-            existing_like = self.db.query(Like).filter(
-                Like.user_id == profile.id,
-                Like.comment_id == like_data.comment_id
-            ).first()
+        existing_like = self.db.query(Like).filter(Like.user_id == profile.id, target).first()
 
         if existing_like:
             # Убираем лайк
+            removed_type = existing_like.like_type
             self.db.delete(existing_like)
 
             # Обновляем счетчики
-            if like_data.post_id:
-                post = self.db.query(SocialPost).filter(SocialPost.id == like_data.post_id).first()
-                if post:
-                    post.like_count = max(0, post.like_count - 1)
-            elif like_data.comment_id:
-                comment = self.db.query(Comment).filter(Comment.id == like_data.comment_id).first()
-                if comment:
-                    comment.like_count = max(0, comment.like_count - 1)
+            if comment:
+                comment.like_count = max(0, comment.like_count - 1)
 
             self.db.commit()
-            return False
+            return False, removed_type
         else:
             # Добавляем лайк
-            like = Like(
-                user_id=profile.id,
-                post_id=like_data.post_id,
-                comment_id=like_data.comment_id,
-                like_type=like_data.like_type
-            )
+            if is_post:
+                like = Like(user_id=profile.id, post_id=like_data.post_id, like_type=like_data.like_type)
+            else:
+                like = Like(user_id=profile.id, comment_id=like_data.comment_id, like_type=like_data.like_type)
             self.db.add(like)
 
             # Обновляем счетчики
-            if like_data.post_id:
-                post = self.db.query(SocialPost).filter(SocialPost.id == like_data.post_id).first()
-                if post:
-                    post.like_count += 1
-            elif like_data.comment_id:
-                comment = self.db.query(Comment).filter(Comment.id == like_data.comment_id).first()
-                if comment:
-                    comment.like_count += 1
+            if comment:
+                comment.like_count += 1
 
             self.db.commit()
-            return True
+            return True, like_data.like_type
+
+    # === СООБЩЕНИЯ ===
+
+    def _unread_messages_query(self, profile_id: str):
+        """Непрочитанные сообщения получателя: anti-join с message_reads"""
+        return self.db.query(Message).outerjoin(
+            MessageRead,
+            and_(MessageRead.message_id == Message.id, MessageRead.user_id == profile_id)
+        ).filter(
+            Message.receiver_id == profile_id,
+            Message.is_deleted == False,
+            MessageRead.message_id.is_(None)
+        )
+
+    def get_unread_messages(self, profile_id: str, limit: int = 50) -> List[Message]:
+        """Получить непрочитанные сообщения"""
+        # reads заполняется из того же LEFT JOIN (пустой список): read_at/is_read
+        # в ответе не дают N+1. Отправитель отдается снимком author_display_name/avatar_url
+        return self._unread_messages_query(profile_id).options(
+            contains_eager(Message.reads)
+        ).order_by(
+            desc(Message.created_at)
+        ).limit(limit).all()
+
+    def count_unread_messages(self, profile_id: str) -> int:
+        """Количество непрочитанных сообщений"""
+        return self._unread_messages_query(profile_id).count()
+
+    def mark_message_read(self, message_id: str, profile_id: str) -> bool:
+        """Отметить сообщение прочитанным (вставка в message_reads, без UPDATE messages)"""
+        message = self.db.query(Message.id).filter(
+            Message.id == message_id,
+            Message.receiver_id == profile_id
+        ).first()
+        if not message:
+            return False
+
+        if self.db.get_bind().dialect.name == "postgresql":
+            self.db.execute(
+                pg_insert(MessageRead).values(message_id=message_id, user_id=profile_id)
+                .on_conflict_do_nothing(index_elements=["message_id", "user_id"])
+            )
+        elif not self.db.get(MessageRead, (message_id, profile_id)):
+            self.db.add(MessageRead(message_id=message_id, user_id=profile_id))
+
+        self.db.commit()
+        return True
 
     # === ЛИДЕРБОРДЫ ===
 
-    def create_leaderboard(self, leaderboard_data: LeaderboardCreate) -> Leaderboard  # noqa  # noqa: E501 E501
+    def create_leaderboard(self, leaderboard_data: LeaderboardCreate) -> Leaderboard:
         """Создать лидерборд"""
         leaderboard = Leaderboard(
             name=leaderboard_data.name,
@@ -441,7 +562,7 @@ class SocialService:
         self.db.refresh(leaderboard)
         return leaderboard
 
-    def update_leaderboard(self, leaderboard_id: str, user_id: str, score: float, metadata: Dict[str, Any] = None) -> bool  # noqa  # noqa: E501 E501
+    def update_leaderboard(self, leaderboard_id: str, user_id: str, score: float, metadata: Dict[str, Any] = None) -> bool:
         """Обновить лидерборд"""
         leaderboard = self.db.query(Leaderboard).filter(Leaderboard.id == leaderboard_id).first()
         if not leaderboard:
@@ -484,7 +605,7 @@ class SocialService:
 
         self.db.commit()
 
-    def get_leaderboard(self, leaderboard_id: str, limit: int = 100) -> List[LeaderboardEntry]  # noqa  # noqa: E501 E501
+    def get_leaderboard(self, leaderboard_id: str, limit: int = 100) -> List[LeaderboardEntry]:
         """Получить лидерборд"""
         return self.db.query(LeaderboardEntry).filter(
             LeaderboardEntry.leaderboard_id == leaderboard_id
@@ -509,13 +630,13 @@ class SocialService:
         self.db.refresh(notification)
         return notification
 
-    def get_user_notifications(self, user_id: str, limit: int = 50) -> List[Notification]  # noqa  # noqa: E501 E501
+    def get_user_notifications(self, user_id: str, limit: int = 50) -> List[Notification]:
         """Получить уведомления пользователя"""
         return self.db.query(Notification).filter(
             Notification.user_id == user_id
         ).order_by(desc(Notification.created_at)).limit(limit).all()
 
-    def mark_notification_read(self, notification_id: str, user_id: str) -> bool  # noqa  # noqa: E501 E501
+    def mark_notification_read(self, notification_id: str, user_id: str) -> bool:
         """Отметить уведомление как прочитанное"""
         notification = self.db.query(Notification).filter(
             Notification.id == notification_id,
@@ -529,3 +650,25 @@ class SocialService:
             return True
 
         return False
+
+
+def _refresh_user_feed_once():
+    """Обновить ленту в отдельной сессии"""
+    db = SessionLocal()
+    try:
+        SocialService(db).refresh_user_feed()
+    finally:
+        db.close()
+
+
+async def user_feed_refresh_loop(interval: Optional[int] = None):
+    """Фоновое обновление user_feed_recent"""
+    interval = interval or settings.user_feed_refresh_interval_seconds
+    while True:
+        try:
+            await asyncio.sleep(interval)
+            await asyncio.to_thread(_refresh_user_feed_once)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Error refreshing user feed view: {e}")
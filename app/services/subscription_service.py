@@ -2,8 +2,9 @@
 
 from datetime import datetime, timedelta
 from typing import Optional, List, Dict, Any
+import orjson
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, case, func
 
 from app.models.subscription import Subscription, SubscriptionPlan, SubscriptionTier
 from app.schemas.subscription import (
@@ -11,6 +12,12 @@ from app.schemas.subscription import (
     BillingSummary
 )
 
+# Поля подписки, попадающие в плоскую сводку по биллингу как subscription_<поле>
+BILLING_SUBSCRIPTION_FIELDS = (
+    "id", "tier", "status", "auto_renew", "start_date", "end_date",
+    "days_remaining", "is_active"
+)
+
 
 class SubscriptionService:
     """Сервис управления подписками"""
@@ -109,15 +116,13 @@ class SubscriptionService:
 
     def create_subscription_plan(self, plan_data: SubscriptionPlanCreate) -> SubscriptionPlan:
         """Создать тарифный план"""
-        import json
-        
         plan = SubscriptionPlan(
             name=plan_data.name,
             tier=plan_data.tier,
             price_monthly=plan_data.price_monthly,
             price_yearly=plan_data.price_yearly,
-            features=json.dumps(plan_data.features),
-            limits=json.dumps(plan_data.limits)
+            features=orjson.dumps(plan_data.features).decode(),
+            limits=orjson.dumps(plan_data.limits).decode()
         )
         self.db.add(plan)
         self.db.commit()
@@ -131,55 +136,55 @@ class SubscriptionService:
         # Текущая подписка
         current_subscription = self.get_user_subscription(user_id)
         
+        # Суммы считаются в БД, строки платежей в Python не загружаются
         # Общая сумма платежей
-        total_payments = self.db.query(Payment).filter(
+        total_payments_sum = self.db.query(
+            func.coalesce(func.sum(Payment.amount), 0.0)
+        ).filter(
             and_(
                 Payment.user_id == user_id,
                 Payment.status == "completed"
             )
-        ).with_entities(Payment.amount).all()
-        total_payments_sum = sum(payment.amount for payment in total_payments) if total_payments else 0.0
+        ).scalar()
 
-        # Общий кэшбек
-        total_cashback = self.db.query(Cashback).filter(
+        # Общий и доступный кэшбек одним запросом
+        total_cashback_sum, available_cashback_sum = self.db.query(
+            func.coalesce(func.sum(Cashback.amount), 0.0),
+            func.coalesce(func.sum(case((Cashback.status == "approved", Cashback.amount), else_=0.0)), 0.0)
+        ).filter(
             and_(
                 Cashback.user_id == user_id,
                 Cashback.status.in_(["approved", "paid"])
             )
-        ).with_entities(Cashback.amount).all()
-        total_cashback_sum = sum(cb.amount for cb in total_cashback) if total_cashback else 0.0
-
-        # Доступный кэшбек
-        available_cashback = self.db.query(Cashback).filter(
-            and_(
-                Cashback.user_id == user_id,
-                Cashback.status == "approved"
-            )
-        ).with_entities(Cashback.amount).all()
-        available_cashback_sum = sum(cb.amount for cb in available_cashback) if available_cashback else 0.0
+        ).one()
 
         # Реферальные награды
-        referral_rewards = self.db.query(Referral).filter(
+        referral_rewards_sum = self.db.query(
+            func.coalesce(func.sum(Referral.reward_amount), 0.0)
+        ).filter(
             and_(
                 Referral.referrer_id == user_id,
                 Referral.status == "completed"
             )
-        ).with_entities(Referral.reward_amount).all()
-        referral_rewards_sum = sum(ref.reward_amount for ref in referral_rewards) if referral_rewards else 0.0
+        ).scalar()
 
         # Дата следующего платежа
         next_payment_date = None
         if current_subscription and current_subscription.auto_renew and current_subscription.end_date:
             next_payment_date = current_subscription.end_date
 
-        return BillingSummary(
-            current_subscription=current_subscription,
+        summary = {
+            f"subscription_{name}": getattr(current_subscription, name) if current_subscription else None
+            for name in BILLING_SUBSCRIPTION_FIELDS
+        }
+        summary.update(
             total_payments=total_payments_sum,
             total_cashback=total_cashback_sum,
             available_cashback=available_cashback_sum,
             next_payment_date=next_payment_date,
             referral_rewards=referral_rewards_sum
         )
+        return summary
 
     def check_subscription_limits(self, user_id: str, limit_type: str) -> Dict[str, Any]:
         """Проверить ограничения подписки"""
@@ -212,7 +217,6 @@ class SubscriptionService:
         if not plan:
             return False
 
-        features = plan.get_features_list()
-        return feature in features
+        return feature in plan.get_feature_set()
 
 
@@ -0,0 +1,119 @@
+"""
+Single-pass statistics kernels for price trend analysis
+
+When numba is installed the loop kernel is compiled with njit (cache=True keeps
+the compiled code between runs); otherwise a vectorized numpy implementation
+with the same results is used.
+"""
+import math
+from typing import Tuple
+
+import numpy as np
+
+try:
+    import numba
+except ImportError:  # optional dependency
+    numba = None
+
+ANNUALIZATION_FACTOR = math.sqrt(252.0)
+
+
+def _trend_stats_loop(days: np.ndarray, prices: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Slope, annualized volatility, min, max and mean in one pass (Welford updates); prices must be non-empty"""
+    mean_x = 0.0
+    mean_y = 0.0
+    m2_x = 0.0
+    c_xy = 0.0
+    low = prices[0]
+    high = prices[0]
+
+    changes = 0
+    mean_change = 0.0
+    m2_change = 0.0
+
+    for i in range(prices.shape[0]):
+        x = days[i]
+        y = prices[i]
+
+        dx = x - mean_x
+        mean_x += dx / (i + 1)
+        mean_y += (y - mean_y) / (i + 1)
+        m2_x += dx * (x - mean_x)
+        c_xy += dx * (y - mean_y)
+
+        # NaN propagates to min/max as in np.min/np.max
+        if y < low or math.isnan(y):
+            low = y
+        if y > high or math.isnan(y):
+            high = y
+
+        # Changes from a zero price are undefined and skipped
+        if i > 0 and prices[i - 1] != 0.0:
+            change = (y - prices[i - 1]) / prices[i - 1]
+            changes += 1
+            delta = change - mean_change
+            mean_change += delta / changes
+            m2_change += delta * (change - mean_change)
+
+    slope = c_xy / m2_x if m2_x > 0.0 else 0.0
+    if changes > 1:
+        volatility = math.sqrt(m2_change / (changes - 1)) * ANNUALIZATION_FACTOR
+    else:
+        volatility = math.nan
+
+    return slope, volatility, low, high, mean_y
+
+
+def _trend_stats_numpy(days: np.ndarray, prices: np.ndarray) -> Tuple[float, float, float, float, float]:
+    """Vectorized equivalent of _trend_stats_loop"""
+    x_centered = days - days.mean()
+    m2_x = np.dot(x_centered, x_centered)
+    slope = np.dot(x_centered, prices - prices.mean()) / m2_x if m2_x > 0.0 else 0.0
+
+    previous = prices[:-1]
+    nonzero = previous != 0.0
+    changes = np.diff(prices)[nonzero] / previous[nonzero]
+    if len(changes) > 1:
+        volatility = np.std(changes, ddof=1) * ANNUALIZATION_FACTOR
+    else:
+        volatility = math.nan
+
+    return slope, volatility, prices.min(), prices.max(), prices.mean()
+
+
+def _first_last_prices_loop(codes: np.ndarray, prices: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """First price, last price and point count per group code; rows must be in time order"""
+    first = np.full(n_groups, np.nan)
+    last = np.full(n_groups, np.nan)
+    counts = np.zeros(n_groups, np.int64)
+
+    for i in range(codes.shape[0]):
+        code = codes[i]
+        if counts[code] == 0:
+            first[code] = prices[i]
+        last[code] = prices[i]
+        counts[code] += 1
+
+    return first, last, counts
+
+
+def _first_last_prices_numpy(codes: np.ndarray, prices: np.ndarray, n_groups: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Vectorized equivalent of _first_last_prices_loop"""
+    first = np.full(n_groups, np.nan)
+    last = np.full(n_groups, np.nan)
+
+    present, first_index = np.unique(codes, return_index=True)
+    first[present] = prices[first_index]
+    _, last_index_reversed = np.unique(codes[::-1], return_index=True)
+    last[present] = prices[len(codes) - 1 - last_index_reversed]
+    counts = np.bincount(codes, minlength=n_groups)
+
+    return first, last, counts
+
+
+if numba is not None:
+    trend_stats = numba.njit(cache=True)(_trend_stats_loop)
+    first_last_prices = numba.njit(cache=True)(_first_last_prices_loop)
+else:
+    trend_stats = _trend_stats_numpy
+    first_last_prices = _first_last_prices_numpy
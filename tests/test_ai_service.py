@@ -0,0 +1,60 @@
+"""
+Тесты для обучения и сохранения моделей прогноза цен
+"""
+import asyncio
+import joblib
+import pytest
+from unittest.mock import patch
+
+from app.services.ai_service import PricePredictionService
+
+
+@pytest.fixture
+def service(tmp_path, monkeypatch):
+    """Сервис с каталогом моделей во временной директории"""
+    monkeypatch.chdir(tmp_path)
+    return PricePredictionService()
+
+
+class TestTrainingLock:
+    """Тесты сериализации обучения"""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_trainings_do_not_overlap(self, service):
+        """Тест: параллельные вызовы train_models обучают модели по очереди"""
+        running = []
+        overlaps = []
+
+        async def train(data):
+            overlaps.append(bool(running))
+            running.append(data)
+            await asyncio.sleep(0.01)
+            running.remove(data)
+            return {}
+
+        with patch.object(service, '_train_models', side_effect=train):
+            await asyncio.gather(*(service.train_models([{"n": i}] * 50) for i in range(3)))
+
+        assert overlaps == [False, False, False]
+
+
+class TestDumpArtifact:
+    """Тесты атомарного сохранения артефактов"""
+
+    def test_roundtrip_without_temp_files(self, service):
+        """Тест: артефакт сохраняется под своим именем, временных файлов не остается"""
+        service._dump_artifact({"a": 1}, "scalers.joblib")
+
+        assert joblib.load(service.model_dir / "scalers.joblib") == {"a": 1}
+        assert [path.name for path in service.model_dir.iterdir()] == ["scalers.joblib"]
+
+    def test_failed_dump_keeps_previous_file(self, service):
+        """Тест: ошибка записи не портит ранее сохраненный артефакт"""
+        service._dump_artifact({"a": 1}, "scalers.joblib")
+
+        with patch('app.services.ai_service.joblib.dump', side_effect=OSError("disk full")):
+            with pytest.raises(OSError):
+                service._dump_artifact({"a": 2}, "scalers.joblib")
+
+        assert joblib.load(service.model_dir / "scalers.joblib") == {"a": 1}
+        assert [path.name for path in service.model_dir.iterdir()] == ["scalers.joblib"]
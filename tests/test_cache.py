@@ -0,0 +1,82 @@
+"""
+Тесты для сериализации значений кэша
+"""
+import uuid
+import pytest
+from dataclasses import dataclass
+from datetime import datetime
+from enum import Enum
+
+from app.core.cache import CacheService
+from app.models.social import LikeType
+
+
+class Level(Enum):
+    LOW = 1
+
+
+@dataclass
+class Point:
+    x: int
+
+
+class FakeRedis:
+    """In-memory Redis с командами get/set/setex"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value):
+        self.values[key] = value
+
+    async def setex(self, key, expire, value):
+        self.values[key] = value
+
+
+@pytest.fixture
+def cache():
+    """CacheService поверх FakeRedis"""
+    service = CacheService()
+    service.redis_client = FakeRedis()
+    return service
+
+
+class TestCacheRoundTrip:
+    """Тесты: значение из кэша возвращается того же типа"""
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("value", [
+        {"price": 9.5, "tags": ["a"], "nested": {"ok": True}},
+        [1, 2.5, None, "x"],
+        "text",
+    ])
+    async def test_json_values(self, cache, value):
+        """Тест: обычные JSON-значения хранятся как JSON"""
+        await cache.set("key", value)
+
+        assert cache.redis_client.values["key"][:1] in (b"{", b"[", b'"')
+        assert await cache.get("key") == value
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("value", [
+        uuid.uuid4(),
+        {"id": uuid.uuid4()},
+        [{"like_type": LikeType.LOVE}],
+        {"level": Level.LOW},
+        {uuid.uuid4(): "profile"},
+        {"created_at": datetime(2024, 1, 1)},
+        Point(x=1),
+    ])
+    async def test_typed_values_are_pickled(self, cache, value):
+        """Тест: UUID, Enum, datetime и dataclass возвращаются своим типом"""
+        await cache.set("key", value)
+
+        result = await cache.get("key")
+
+        assert result == value
+        assert type(result) is type(value)
+        if isinstance(value, list):
+            assert result[0]["like_type"] is LikeType.LOVE
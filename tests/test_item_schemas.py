@@ -0,0 +1,65 @@
+"""
+Тесты для схем товаров
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+
+from app.schemas.item import ItemResponse
+
+
+def _item_row(**overrides):
+    """Строка TrackedItem с заполненными колонками"""
+    now = datetime(2024, 1, 1, 12, 0, 0)
+    values = {
+        "id": 1,
+        "user_id": 2,
+        "item_id": "123456",
+        "marketplace": "wb",
+        "name": "Товар",
+        "brand": "Бренд",
+        "category": "Категория",
+        "url": "https://example.com/item",
+        "sku": "SKU-1",
+        "current_price": 999.0,
+        "current_stock": 5,
+        "current_rating": 4.5,
+        "current_reviews_count": 10,
+        "image_url": None,
+        "description": None,
+        "specifications": {"color": "red"},
+        "is_active": True,
+        "is_available": True,
+        "created_at": now,
+        "last_updated": now,
+        "last_checked": None,
+        "tracking_settings": {"interval": 60},
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestItemResponseFromTrustedRow:
+    """Тесты быстрой сборки ItemResponse без валидации"""
+
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {"specifications": None, "tracking_settings": None},
+        {"specifications": {}, "tracking_settings": None, "brand": None, "current_price": None},
+    ])
+    def test_matches_model_validate(self, overrides):
+        """Тест: from_trusted_row дает тот же ответ, что и model_validate"""
+        row = _item_row(**overrides)
+
+        trusted = ItemResponse.from_trusted_row(row)
+        validated = ItemResponse.model_validate(row)
+
+        assert trusted.model_dump() == validated.model_dump()
+        assert trusted.model_dump_json() == validated.model_dump_json()
+
+    def test_null_json_columns_become_empty_dicts(self):
+        """Тест: NULL в JSON-колонках отдается как {}"""
+        item = ItemResponse.from_trusted_row(_item_row(specifications=None, tracking_settings=None))
+
+        assert item.specifications == {}
+        assert item.tracking_settings == {}
@@ -0,0 +1,85 @@
+"""
+Тесты для ядер оценки ниш
+"""
+import math
+import pytest
+import numpy as np
+
+from app.services.niche_kernels import (
+    TREND_DECLINING,
+    TREND_RISING,
+    TREND_STABLE,
+    TREND_VOLATILE,
+    _classify_trend,
+    _rule_score,
+    classify_trend,
+    rule_score,
+)
+
+
+def _features(**values):
+    """Вектор признаков ниши: нули, кроме указанных индексов"""
+    features = np.zeros(20, dtype=np.float64)
+    for index, value in values.items():
+        features[int(index.lstrip("f"))] = value
+    return features
+
+
+RULE_SCORE_CASES = {
+    "base": _features(),
+    "favourable": _features(f1=0.05, f6=1.5, f7=0.1, f8=1.0, f13=1.0, f16=1.0),
+    "unfavourable": _features(f1=0.5, f6=0.5, f7=0.9),
+    "clipped_high": _features(f8=10.0, f16=10.0),
+    "clipped_low": _features(f8=-10.0),
+    "random": np.random.default_rng(42).uniform(-1, 2, 20),
+    "nan_volatility": _features(f1=math.nan),
+    "nan_opportunity": _features(f8=math.nan),
+}
+
+CLASSIFY_CASES = {
+    "rising": (2.0, 0.8, 100.0),
+    "declining": (-2.0, 0.8, 100.0),
+    "volatile": (0.5, 0.05, 100.0),
+    "stable": (0.005, 0.2, 100.0),
+    "steep": (500.0, 0.9, 100.0),
+    "nan_r2": (1.0, math.nan, 100.0),
+    "nan_slope": (math.nan, 0.5, 100.0),
+}
+
+
+class TestRuleScore:
+    """Тесты rule_score: скомпилированное ядро совпадает с Python-реализацией"""
+
+    @pytest.mark.parametrize("case", RULE_SCORE_CASES)
+    def test_matches_python(self, case):
+        """Тест: оценка совпадает с некомпилированной функцией, включая NaN"""
+        features = RULE_SCORE_CASES[case]
+
+        np.testing.assert_equal(rule_score(features), _rule_score(features))
+
+    def test_score_bounds(self):
+        """Тест: оценка ограничена отрезком [0, 1]"""
+        assert rule_score(RULE_SCORE_CASES["base"]) == pytest.approx(0.8)
+        assert rule_score(RULE_SCORE_CASES["clipped_high"]) == 1.0
+        assert rule_score(RULE_SCORE_CASES["clipped_low"]) == 0.0
+
+
+class TestClassifyTrend:
+    """Тесты classify_trend: скомпилированное ядро совпадает с Python-реализацией"""
+
+    @pytest.mark.parametrize("case", CLASSIFY_CASES)
+    def test_matches_python(self, case):
+        """Тест: код, сила и уверенность совпадают с некомпилированной функцией, включая NaN"""
+        slope, r2, mean_price = CLASSIFY_CASES[case]
+
+        np.testing.assert_equal(classify_trend(slope, r2, mean_price), _classify_trend(slope, r2, mean_price))
+
+    @pytest.mark.parametrize("case, expected", [
+        ("rising", TREND_RISING),
+        ("declining", TREND_DECLINING),
+        ("volatile", TREND_VOLATILE),
+        ("stable", TREND_STABLE),
+    ])
+    def test_codes(self, case, expected):
+        """Тест: код паттерна тренда"""
+        assert classify_trend(*CLASSIFY_CASES[case])[0] == expected
@@ -0,0 +1,317 @@
+"""
+Тесты для счетчиков просмотров и лайков постов
+"""
+import uuid
+import pytest
+from unittest.mock import patch
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models.item  # noqa: F401 - регистрирует tracked_items для внешнего ключа
+from app.core.database import Base
+from app.models.social import Like, LikeType, SocialPost
+from app.services.post_counter_service import PostCounterService, ACTIVE_POSTS_KEY
+
+posts = SocialPost.__table__
+likes = Like.__table__
+
+
+class FakeRedis:
+    """Минимальный in-memory Redis с командами, которые использует сервис"""
+
+    def __init__(self):
+        self.hashes = {}
+        self.zsets = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zrange(self, key, start, end, withscores=False):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda item: item[1])
+        if withscores:
+            return [(member.encode(), score) for member, score in items]
+        return [member.encode() for member, _ in items]
+
+    async def hincrby(self, key, field, delta):
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = fields.get(field, 0) + delta
+        return fields[field]
+
+    async def hgetall(self, key):
+        return {field.encode(): str(value).encode() for field, value in self.hashes.get(key, {}).items()}
+
+    async def hvals(self, key):
+        return [str(value).encode() for value in self.hashes.get(key, {}).values()]
+
+    async def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update(mapping)
+        return len(mapping)
+
+    async def delete(self, key):
+        return int(self.hashes.pop(key, None) is not None)
+
+    async def expire(self, key, seconds):
+        return int(key in self.hashes)
+
+    async def zincrby(self, key, delta, member):
+        member = member.decode() if isinstance(member, bytes) else member
+        zset = self.zsets.setdefault(key, {})
+        zset[member] = zset.get(member, 0) + delta
+        return zset[member]
+
+    async def zremrangebyscore(self, key, low, high):
+        zset = self.zsets.get(key, {})
+        removed = [member for member, score in zset.items() if score <= high]
+        for member in removed:
+            del zset[member]
+        return len(removed)
+
+
+class FakePipeline:
+    """Откладывает команды до execute(), как redis.asyncio.Pipeline.
+
+    После watch() команды выполняются сразу, до multi()
+    """
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+        self.immediate = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def watch(self, *keys):
+        self.immediate = True
+
+    def multi(self):
+        self.immediate = False
+
+    def __getattr__(self, name):
+        method = getattr(self.redis, name)
+
+        def command(*args, **kwargs):
+            if self.immediate:
+                return method(*args, **kwargs)
+            self.commands.append((method, args, kwargs))
+            return self
+        return command
+
+    async def execute(self):
+        return [await method(*args, **kwargs) for method, args, kwargs in self.commands]
+
+
+@pytest.fixture
+def session_factory():
+    """In-memory SQLite с таблицами social_posts и likes"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine, tables=[posts, likes])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def post_id(session_factory):
+    """Создание поста с нулевыми счетчиками"""
+    post_id = uuid.uuid4()
+    db = session_factory()
+    db.execute(insert(posts).values(
+        id=post_id, author_id=uuid.uuid4(), content="test", view_count=0, like_count=0
+    ))
+    db.commit()
+    db.close()
+    return str(post_id)
+
+
+def _counts(session_factory, post_id):
+    db = session_factory()
+    try:
+        row = db.execute(
+            select(posts.c.view_count, posts.c.like_count).where(posts.c.id == uuid.UUID(post_id))
+        ).one()
+        return tuple(row)
+    finally:
+        db.close()
+
+
+class TestPostCounterService:
+    """Тесты класса PostCounterService"""
+
+    @pytest.mark.asyncio
+    async def test_increment_then_flush_applies_delta(self, session_factory, post_id):
+        """Тест: инкременты копятся в Redis и сбрасываются в БД одной дельтой"""
+        redis = FakeRedis()
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache, \
+                patch('app.services.post_counter_service.SessionLocal', session_factory):
+            cache.redis_client = redis
+            await service.record_view(post_id, db)
+            await service.record_view(post_id, db)
+            await service.record_like(post_id, "like", 1, db)
+
+            assert _counts(session_factory, post_id) == (0, 0)
+
+            flushed = await service.flush()
+
+        db.close()
+        assert flushed == 1
+        assert _counts(session_factory, post_id) == (2, 1)
+        assert f"post:{post_id}" not in redis.hashes
+        assert post_id not in redis.zsets[ACTIVE_POSTS_KEY]
+
+    @pytest.mark.asyncio
+    async def test_increment_during_flush_is_kept(self, session_factory, post_id):
+        """Тест: инкремент во время сброса не теряется и хэш не удаляется"""
+        redis = FakeRedis()
+        service = PostCounterService()
+        db = session_factory()
+        flush_rows = service._flush_rows
+
+        def flush_with_view(rows):
+            flush_rows(rows)
+            redis.hashes[f"post:{post_id}"]["views"] += 1
+            redis.zsets[ACTIVE_POSTS_KEY][post_id] += 1
+
+        with patch('app.services.post_counter_service.cache_service') as cache, \
+                patch('app.services.post_counter_service.SessionLocal', session_factory):
+            cache.redis_client = redis
+            await service.record_view(post_id, db)
+
+            with patch.object(service, '_flush_rows', side_effect=flush_with_view):
+                assert await service.flush() == 1
+
+            assert redis.hashes[f"post:{post_id}"] == {"views": 1, "likes": 0}
+            assert post_id in redis.zsets[ACTIVE_POSTS_KEY]
+
+            assert await service.flush() == 1
+
+        db.close()
+        assert _counts(session_factory, post_id) == (2, 0)
+        assert f"post:{post_id}" not in redis.hashes
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_keeps_deltas(self, session_factory, post_id):
+        """Тест: при ошибке записи в БД дельты остаются в Redis"""
+        redis = FakeRedis()
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache, \
+                patch('app.services.post_counter_service.SessionLocal', session_factory):
+            cache.redis_client = redis
+            await service.record_view(post_id, db)
+
+            with patch.object(PostCounterService, '_apply_deltas', side_effect=RuntimeError("db down")):
+                with pytest.raises(RuntimeError):
+                    await service.flush()
+
+            assert redis.hashes[f"post:{post_id}"] == {"views": 1}
+            assert post_id in redis.zsets[ACTIVE_POSTS_KEY]
+
+            assert await service.flush() == 1
+
+        db.close()
+        assert _counts(session_factory, post_id) == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_redis_unavailable_writes_to_db(self, session_factory, post_id):
+        """Тест: без Redis дельта записывается напрямую в БД"""
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache:
+            cache.redis_client = None
+            await service.record_view(post_id, db)
+            await service.record_like(post_id, "like", 1, db)
+
+        db.close()
+        assert _counts(session_factory, post_id) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_like_count_not_negative(self, session_factory, post_id):
+        """Тест: снятие лайка не опускает like_count ниже нуля"""
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache:
+            cache.redis_client = None
+            await service.record_like(post_id, "like", -1, db)
+
+        db.close()
+        assert _counts(session_factory, post_id) == (0, 0)
+
+
+def _add_likes(session_factory, post_id, *like_types):
+    db = session_factory()
+    db.execute(insert(likes), [
+        {"id": uuid.uuid4(), "user_id": uuid.uuid4(), "post_id": uuid.UUID(post_id), "like_type": like_type}
+        for like_type in like_types
+    ])
+    db.commit()
+    db.close()
+
+
+class TestPostReactions:
+    """Тесты счетчиков лайков по типам"""
+
+    @pytest.mark.asyncio
+    async def test_reactions_seeded_from_db(self, session_factory, post_id):
+        """Тест: при промахе кэша реакции считаются по likes и кэшируются"""
+        _add_likes(session_factory, post_id, LikeType.LIKE, LikeType.LIKE, LikeType.LOVE)
+        redis = FakeRedis()
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache:
+            cache.redis_client = redis
+            assert await service.get_reactions(post_id, db) == {"like": 2, "love": 1}
+
+            with patch.object(PostCounterService, '_count_reactions', side_effect=AssertionError("db query")):
+                assert await service.get_reactions(post_id, db) == {"like": 2, "love": 1}
+
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_record_like_updates_cached_reactions(self, session_factory, post_id):
+        """Тест: постановка и снятие лайка меняют кэш реакций без запроса в БД"""
+        _add_likes(session_factory, post_id, LikeType.LIKE)
+        redis = FakeRedis()
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache:
+            cache.redis_client = redis
+            await service.get_reactions(post_id, db)
+            await service.record_like(post_id, "laugh", 1, db)
+            await service.record_like(post_id, "like", -1, db)
+
+            with patch.object(PostCounterService, '_count_reactions', side_effect=AssertionError("db query")):
+                assert await service.get_reactions(post_id, db) == {"laugh": 1}
+
+        db.close()
+
+    @pytest.mark.asyncio
+    async def test_unseeded_reactions_read_from_db(self, session_factory, post_id):
+        """Тест: хэш, созданный одним HINCRBY, не считается кэшем"""
+        _add_likes(session_factory, post_id, LikeType.LIKE, LikeType.SAD)
+        redis = FakeRedis()
+        service = PostCounterService()
+        db = session_factory()
+
+        with patch('app.services.post_counter_service.cache_service') as cache:
+            cache.redis_client = redis
+            await service.record_like(post_id, "sad", 1, db)
+
+            assert await service.get_reactions(post_id, db) == {"like": 1, "sad": 1}
+
+        db.close()
@@ -0,0 +1,228 @@
+"""
+Тесты для базовой схемы ORMResponse
+"""
+import sys
+import pytest
+from datetime import datetime, timezone
+from enum import Enum
+from types import SimpleNamespace
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import Field, ValidationError, computed_field, field_validator, model_validator
+
+from app.schemas.base import EpochMillis, InternedStr, JSONBlob, JSONText, ORMResponse, enum_by_value
+
+
+class Color(str, Enum):
+    RED = "red"
+    GREEN = "green"
+
+
+class OwnerResponse(ORMResponse):
+    id: int
+    name: str
+
+
+class RowResponse(ORMResponse):
+    id: int
+    title: str
+    price: Optional[float] = None
+    status: Literal["active", "archived"]
+    tags: List[str]
+    extra: Dict[str, Any]
+    owner: OwnerResponse
+
+
+class TypedRowResponse(ORMResponse):
+    id: int
+    color: enum_by_value(Color)
+    currency: InternedStr
+    created_at: EpochMillis
+    payload: JSONText
+    settings: JSONBlob = Field(default_factory=dict)
+
+
+class ConstrainedResponse(ORMResponse):
+    id: int
+    count: int = Field(ge=0)
+
+
+class FieldValidatedResponse(ORMResponse):
+    id: int
+    title: str
+
+    @field_validator("title")
+    @classmethod
+    def strip_title(cls, value: str) -> str:
+        return value.strip()
+
+
+class InheritedValidatorResponse(FieldValidatedResponse):
+    extra: Dict[str, Any]
+
+
+class ModelValidatedResponse(ORMResponse):
+    low: int
+    high: int
+
+    @model_validator(mode="after")
+    def check_range(self) -> "ModelValidatedResponse":
+        if self.low > self.high:
+            raise ValueError("low > high")
+        return self
+
+
+class ComputedResponse(ORMResponse):
+    price: float
+    count: int
+
+    @computed_field
+    @property
+    def total(self) -> float:
+        return self.price * self.count
+
+
+def _row(**overrides):
+    values = {
+        "id": 1,
+        "title": "Пост",
+        "price": 9.5,
+        "status": "active",
+        "tags": ["a", "b"],
+        "extra": {"views": 3},
+        "owner": SimpleNamespace(id=2, name="Автор"),
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def _typed_row(**overrides):
+    values = {
+        "id": 1,
+        "color": "red",
+        "currency": "".join(["R", "UB"]),
+        "created_at": datetime(2024, 1, 1, tzinfo=timezone.utc),
+        "payload": '{"a": [1, 2]}',
+        "settings": {"theme": "dark"},
+    }
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestFromOrmRow:
+    """Тесты быстрой сборки схемы из ORM-объекта"""
+
+    @pytest.mark.parametrize("overrides", [
+        {},
+        {"price": None},
+        {"price": 10},
+        {"status": "archived", "tags": [], "extra": {}},
+    ])
+    def test_matches_model_validate(self, overrides):
+        """Тест: быстрый путь и model_validate дают одинаковый результат"""
+        row = _row(**overrides)
+
+        assert RowResponse.from_orm_row(row).model_dump() == RowResponse.model_validate(row).model_dump()
+
+    def test_fast_path_skips_validation(self, monkeypatch):
+        """Тест: при точных типах model_validate не вызывается"""
+        monkeypatch.setattr(RowResponse, "model_validate", classmethod(lambda cls, obj: pytest.fail("validated")))
+
+        result = RowResponse.from_orm_row(_row())
+
+        assert result.title == "Пост"
+        assert isinstance(result.owner, OwnerResponse)
+
+    @pytest.mark.parametrize("overrides", [
+        {"id": "1"},
+        {"status": "deleted"},
+        {"tags": ["a", 1]},
+        {"owner": SimpleNamespace(id=2)},
+    ])
+    def test_inexact_values_are_validated(self, overrides):
+        """Тест: значения другого типа уходят в model_validate"""
+        row = _row(**overrides)
+
+        try:
+            expected = RowResponse.model_validate(row).model_dump()
+        except ValidationError:
+            with pytest.raises(ValidationError):
+                RowResponse.from_orm_row(row)
+        else:
+            assert RowResponse.from_orm_row(row).model_dump() == expected
+
+    def test_missing_attribute_is_validated(self):
+        """Тест: отсутствующий атрибут обрабатывается model_validate"""
+        row = _row()
+        del row.title
+
+        with pytest.raises(ValidationError):
+            RowResponse.from_orm_row(row)
+
+    def test_constrained_fields_always_validated(self):
+        """Тест: поля с ограничениями отключают быстрый путь"""
+        assert ConstrainedResponse._orm_converters is None
+
+        with pytest.raises(ValidationError):
+            ConstrainedResponse.from_orm_row(SimpleNamespace(id=1, count=-1))
+
+    @pytest.mark.parametrize("schema", [FieldValidatedResponse, InheritedValidatorResponse])
+    def test_field_validators_always_run(self, schema):
+        """Тест: field_validator (в т.ч. унаследованный) отключает быстрый путь"""
+        assert schema._orm_converters is None
+
+        result = schema.from_orm_row(SimpleNamespace(id=1, title="  Пост  ", extra={}))
+
+        assert result.title == "Пост"
+
+    def test_model_validators_always_run(self):
+        """Тест: model_validator отключает быстрый путь"""
+        assert ModelValidatedResponse._orm_converters is None
+
+        with pytest.raises(ValidationError):
+            ModelValidatedResponse.from_orm_row(SimpleNamespace(low=2, high=1))
+
+    def test_computed_field_on_fast_path(self):
+        """Тест: computed_field вычисляется и у собранного быстрым путем экземпляра"""
+        row = SimpleNamespace(price=2.5, count=4)
+
+        assert ComputedResponse._orm_converters is not None
+        assert ComputedResponse.from_orm_row(row).model_dump() == ComputedResponse.model_validate(row).model_dump()
+        assert ComputedResponse.from_orm_row(row).total == 10.0
+
+
+class TestFieldTypes:
+    """Тесты типов полей с собственными конвертерами"""
+
+    def test_matches_model_validate(self):
+        """Тест: конвертеры быстрого пути совпадают с валидаторами"""
+        row = _typed_row()
+
+        assert TypedRowResponse.from_orm_row(row).model_dump() == TypedRowResponse.model_validate(row).model_dump()
+
+    def test_converted_values(self):
+        """Тест: enum, интернированная строка, миллисекунды и разобранный JSON"""
+        result = TypedRowResponse.from_orm_row(_typed_row())
+
+        assert result.color is Color.RED
+        assert result.currency is sys.intern("RUB")
+        assert result.created_at == 1704067200000
+        assert result.payload == {"a": [1, 2]}
+
+    def test_naive_datetime_is_utc(self):
+        """Тест: наивное время из БД считается UTC"""
+        result = TypedRowResponse.from_orm_row(_typed_row(created_at=datetime(2024, 1, 1)))
+
+        assert result.created_at == 1704067200000
+
+    def test_null_json_blob(self):
+        """Тест: NULL в JSON-колонке отдается как {} в обоих путях"""
+        row = _typed_row(settings=None)
+
+        assert TypedRowResponse.from_orm_row(row).settings == {}
+        assert TypedRowResponse.model_validate(row).settings == {}
+
+    def test_invalid_json_text(self):
+        """Тест: некорректный JSON уходит в model_validate и дает ошибку валидации"""
+        with pytest.raises(ValidationError):
+            TypedRowResponse.from_orm_row(_typed_row(payload="{broken"))
@@ -0,0 +1,67 @@
+"""
+Тесты для социальной ленты
+"""
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from app.services.social_service import SocialService
+
+WINDOW_START = datetime(2024, 1, 1)
+
+
+@pytest.fixture
+def service():
+    """SocialService на мок-сессии PostgreSQL с профилем пользователя"""
+    db = Mock()
+    db.get_bind.return_value.dialect.name = "postgresql"
+    service = SocialService(db)
+    service.get_user_profile = Mock(return_value=SimpleNamespace(user_id="user"))
+    return service
+
+
+def _feed(service, page, limit, window_size, recent, live):
+    """Лента с окном user_feed_recent из window_size постов"""
+    with patch.object(SocialService, '_feed_window', return_value=(window_size, WINDOW_START)), \
+            patch.object(SocialService, '_recent_feed_page', return_value=recent) as recent_page, \
+            patch.object(SocialService, '_live_feed_page', return_value=live) as live_page:
+        posts = service.get_social_feed("user", page, limit)
+    return posts, recent_page, live_page
+
+
+class TestSocialFeed:
+    """Тесты выбора источника страницы ленты"""
+
+    def test_page_inside_window(self, service):
+        """Тест: страница внутри окна читается только из представления"""
+        posts, recent_page, live_page = _feed(service, 1, 2, 5, ["p1", "p2"], [])
+
+        assert posts == ["p1", "p2"]
+        recent_page.assert_called_once_with("user", 0, 2)
+        live_page.assert_not_called()
+
+    def test_page_on_window_edge(self, service):
+        """Тест: конец окна дополняется постами старше окна"""
+        posts, recent_page, live_page = _feed(service, 2, 4, 6, ["p5", "p6"], ["old1", "old2"])
+
+        assert posts == ["p5", "p6", "old1", "old2"]
+        recent_page.assert_called_once_with("user", 4, 4)
+        live_page.assert_called_once_with(service.get_user_profile.return_value, 0, 2, before=WINDOW_START)
+
+    def test_page_past_window(self, service):
+        """Тест: страница за окном целиком читается живым запросом"""
+        posts, recent_page, live_page = _feed(service, 4, 4, 6, [], ["old7"])
+
+        assert posts == ["old7"]
+        recent_page.assert_not_called()
+        live_page.assert_called_once_with(service.get_user_profile.return_value, 6, 4, before=WINDOW_START)
+
+    def test_other_dialects_use_live_query(self, service):
+        """Тест: без PostgreSQL лента строится живым запросом без окна"""
+        service.db.get_bind.return_value.dialect.name = "sqlite"
+
+        with patch.object(SocialService, '_live_feed_page', return_value=["p1"]) as live_page:
+            assert service.get_social_feed("user", 2, 10) == ["p1"]
+
+        live_page.assert_called_once_with(service.get_user_profile.return_value, 10, 10)
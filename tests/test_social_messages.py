@@ -0,0 +1,77 @@
+"""
+Тесты для отметок о прочтении сообщений
+"""
+import uuid
+import pytest
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import Mock, patch
+
+from app.models.social import Message
+from app.services.social_service import SocialService
+
+
+def _message(receiver_id, reads):
+    return SimpleNamespace(receiver_id=receiver_id, reads=reads)
+
+
+def _read(user_id, read_at):
+    return SimpleNamespace(user_id=user_id, read_at=read_at)
+
+
+class TestMessageReadStatus:
+    """Тесты свойств read_at/is_read поверх message_reads"""
+
+    def test_unread_without_receipts(self):
+        """Тест: без отметок сообщение не прочитано"""
+        message = _message(uuid.uuid4(), [])
+
+        assert Message.read_at.fget(message) is None
+
+    def test_receiver_receipt(self):
+        """Тест: время прочтения берется из отметки получателя"""
+        receiver_id = uuid.uuid4()
+        read_at = datetime(2024, 1, 1, 12, 0, 0)
+        message = _message(receiver_id, [_read(uuid.uuid4(), datetime(2024, 1, 1)), _read(receiver_id, read_at)])
+
+        assert Message.read_at.fget(message) == read_at
+
+    def test_other_user_receipt_ignored(self):
+        """Тест: отметка не получателя не делает сообщение прочитанным"""
+        message = _message(uuid.uuid4(), [_read(uuid.uuid4(), datetime(2024, 1, 1))])
+
+        assert Message.read_at.fget(message) is None
+
+    @pytest.mark.parametrize("read_at, expected", [(None, False), (datetime(2024, 1, 1), True)])
+    def test_is_read(self, read_at, expected):
+        """Тест: is_read следует за read_at"""
+        assert Message.is_read.fget(SimpleNamespace(read_at=read_at)) is expected
+
+
+class TestUnreadMessages:
+    """Тесты выборки непрочитанных сообщений"""
+
+    @pytest.fixture
+    def service(self):
+        """SocialService с мок-сессией"""
+        return SocialService(Mock())
+
+    def test_get_unread_messages_preloads_reads(self, service):
+        """Тест: reads загружаются вместе с сообщениями, без запроса на каждое"""
+        query = service.db.query.return_value.outerjoin.return_value.filter.return_value
+        messages = [Mock()]
+        query.options.return_value.order_by.return_value.limit.return_value.all.return_value = messages
+
+        with patch('app.services.social_service.contains_eager') as contains_eager:
+            assert service.get_unread_messages("profile", limit=10) == messages
+
+        contains_eager.assert_called_once_with(Message.reads)
+        query.options.assert_called_once_with(contains_eager.return_value)
+        query.options.return_value.order_by.return_value.limit.assert_called_once_with(10)
+
+    def test_count_unread_messages(self, service):
+        """Тест: количество считается по тому же anti-join"""
+        query = service.db.query.return_value.outerjoin.return_value.filter.return_value
+        query.count.return_value = 3
+
+        assert service.count_unread_messages("profile") == 3
@@ -0,0 +1,108 @@
+"""
+Тесты для ядер статистики ценовых трендов
+"""
+import math
+import pytest
+import numpy as np
+
+from app.services.trend_kernels import (
+    _first_last_prices_loop,
+    _first_last_prices_numpy,
+    _trend_stats_loop,
+    _trend_stats_numpy,
+    first_last_prices,
+    trend_stats,
+)
+
+TREND_STATS_IMPLEMENTATIONS = [trend_stats, _trend_stats_loop, _trend_stats_numpy]
+FIRST_LAST_IMPLEMENTATIONS = [first_last_prices, _first_last_prices_loop, _first_last_prices_numpy]
+IMPLEMENTATION_IDS = ["exported", "loop", "numpy"]
+
+
+def _series(prices, days=None):
+    prices = np.asarray(prices, dtype=np.float64)
+    if days is None:
+        days = np.arange(len(prices), dtype=np.float64)
+    return np.asarray(days, dtype=np.float64), prices
+
+
+TREND_CASES = {
+    "random": _series(np.random.default_rng(42).uniform(100, 200, 50), np.sort(np.random.default_rng(7).integers(0, 90, 50))),
+    "single": _series([150.0]),
+    "two_points": _series([100.0, 110.0]),
+    "constant": _series([100.0] * 10),
+    "same_day": _series([100.0, 120.0, 90.0], [0.0, 0.0, 0.0]),
+    "zero_price": _series([0.0, 100.0, 0.0, 50.0, 75.0]),
+    "nan_first": _series([math.nan, 100.0, 110.0, 105.0]),
+    "nan_middle": _series([100.0, 110.0, math.nan, 105.0]),
+}
+
+
+class TestTrendStats:
+    """Тесты trend_stats: скомпилированное ядро совпадает с numpy-реализацией"""
+
+    @pytest.mark.parametrize("case", TREND_CASES)
+    @pytest.mark.parametrize("implementation", TREND_STATS_IMPLEMENTATIONS[:2], ids=IMPLEMENTATION_IDS[:2])
+    def test_matches_numpy(self, case, implementation):
+        """Тест: результаты совпадают с векторизованным эталоном, включая NaN"""
+        days, prices = TREND_CASES[case]
+
+        expected = _trend_stats_numpy(days, prices)
+        actual = implementation(days, prices)
+
+        np.testing.assert_allclose(actual, expected, rtol=1e-9, atol=1e-12, equal_nan=True)
+
+    @pytest.mark.parametrize("implementation", TREND_STATS_IMPLEMENTATIONS, ids=IMPLEMENTATION_IDS)
+    def test_rising_series(self, implementation):
+        """Тест: наклон и статистики на растущей серии"""
+        days, prices = _series([100.0, 110.0, 120.0, 130.0])
+
+        slope, volatility, low, high, mean = implementation(days, prices)
+
+        assert slope == pytest.approx(10.0)
+        assert volatility > 0
+        assert (low, high, mean) == (100.0, 130.0, 115.0)
+
+    @pytest.mark.parametrize("implementation", TREND_STATS_IMPLEMENTATIONS, ids=IMPLEMENTATION_IDS)
+    def test_volatility_undefined_for_short_series(self, implementation):
+        """Тест: меньше двух изменений цены - волатильность NaN"""
+        days, prices = _series([100.0, 110.0])
+
+        assert math.isnan(implementation(days, prices)[1])
+
+
+FIRST_LAST_CASES = {
+    "interleaved": (np.array([0, 1, 0, 2, 1, 0]), [10.0, 20.0, 11.0, 30.0, 21.0, 12.0], 3),
+    "missing_group": (np.array([0, 0, 2]), [10.0, 11.0, 30.0], 4),
+    "nan_price": (np.array([0, 1, 0]), [math.nan, 20.0, 11.0], 2),
+    "empty": (np.array([], dtype=np.int64), [], 3),
+}
+
+
+class TestFirstLastPrices:
+    """Тесты first_last_prices: скомпилированное ядро совпадает с numpy-реализацией"""
+
+    @pytest.mark.parametrize("case", FIRST_LAST_CASES)
+    @pytest.mark.parametrize("implementation", FIRST_LAST_IMPLEMENTATIONS[:2], ids=IMPLEMENTATION_IDS[:2])
+    def test_matches_numpy(self, case, implementation):
+        """Тест: первая/последняя цена и количество точек совпадают с эталоном"""
+        codes, prices, n_groups = FIRST_LAST_CASES[case]
+        codes = codes.astype(np.int64)
+        prices = np.asarray(prices, dtype=np.float64)
+
+        expected = _first_last_prices_numpy(codes, prices, n_groups)
+        actual = implementation(codes, prices, n_groups)
+
+        for actual_column, expected_column in zip(actual, expected):
+            np.testing.assert_array_equal(actual_column, expected_column)
+
+    @pytest.mark.parametrize("implementation", FIRST_LAST_IMPLEMENTATIONS, ids=IMPLEMENTATION_IDS)
+    def test_values(self, implementation):
+        """Тест: значения по группам в порядке времени"""
+        codes, prices, n_groups = FIRST_LAST_CASES["missing_group"]
+
+        first, last, counts = implementation(codes.astype(np.int64), np.asarray(prices), n_groups)
+
+        np.testing.assert_array_equal(first, [10.0, math.nan, 30.0, math.nan])
+        np.testing.assert_array_equal(last, [11.0, math.nan, 30.0, math.nan])
+        np.testing.assert_array_equal(counts, [2, 0, 1, 0])